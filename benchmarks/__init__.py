@@ -0,0 +1,8 @@
+"""Performance benchmarks for the graph core, file formats, tracer and rendering
+
+Run the whole suite from the repository root with:
+	python -m benchmarks.suite
+
+See benchmarks.suite for the available options, and benchmarks.bench_tracer for a standalone comparison
+	of tracer backends.
+"""
@@ -0,0 +1,56 @@
+"""Benchmarks of building and modifying a Graph"""
+
+from benchmarks.common import columns, measure, random_graph
+from graphdebugger.Graph import Edge, Graph, Node
+
+import random
+
+
+max_size = 10**6
+
+
+def build_incremental(xs, ys, sources, targets, weights):
+	"""Build a graph node by node and edge by edge, the way scripts and the GUI do"""
+	g = Graph()
+	nodes = [Node((x, y)) for x, y in zip(xs, ys)]
+	for n in nodes:
+		g.add_node(n)
+	for s, t, w in zip(sources, targets, weights):
+		e = Edge(nodes[s], nodes[t], w)
+		e.src.out.append(e)
+		e.targ.inc.append(e)
+		g.add_edge(e)
+	return g
+
+
+def remove_nodes(g, nodes):
+	"""Remove the provided nodes along with their edges, the way GraphScene.remove_graphic_node does"""
+	for n in nodes:
+		for e in list(n.out) + list(n.inc):
+			if e in g.edges:
+				e.src.remove(e)
+				e.targ.remove(e)
+				g.remove_edge(e)
+		g.remove_node(n)
+
+
+def run(size, repeat):
+	data = columns(random_graph(size))
+	xs, ys, sources, targets, weights = data
+	results = {}
+	results['from_columns'] = measure(lambda _: Graph.from_columns(xs, ys, sources, targets, weights=weights), repeat)
+	results['add_edge'] = measure(lambda _: build_incremental(*data), repeat)
+
+	def setup():
+		g = Graph.from_columns(xs, ys, sources, targets, weights=weights)
+		nodes = list(g.nodes)
+		return g, random.Random(2).sample(nodes, max(len(nodes) // 10, 1))
+	results['remove_node'] = measure(lambda state: remove_nodes(*state), repeat, setup)
+
+	def lookups(g):
+		for e in g.edges:
+			g.has_edge(e.src, e.targ)
+			g.reverse_of(e)
+	g = Graph.from_columns(xs, ys, sources, targets, weights=weights)
+	results['edge_lookup'] = measure(lambda _: lookups(g), repeat)
+	return results
@@ -0,0 +1,22 @@
+"""Benchmarks of writing and reading graphs in the JSON and binary formats"""
+
+from benchmarks.common import measure, random_graph
+from graphdebugger.Graph import Graph
+
+import os
+import tempfile
+
+
+max_size = 10**6
+
+
+def run(size, repeat):
+	g = random_graph(size)
+	results = {}
+	with tempfile.TemporaryDirectory() as dir:
+		for ext in ('json', 'vgb'):
+			path = os.path.join(dir, 'graph.' + ext)
+			results['write_' + ext] = measure(lambda _: g.write_graph(path), repeat)
+			results['read_' + ext] = measure(lambda _: Graph.read_graph(path), repeat)
+			results['size_' + ext] = os.path.getsize(path)
+	return results
@@ -0,0 +1,45 @@
+"""Benchmarks of displaying a graph: building its graphic items and painting it offscreen
+
+Requires PyQt5. Uses the offscreen Qt platform unless QT_QPA_PLATFORM is already set.
+"""
+
+from benchmarks.common import measure, random_graph
+
+import os
+
+
+max_size = 10**5
+
+_app = None
+
+
+def run(size, repeat):
+	global _app
+	os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+	from PyQt5.QtWidgets import QApplication
+	from PyQt5.QtGui import QImage, QPainter
+	from graphdebugger.GraphScene import GraphScene, GraphView
+	if _app is None:
+		_app = QApplication.instance() or QApplication([])
+
+	scene = GraphScene()
+	view = GraphView(scene)
+	view.resize(1200, 800)
+	results = {}
+	results['set_graph'] = measure(lambda graph: scene.set_graph(graph), repeat, lambda: random_graph(size))
+
+	def paint(_):
+		image = QImage(view.viewport().size(), QImage.Format_ARGB32)
+		painter = QPainter(image)
+		view.render(painter)
+		painter.end()
+
+	scene.set_show_direction(True)
+	view.reset_zoom()
+	paint(None)
+	results['paint_detailed'] = measure(paint, repeat)
+	view.fit_graph()
+	paint(None)
+	results['paint_fitted'] = measure(paint, repeat)
+	scene.detach_graph()
+	return results
@@ -0,0 +1,54 @@
+"""Benchmarks of the bundled sample scripts, with and without the debugger's tracer attached
+
+The tracer holds a breakpoint which is never reached, so the measured cost is that of tracing alone.
+"""
+
+from benchmarks.common import measure, random_graph
+from graphdebugger.headless import HeadlessApp
+from graphdebugger.Graph import Graph
+from graphdebugger.tracer import Tracer
+
+import os
+import runpy
+import sys
+
+
+#the samples use recursion or quadratic priority queue updates, which larger graphs make impractical
+max_size = 10**4
+
+SAMPLES = ('dfs', 'dijkstra', 'mst_prim', 'fordfulkerson')
+
+samples_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'graphdebugger', 'samples')
+
+
+def run_sample(path, graph, traced):
+	previous = Graph.app
+	Graph.app = HeadlessApp(graph)
+	tracer = None
+	if traced:
+		with open(path) as f:
+			never = f.read().count('\n') + 10
+		tracer = Tracer(path, {never}, lambda frame: Tracer.RESUME)
+		tracer.start()
+	try:
+		runpy.run_path(path, run_name='__main__')
+	finally:
+		if tracer is not None:
+			tracer.stop()
+		Graph.app = previous
+
+
+def run(size, repeat):
+	results = {}
+	limit = sys.getrecursionlimit()
+	sys.setrecursionlimit(max(limit, 4 * size + 1000))
+	try:
+		for name in SAMPLES:
+			path = os.path.join(samples_dir, name + '.py')
+			for traced in (False, True):
+				key = name + ('_traced' if traced else '')
+				results[key] = measure(lambda graph: run_sample(path, graph, traced), repeat,
+									   lambda: random_graph(size))
+	finally:
+		sys.setrecursionlimit(limit)
+	return results
@@ -0,0 +1,115 @@
+"""Measure the overhead of the debugger's tracer while resuming toward a breakpoint
+
+Runs a Dijkstra style workload written to a temporary script file three ways: without any tracer, with a
+	tracer equivalent to the previous sys.settrace based one (which inspected every call event in the
+	process and traced every line of the script), and with graphdebugger.tracer.Tracer holding a breakpoint
+	which is never reached.
+
+Run from the repository root with:
+	python -m benchmarks.bench_tracer
+"""
+
+from graphdebugger.tracer import Tracer
+
+import argparse
+import importlib
+import inspect
+import json
+import os
+import sys
+import tempfile
+import time
+
+
+WORKLOAD = '''
+import heapq, random
+
+def build(n, m, seed):
+    rng = random.Random(seed)
+    adj = [[] for _ in range(n)]
+    for _ in range(m):
+        adj[rng.randrange(n)].append((rng.randrange(n), rng.randint(1, 9)))
+    return adj
+
+def dijkstra(adj, s):
+    dist = [float('inf')] * len(adj)
+    dist[s] = 0
+    q = [(0, s)]
+    while q:
+        d, u = heapq.heappop(q)
+        if d > dist[u]:
+            continue
+        for v, w in adj[u]:
+            if d + w < dist[v]:
+                dist[v] = d + w
+                heapq.heappush(q, (dist[v], v))
+    return dist
+
+result = dijkstra(build(NODES, EDGES, 1), 0)
+never = True
+'''
+
+
+def legacy_tracer(file):
+	"""Return a trace function equivalent to the original Debugger.debug_ftrace while resuming"""
+	def trace(frame, event, arg):
+		if event not in {'call','line'}:
+			return
+		if file not in str(inspect.getfile(frame)):
+			return
+		return trace
+	return trace
+
+
+def run_workload(path, mode):
+	module = os.path.splitext(os.path.basename(path))[0]
+	sys.modules.pop(module, None)
+	tracer = None
+	if mode == 'legacy':
+		sys.settrace(legacy_tracer(os.path.basename(path)))
+	elif mode == 'tracer':
+		breakpoints = {WORKLOAD.strip().count('\n') + 2}
+		tracer = Tracer(path, breakpoints, lambda frame: Tracer.RESUME)
+		tracer.start()
+	start = time.perf_counter()
+	try:
+		importlib.import_module(module)
+	finally:
+		elapsed = time.perf_counter() - start
+		if tracer is not None:
+			tracer.stop()
+		sys.settrace(None)
+	return elapsed
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='Benchmark the overhead of the debugger tracer.')
+	parser.add_argument('-n','--nodes',type=int,default=20000,help='Number of nodes in the workload graph.')
+	parser.add_argument('-m','--edges',type=int,default=100000,help='Number of edges in the workload graph.')
+	parser.add_argument('-r','--repeat',type=int,default=3,help='Number of runs per mode, the fastest is reported.')
+	args = parser.parse_args(argv)
+
+	with tempfile.TemporaryDirectory() as dir:
+		path = os.path.join(dir, 'tracer_workload.py')
+		with open(path, 'w') as out:
+			out.write(WORKLOAD.replace('NODES', str(args.nodes)).replace('EDGES', str(args.edges)))
+		sys.path.insert(0, dir)
+		try:
+			results = {mode:min(run_workload(path, mode) for _ in range(args.repeat))
+					   for mode in ('none', 'legacy', 'tracer')}
+		finally:
+			sys.path.remove(dir)
+
+	report = {'benchmark':'tracer',
+			  'python':sys.version.split()[0],
+			  'backend':'sys.monitoring' if Tracer.use_monitoring else 'sys.settrace',
+			  'nodes':args.nodes,
+			  'edges':args.edges,
+			  'seconds':results,
+			  'overhead':{mode:results[mode] / results['none'] for mode in ('legacy', 'tracer')}}
+	print(json.dumps(report, indent=2))
+	return report
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,54 @@
+"""Helpers shared by the benchmark modules"""
+
+from graphdebugger.Graph import Graph
+from graphdebugger.importers import auto_positions
+
+import gc
+import random
+import time
+
+
+def random_graph(size, seed=1):
+	"""Return a random directed graph with size edges and size // 4 nodes, labeled for the samples
+
+	Edge weights are integers between 1 and 100. The first node is labeled 'source' and the last one
+		'target', as expected by the dijkstra and fordfulkerson samples.
+	"""
+	rng = random.Random(seed)
+	n = max(size // 4, 2)
+	sources = [rng.randrange(n) for _ in range(size)]
+	#no self loops, since a self loop is in both out and inc of its node
+	targets = [(s + 1 + rng.randrange(n - 1)) % n for s in sources]
+	weights = [rng.randint(1, 100) for _ in range(size)]
+	xs, ys = auto_positions(n)
+	return Graph.from_columns(xs, ys, sources, targets, weights=weights,
+							  node_labels=['source'] + [''] * (n - 2) + ['target'],
+							  labels={'source':0, 'target':n - 1})
+
+
+def columns(graph):
+	"""Return the arguments of Graph.from_columns which rebuild the provided graph"""
+	nodes = list(graph.nodes)
+	index = {id(n):i for i,n in enumerate(nodes)}
+	edges = list(graph.edges)
+	return ([n.x for n in nodes], [n.y for n in nodes], [index[id(e.src)] for e in edges],
+			[index[id(e.targ)] for e in edges], [e.weight for e in edges])
+
+
+def measure(f, repeat, setup=None):
+	"""Return the fastest of repeat timed calls of f, in seconds
+
+	args:
+		f(callable): f(state) to time, where state is the value returned by setup
+		repeat(int): number of timed calls
+		setup(callable): untimed f() -> state called before every timed call. Default = None
+	"""
+	best = None
+	for _ in range(repeat):
+		state = setup() if setup is not None else None
+		gc.collect()
+		start = time.perf_counter()
+		f(state)
+		elapsed = time.perf_counter() - start
+		best = elapsed if best is None else min(best, elapsed)
+	return best
@@ -0,0 +1,110 @@
+"""Run the benchmark suite and optionally compare the results with those of an earlier run
+
+Every benchmark is run on random graphs of each requested size, where the size is the number of edges
+	and the graphs have a quarter as many nodes. Sizes above a benchmark's max_size are skipped unless
+	--no-limits is given. Results are written as JSON:
+
+	{"python": ..., "platform": ..., "time": ..., "repeat": ...,
+	 "results": {"core.add_edge": {"1000": seconds, ...}, ...}}
+
+Values are the fastest of --repeat runs in seconds, except io.size_* entries which are file sizes in
+	bytes. Comparing with a previous results file prints the ratio of every shared entry and exits with
+	status 1 if any entry got slower by more than --threshold.
+
+Run from the repository root with:
+	python -m benchmarks.suite -o results.json
+	python -m benchmarks.suite --compare results.json
+"""
+
+import argparse
+import datetime
+import importlib
+import json
+import platform
+import sys
+
+
+BENCHMARKS = ('core', 'io', 'samples', 'render')
+
+#entries faster than this, in seconds, are too noisy to be reported as regressions
+noise_floor = 0.001
+
+
+def run_suite(sizes, benchmarks=BENCHMARKS, repeat=3, limits=True, log=sys.stderr):
+	"""Run the requested benchmarks and return the results dict described in the module docstring"""
+	results = {}
+	for name in benchmarks:
+		try:
+			module = importlib.import_module('benchmarks.bench_' + name)
+		except ImportError as e:
+			print('skipping {}: {}'.format(name, e), file=log)
+			continue
+		for size in sizes:
+			if limits and size > module.max_size:
+				continue
+			print('{} {}'.format(name, size), file=log, flush=True)
+			try:
+				values = module.run(size, repeat)
+			except ImportError as e:
+				print('skipping {}: {}'.format(name, e), file=log)
+				break
+			for key, value in values.items():
+				results.setdefault(name + '.' + key, {})[str(size)] = value
+
+	return {'python':sys.version.split()[0],
+			'platform':platform.platform(),
+			'time':datetime.datetime.now().isoformat(timespec='seconds'),
+			'repeat':repeat,
+			'results':results}
+
+
+def compare(baseline, current, threshold):
+	"""Return a list of (name, size, old, new, ratio) for every entry in both runs, and the list of regressions"""
+	rows = []
+	regressions = []
+	for name, values in sorted(current['results'].items()):
+		for size, new in values.items():
+			old = baseline['results'].get(name, {}).get(size)
+			if old is None:
+				continue
+			ratio = new / old if old else float('inf')
+			rows.append((name, size, old, new, ratio))
+			if ratio > threshold and max(old, new) >= noise_floor and not name.startswith('io.size_'):
+				regressions.append(rows[-1])
+	return rows, regressions
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='Run the graphdebugger benchmark suite.')
+	parser.add_argument('--sizes',type=int,nargs='+',default=[10**3, 10**4, 10**5, 10**6],help='Graph sizes, in edges.')
+	parser.add_argument('-b','--benchmarks',nargs='+',choices=BENCHMARKS,default=list(BENCHMARKS),help='Benchmarks to run.')
+	parser.add_argument('-r','--repeat',type=int,default=3,help='Number of runs per entry, the fastest is reported.')
+	parser.add_argument('--no-limits',action='store_true',help='Also run sizes above the limit of each benchmark.')
+	parser.add_argument('-o','--output',help='File to write the results to. Default = print them.')
+	parser.add_argument('--compare',help='Results file of an earlier run to compare with.')
+	parser.add_argument('--threshold',type=float,default=1.25,help='Slowdown ratio reported as a regression.')
+	args = parser.parse_args(argv)
+
+	report = run_suite(args.sizes, args.benchmarks, args.repeat, not args.no_limits)
+	if args.output:
+		with open(args.output, 'w') as out:
+			json.dump(report, out, indent=2)
+	else:
+		print(json.dumps(report, indent=2))
+
+	if args.compare:
+		with open(args.compare) as f:
+			baseline = json.load(f)
+		rows, regressions = compare(baseline, report, args.threshold)
+		for name, size, old, new, ratio in rows:
+			flag = '  REGRESSION' if (name, size, old, new, ratio) in regressions else ''
+			print('{:32s} {:>8s} {:12.6g} {:12.6g} {:7.2f}x{}'.format(name, size, old, new, ratio, flag),
+				  file=sys.stderr)
+		if regressions:
+			print('{} regressions above {}x'.format(len(regressions), args.threshold), file=sys.stderr)
+			return 1
+	return 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -2,19 +2,26 @@
 from PyQt5.QtWidgets import *
 from PyQt5.QtGui import *
 from PyQt5.QtCore import *
-from graphdebugger.Graph import Graph
-from graphdebugger.Graph import GraphScene
+from graphdebugger.Graph import Edge, Graph, Node
+from graphdebugger.GraphScene import GraphScene, GraphView, heat_color
+from graphdebugger.timeline import Timeline
+from graphdebugger.tracer import Breakpoint, Breakpoints, LineProfiler, Tracer
+from graphdebugger.worker import SharedGraphState
+from graphdebugger.counters import AccessCounter
+from graphdebugger.player import Player
+from graphdebugger.watchpoints import ATTRIBUTES, Watchpoint, Watchpoints
+from graphdebugger import importers, worker
 
 import sys
 import os
 import math
-import inspect
 import multiprocessing
 import importlib
 import threading
 import tempfile
 
 import pkgutil
+from contextlib import ExitStack
 from enum import Enum
 from queue import Queue
 
@@ -25,6 +32,13 @@ class Op(Enum):
     SKIP = 2
     RESUME = 3
     START = 4
+    BACK = 5
+    REVERSE = 6
+    SEEK = 7
+    PROFILE = 8
+    CHANGE = 9
+    PLAY = 10
+    PAUSE = 11
 
 def get_image(file):
     pm = QPixmap()
@@ -44,6 +58,7 @@ class GraphApp(QMainWindow):
 
         self.run = None
         self.current_file = None
+        self.access_counter = None
 
         self.setup_main_window(graph,script)
         self.setup_debugger()
@@ -53,11 +68,11 @@ class GraphApp(QMainWindow):
     def setup_main_window(self,graph=None, script=None):
         self.text_edit = Editor()
         self.breakpoints = self.text_edit.lm.breakpoints
+        self.watchpoints = Watchpoints()
+        self.watch_list = WatchList(self.watchpoints)
 
-        self.graph_display = QGraphicsView()
-        self.graph_display.setRenderHint(QPainter.Antialiasing)
-        self.graph_display.setMouseTracking(True)
-        self.graph_display.setScene(GraphScene())
+        self.graph_display = GraphView(GraphScene())
+        self.layout_runner = LayoutRunner(self)
 
         if script:
             text = open(script).read()
@@ -74,13 +89,25 @@ class GraphApp(QMainWindow):
 
         self.setCentralWidget(central_widget)
 
+        self.profile_table = ProfileTable()
+        self.profile_dock = QDockWidget('Profile', self)
+        self.profile_dock.setWidget(self.profile_table)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.profile_dock)
+        self.profile_dock.hide()
+
+        self.watch_dock = QDockWidget('Watchpoints', self)
+        self.watch_dock.setWidget(self.watch_list)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.watch_dock)
+        self.watch_dock.hide()
+
     def setup_debugger(self):
         self.debug_queue = Queue()
-        self.debugger = Debugger(self,self.debug_queue,self.breakpoints)
+        self.debugger = Debugger(self,self.debug_queue,self.breakpoints,self.watchpoints)
         self.debug_thread = QThread()
         self.debugger.moveToThread(self.debug_thread)
         self.debug_thread.started.connect(self.debugger.run)
         self.debug_thread.start()
+        self.process_runner = ProcessRunner(self,self.breakpoints,self.watchpoints)
 
     def setup_actions(self):
 
@@ -99,12 +126,32 @@ class GraphApp(QMainWindow):
         import_graph = QAction('&Import Graph', self)
         import_graph.triggered.connect(self.graph_import)
 
+        generate_graph = QAction('&Generate Graph...', self)
+        generate_graph.triggered.connect(self.graph_generate)
+
         open = QAction(QIcon(get_image('assets/fldr_obj.png')), '&Open', self)
         open.triggered.connect(self.load_file)
 
         run = QAction(QIcon(get_image('assets/run_exc.png')), '&Run', self)
         run.triggered.connect(self.debug_start)
 
+        profile = QAction('Pro&file', self)
+        profile.setToolTip('Run the script to the end, recording the hits and time of every line')
+        profile.triggered.connect(self.profile_start)
+
+        clear_profile = QAction('&Clear Profile', self)
+        clear_profile.triggered.connect(self.clear_profile)
+
+        self.count_accesses = QAction('Count &Accesses', self)
+        self.count_accesses.setToolTip('Count the reads and writes of every node and edge during runs')
+        self.count_accesses.setCheckable(True)
+
+        clear_access_heat = QAction('Clear Access &Heatmap', self)
+        clear_access_heat.triggered.connect(lambda : self.graph_display.scene().show_heat(None))
+
+        export_access_counts = QAction('Export Access &Counts', self)
+        export_access_counts.triggered.connect(self.export_access_counts)
+
         resume = QAction(QIcon(get_image('assets/resume_co.png')), '&Resume', self)
         resume.triggered.connect(self.debug_resume)
 
@@ -117,6 +164,47 @@ class GraphApp(QMainWindow):
         stop = QAction(QIcon(get_image('assets/terminate_co.png')), '&Stop', self)
         stop.triggered.connect(self.debug_stop)
 
+        self.step_back = step_back = QAction(QIcon(get_image('assets/stepreturn_co.png')), 'Step &Back', self)
+        step_back.triggered.connect(self.debug_back)
+
+        self.reverse = reverse = QAction('Re&verse Resume', self)
+        reverse.triggered.connect(self.debug_reverse)
+
+        self.play = QAction('&Play', self)
+        self.play.setToolTip('Step through the script automatically, at the rate of the slider')
+        self.play.setCheckable(True)
+        self.play.triggered.connect(self.debug_play)
+
+        self.play_rate = QSlider(Qt.Horizontal)
+        self.play_rate.setMaximumWidth(150)
+        #logarithmic, from 10**0 to 10**4 lines per second
+        self.play_rate.setRange(0, 400)
+        self.play_rate.setToolTip('Lines per second while playing')
+        self.play_rate_label = QLabel()
+        self.play_rate_label.setMinimumWidth(self.play_rate_label.fontMetrics().boundingRect('10000 lines/s').width())
+        self.play_rate.valueChanged.connect(self.set_play_rate)
+        self.play_rate.setValue(int(100 * math.log10(self.debugger.player.rate)))
+
+        next_change = QAction('Run to Next &Change', self)
+        next_change.setToolTip('Run or resume until the script next changes the graph, without tracing lines')
+        next_change.triggered.connect(self.debug_next_change)
+
+        add_watchpoint = QAction('Add &Watchpoint...', self)
+        add_watchpoint.triggered.connect(lambda : self.add_watchpoint(None))
+
+        clear_watchpoints = QAction('Clear Watchpoints', self)
+        clear_watchpoints.triggered.connect(self.clear_watchpoints)
+
+        self.process_mode = QAction('Run in Separate &Process', self)
+        self.process_mode.setCheckable(True)
+        self.process_mode.toggled.connect(self.set_process_mode)
+
+        self.timeline_slider = QSlider(Qt.Horizontal)
+        self.timeline_slider.setMaximumWidth(200)
+        self.timeline_slider.setRange(0, 0)
+        self.timeline_slider.setToolTip('Timeline')
+        self.timeline_slider.valueChanged.connect(self.debug_seek)
+
         toggle_weight = QAction(QIcon(get_image('assets/weights.png')), '&Display Weights', self)
         toggle_weight.setCheckable(True)
         toggle_weight.triggered.connect(self.toggle_weight)
@@ -129,6 +217,24 @@ class GraphApp(QMainWindow):
         toggle_directed.setCheckable(True)
         toggle_directed.triggered.connect(self.toggle_directed)
 
+        zoom_in = QAction('Zoom &In', self)
+        zoom_in.setShortcut(QKeySequence.ZoomIn)
+        zoom_in.triggered.connect(lambda : self.graph_display.zoom(GraphView.zoom_step))
+
+        zoom_out = QAction('Zoom &Out', self)
+        zoom_out.setShortcut(QKeySequence.ZoomOut)
+        zoom_out.triggered.connect(lambda : self.graph_display.zoom(1 / GraphView.zoom_step))
+
+        fit_graph = QAction('&Fit Graph', self)
+        fit_graph.setShortcut('Ctrl+0')
+        fit_graph.triggered.connect(self.graph_display.fit_graph)
+
+        auto_layout = QAction('Auto &Layout', self)
+        auto_layout.triggered.connect(lambda : self.layout_runner.start())
+
+        stop_layout = QAction('Stop La&yout', self)
+        stop_layout.triggered.connect(self.layout_runner.stop)
+
         menubar = self.menuBar()
 
         fileMenu = menubar.addMenu('&File')
@@ -139,7 +245,32 @@ class GraphApp(QMainWindow):
         fileMenu.addAction(open)
         fileMenu.addSeparator()
         fileMenu.addAction(import_graph)
+        fileMenu.addAction(generate_graph)
         fileMenu.addAction(export_graph)
+        fileMenu.addAction(export_access_counts)
+
+        viewMenu = menubar.addMenu('&View')
+
+        viewMenu.addAction(zoom_in)
+        viewMenu.addAction(zoom_out)
+        viewMenu.addAction(fit_graph)
+        viewMenu.addSeparator()
+        viewMenu.addAction(auto_layout)
+        viewMenu.addAction(stop_layout)
+        viewMenu.addSeparator()
+        viewMenu.addAction(self.profile_dock.toggleViewAction())
+        viewMenu.addAction(clear_profile)
+        viewMenu.addSeparator()
+        viewMenu.addAction(self.count_accesses)
+        viewMenu.addAction(clear_access_heat)
+
+        watchMenu = menubar.addMenu('&Watch')
+
+        watchMenu.addAction(next_change)
+        watchMenu.addSeparator()
+        watchMenu.addAction(add_watchpoint)
+        watchMenu.addAction(clear_watchpoints)
+        watchMenu.addAction(self.watch_dock.toggleViewAction())
 
         toolbar = self.addToolBar('bar')
         toolbar.addAction(new)
@@ -151,6 +282,16 @@ class GraphApp(QMainWindow):
         toolbar.addAction(step)
         toolbar.addAction(skip)
         toolbar.addAction(stop)
+        toolbar.addAction(self.play)
+        toolbar.addWidget(self.play_rate)
+        toolbar.addWidget(self.play_rate_label)
+        toolbar.addAction(next_change)
+        toolbar.addAction(profile)
+        toolbar.addAction(self.process_mode)
+        toolbar.addSeparator()
+        toolbar.addAction(step_back)
+        toolbar.addAction(reverse)
+        toolbar.addWidget(self.timeline_slider)
         toolbar.addSeparator()
         toolbar.addAction(toggle_weight)
         toolbar.addAction(toggle_flow)
@@ -159,7 +300,20 @@ class GraphApp(QMainWindow):
 
     def setup_connectors(self):
         self.debugger.line_changed.connect(self.text_edit.change_active)
-        self.debugger.graph_reloaded.connect(self.graph_display.scene().set_graph_from_json)
+        self.debugger.timeline_changed.connect(self.update_timeline)
+        self.process_runner.line_changed.connect(self.text_edit.change_active)
+        self.debugger.logged.connect(self.show_log)
+        self.process_runner.logged.connect(self.show_log)
+        self.process_runner.graph_reloaded.connect(self.graph_display.scene().restore_graph)
+        self.debugger.graph_reloaded.connect(self.graph_display.scene().restore_graph)
+        self.debugger.profile_finished.connect(self.show_profile)
+        self.debugger.accesses_counted.connect(self.show_access_counts)
+        self.profile_table.line_selected.connect(self.text_edit.go_to_line)
+        self.debugger.watch_hit.connect(self.statusBar().showMessage)
+        self.process_runner.watch_hit.connect(self.statusBar().showMessage)
+        self.graph_display.scene().watch_requested.connect(self.add_watchpoint)
+        self.debugger.playing_changed.connect(self.play.setChecked)
+        self.process_runner.playing_changed.connect(self.play.setChecked)
 
     def new_file(self):
         #TODO: save current?
@@ -197,43 +351,174 @@ class GraphApp(QMainWindow):
 
     def debug_resume(self):
 
-        self.debug_queue.put(Op.RESUME)
+        self.send_op(Op.RESUME)
 
     def debug_step(self):
 
-        self.debug_queue.put(Op.STEP)
+        self.send_op(Op.STEP)
 
     def debug_stop(self):
 
-        self.debug_queue.put(Op.STOP)
+        self.send_op(Op.STOP)
 
     def debug_skip(self):
 
-        self.debug_queue.put(Op.SKIP)
+        self.send_op(Op.SKIP)
+
+    def send_op(self, op):
+        if self.process_runner.running:
+            self.process_runner.send_op(op)
+        else:
+            self.debug_queue.put(op)
+
+    def set_process_mode(self, checked):
+        #the worker process keeps no timeline, so there is nothing to step back through
+        for widget in (self.step_back, self.reverse, self.timeline_slider):
+            widget.setEnabled(not checked)
+
+    def debug_back(self):
+
+        self.debug_queue.put(Op.BACK)
+
+    def debug_reverse(self):
+
+        self.debug_queue.put(Op.REVERSE)
+
+    def debug_seek(self, position):
+
+        self.debug_queue.put((Op.SEEK, position))
 
     def debug_start(self):
         successful = self.save_file()
-        if not succesful:
+        if not successful:
             return
-        self.debug_queue.put(Op.START)
+        self.graph_display.scene().show_heat(None)
+        if self.process_runner.running:
+            self.process_runner.send_op(Op.START)
+        elif self.process_mode.isChecked():
+            self.process_runner.start()
+        else:
+            self.debug_queue.put(Op.START)
+
+    def debug_next_change(self):
+        if self.process_runner.running:
+            self.process_runner.send_op(Op.CHANGE)
+        elif not self.save_file():
+            return
+        elif self.process_mode.isChecked():
+            self.graph_display.scene().show_heat(None)
+            self.process_runner.start(next_change=True)
+        else:
+            self.graph_display.scene().show_heat(None)
+            self.debug_queue.put(Op.CHANGE)
+
+    def debug_play(self, checked):
+        if not checked:
+            self.send_op(Op.PAUSE)
+        elif self.process_runner.running:
+            self.process_runner.send_op(Op.PLAY)
+        elif not self.save_file():
+            self.play.setChecked(False)
+        elif self.process_mode.isChecked():
+            self.graph_display.scene().show_heat(None)
+            self.process_runner.start(play=True)
+        else:
+            self.graph_display.scene().show_heat(None)
+            self.debug_queue.put(Op.PLAY)
+
+    def set_play_rate(self, value):
+        rate = round(10 ** (value / 100))
+        self.debugger.player.set_rate(rate)
+        self.process_runner.set_rate(rate)
+        self.play_rate_label.setText('{} lines/s'.format(rate))
+
+    def add_watchpoint(self, element):
+        """Ask for the attributes and condition of a new watchpoint on element, a Node, an Edge or None"""
+        dialog = WatchpointDialog(self, element)
+        if dialog.exec() == QDialog.Accepted:
+            self.watchpoints.append(dialog.watchpoint)
+            self.watch_list.refresh()
+            self.watch_dock.show()
+
+    def clear_watchpoints(self):
+        self.watchpoints.clear()
+        self.watch_list.refresh()
+
+    def profile_start(self):
+        if self.process_runner.running or not self.save_file():
+            return
+        self.graph_display.scene().show_heat(None)
+        self.debug_queue.put(Op.PROFILE)
+
+    def show_profile(self, profiler):
+        self.text_edit.lm.set_heat(profiler.times)
+        self.profile_table.set_results(profiler, self.text_edit.toPlainText().splitlines())
+        self.profile_dock.show()
+
+    def clear_profile(self):
+        self.text_edit.lm.set_heat({})
+        self.profile_table.setRowCount(0)
+
+    def show_access_counts(self, counter):
+        self.access_counter = counter
+        self.graph_display.scene().show_heat(counter.totals())
+
+    def export_access_counts(self):
+        if self.access_counter is None:
+            QMessageBox.information(self, 'Export Access Counts', 'Enable View > Count Accesses and run a script first.')
+            return
+        filename,file_type = QFileDialog.getSaveFileName(self, 'Export Access Counts To', get_dirpath('graphs/'),
+                        'Comma Separated Values (*.csv);;All Files (*.*)')
+        if not filename:
+            return
+        self.access_counter.write_csv(self.get_graph(), filename)
+
+    def show_log(self, lineno, message):
+        """Show the message of a log breakpoint in the status bar and on standard output"""
+        text = 'line {}: {}'.format(lineno, message)
+        print(text)
+        self.statusBar().showMessage(text)
+
+    def update_timeline(self, position, length):
+        self.timeline_slider.blockSignals(True)
+        self.timeline_slider.setRange(0, max(length - 1, 0))
+        self.timeline_slider.setValue(position)
+        self.timeline_slider.blockSignals(False)
 
     def graph_export(self):
         filename,file_type = QFileDialog.getSaveFileName(self, 'Export Graph To', get_dirpath('graphs/'), 
-                        'JavaScript Object Notation File (*.json);;All Files (*.*)')
+                        'JavaScript Object Notation File (*.json);;Graph Binary File (*.vgb);;All Files (*.*)')
         if not filename:
             return
         self.get_graph().write_graph(filename)
 
     def graph_import(self):
         filename,file_type = QFileDialog.getOpenFileName(self, 'Select Graph To Import', get_dirpath('graphs/'),
-                        'JavaScript Object Notation File (*.json);;All Files (*.*)')
+                        'JavaScript Object Notation File (*.json);;Graph Binary File (*.vgb);;'
+                        + importers.FILE_FILTER + ';;All Files (*.*)')
         if not filename:
             return
         graph = Graph.read_graph(filename)
         self.set_graph(graph)
 
+    def graph_generate(self):
+        try:
+            from graphdebugger import generators
+        except ImportError:
+            QMessageBox.warning(self, 'Generate Graph', 'Generating graphs requires NumPy.')
+            return
+        dialog = GenerateDialog(self)
+        if dialog.exec() != QDialog.Accepted:
+            return
+        seed = dialog.seed.value()
+        self.set_graph(generators.generate(dialog.kind.currentData(), dialog.nodes.value(), None if seed < 0 else seed))
+
     def set_graph(self, graph):
+        self.layout_runner.stop()
+        self.watchpoints.discard_elements()
+        self.watch_list.refresh()
         self.graph_display.scene().set_graph(graph)
+        self.graph_display.fit_graph()
 
     def get_graph(self):
         return self.graph_display.scene().get_graph()
@@ -255,21 +540,35 @@ class DebugHalted(Exception):
 class Debugger(QObject):
 
     line_changed = pyqtSignal(int, name='lineChanged')
-    graph_reloaded = pyqtSignal(dict, name='graphReloaded')
+    graph_reloaded = pyqtSignal(object, name='graphReloaded')
     debugging_status_changed = pyqtSignal(int, name='DebuggingStatusChanged')
+    timeline_changed = pyqtSignal(int, int, name='timelineChanged')
+    profile_finished = pyqtSignal(object, name='profileFinished')
+    accesses_counted = pyqtSignal(object, name='accessesCounted')
+    logged = pyqtSignal(int, str, name='logged')
+    watch_hit = pyqtSignal(str, name='watchHit')
+    playing_changed = pyqtSignal(bool, name='playingChanged')
 
     obj = None
     _running = False
 
-    def __init__(self,app,input,breakpoints):
+    #approximate memory, in bytes, kept for stepping backwards through a run
+    timeline_budget = 64*2**20
+
+    def __init__(self,app,input,breakpoints,watchpoints):
         super().__init__()
         self.input = input
         self.breakpoints = breakpoints
+        self.breakpoints.on_log = self.logged.emit
+        self.watchpoints = watchpoints
+        self.watchpoints.on_hit = self.watch_hit.emit
+        self.player = Player()
         self.app = app
         self.mod = None
         self.file = None
-        self.prev_op = None
-        self.waiting = False
+        self.timeline = None
+        self.tracer = None
+        self.counter = None
         Debugger.obj = self
 
     def run(self):
@@ -277,151 +576,569 @@ class Debugger(QObject):
         while True:
             op = self.input.get()
 
-            while op != Op.START:
+            while op not in (Op.START, Op.PROFILE, Op.CHANGE, Op.PLAY):
                 op = self.input.get()
-            self.start_debug()
+            if op == Op.PROFILE:
+                self.start_profile()
+            else:
+                self.start_debug(op)
 
 
-    def start_debug(self):
-        self.waiting = False
-        sys.settrace(Debugger.debug_ftrace)
+    def start_debug(self, op=Op.START):
+        """Run the script, pausing on breakpoints and watchpoints
+
+        Op.CHANGE pauses on the first change to the graph, and Op.PLAY plays the script from its first line.
+        """
         self.input.queue.clear()
         
-        data = Graph.write_graph_to_json(self.app.get_graph())
+        snapshot = self.app.get_graph().snapshot()
+        self.timeline = Timeline(self.app.get_graph(), Debugger.timeline_budget)
+        self.timeline.attach()
+        self.breakpoints.reset_hits()
+        self.tracer = Tracer(self.app.current_file, self.breakpoints, self.pause, self.timeline.mark)
+        self.tracer.start()
+        self.watchpoints.start(self.tracer)
+        self.watchpoints.next_change = op == Op.CHANGE
+        if op == Op.PLAY:
+            self.start_playing()
+        self.start_counting()
         try:
-            if not self.mod or self.mod.__name__ + '.py' not in self.app.current_file:
-                file = os.path.basename(self.app.current_file)
-                dir = os.path.dirname(self.app.current_file)
-
-                sys.path.append(dir)
-                self.file = file
-                self.mod = importlib.import_module(file.replace('.py', ''))
-            else:
-                importlib.reload(self.mod)
-
+            self.run_script()
         except DebugHalted:
             pass
-        self.graph_reloaded.emit(data)
+        finally:
+            self.stop_counting()
+            self.watchpoints.stop()
+            self.tracer.stop()
+            self.stop_playing()
+            self.timeline.detach()
+            self.timeline_changed.emit(0, 0)
+        self.graph_reloaded.emit(snapshot)
+        self.emit_counts()
         self.line_changed.emit(-2)
 
         self.input.queue.clear()
 
-    def debug_ftrace(frame, event, arg):
-        if event not in {'call','line'}:
-            return
-
-        if Debugger.obj.prev_op == Op.SKIP and event == 'call':
-            return
-
-        if not Debugger.obj.file or Debugger.obj.file not in str(inspect.getfile(frame)):
-            return
+    def start_profile(self):
+        """Run the script to the end without pausing and emit the LineProfiler holding its results"""
+        self.input.queue.clear()
 
-        if frame.f_lineno in Debugger.obj.breakpoints:
+        snapshot = self.app.get_graph().snapshot()
+        profiler = LineProfiler(self.app.current_file, self.check_stop)
+        profiler.start()
+        self.start_counting()
+        try:
+            self.run_script()
+        except DebugHalted:
+            pass
+        finally:
+            self.stop_counting()
+            profiler.stop()
+        self.graph_reloaded.emit(snapshot)
+        self.emit_counts()
+        self.profile_finished.emit(profiler)
 
-            Debugger.obj.waiting = True
+        self.input.queue.clear()
 
-        if Debugger.obj.waiting:
-            Debugger.obj.line_changed.emit(frame.f_lineno)
+    def run_script(self):
+        """Import the current file as a module, or reload it if it was imported by a previous run"""
+        if not self.mod or self.mod.__name__ + '.py' not in self.app.current_file:
+            file = os.path.basename(self.app.current_file)
+            dir = os.path.dirname(self.app.current_file)
 
-            op = Debugger.obj.input.get()
-            Debugger.obj.prev_op = op
+            sys.path.append(dir)
+            self.file = file
+            self.mod = importlib.import_module(file.replace('.py', ''))
+        else:
+            importlib.reload(self.mod)
+
+    def start_counting(self):
+        """Start an AccessCounter on this thread if View > Count Accesses is checked"""
+        self.counter = None
+        if self.app.count_accesses.isChecked():
+            self.counter = AccessCounter()
+            self.counter.start()
+
+    def stop_counting(self):
+        if self.counter is not None:
+            self.counter.stop()
+
+    def emit_counts(self):
+        if self.counter is not None:
+            self.accesses_counted.emit(self.counter)
+            self.counter = None
+
+    def check_stop(self, lineno):
+        """LineProfiler callback which aborts the run once Stop is pressed"""
+        if not self.input.empty() and self.input.get() == Op.STOP:
+            raise DebugHalted
+
+    def wait(self, lineno):
+        """Show the provided line and block until an op arrives which continues execution
+
+        Ops which move through the timeline are handled here, since they only change the displayed
+            graph state. Execution only continues once the timeline is back at its head.
+        """
+        self.line_changed.emit(lineno)
+        self.emit_timeline()
 
-            if op == Op.STOP:
-                raise DebugHalted
-            elif op == Op.STEP:
-                return Debugger.debug_trace
-            elif op == Op.SKIP:
-                return
+        while True:
+            op = self.input.get()
+            arg = None
+            if isinstance(op, tuple):
+                op, arg = op
+
+            if op == Op.PAUSE or op == Op.PROFILE:
+                #profiling needs a run of its own, it must not resume this one
+                continue
+            elif op == Op.BACK:
+                line = self.timeline.back()
+            elif op == Op.REVERSE:
+                line = self.timeline.back_to(self.breakpoints)
+            elif op == Op.SEEK:
+                line = self.timeline.seek(self.timeline.first + arg)
+            elif op == Op.STOP or self.timeline.at_head():
+                return op
+            elif op == Op.PLAY:
+                #play continues the run, from the most recent step
+                line = self.timeline.seek(self.timeline.head)
+                self.line_changed.emit(line)
+                return op
             elif op == Op.RESUME or op == Op.START:
-                Debugger.obj.waiting = False
-                return Debugger.debug_ftrace
+                line = self.timeline.forward_to(self.breakpoints)
+                if self.timeline.at_head() and line not in self.breakpoints:
+                    return op
+            else:
+                line = self.timeline.forward()
+
+            if line is not None:
+                self.line_changed.emit(line)
+            self.emit_timeline()
+
+    def emit_timeline(self):
+        self.timeline_changed.emit(self.timeline.position - self.timeline.first, len(self.timeline))
+
+    def start_playing(self):
+        self.player.start()
+        self.tracer.mode = Tracer.STEP
+        self.playing_changed.emit(True)
+
+    def stop_playing(self):
+        if self.player.playing:
+            self.player.stop()
+            self.playing_changed.emit(False)
+
+    def pause(self, frame):
+        """Tracer callback which shows the paused line and translates the next op into a tracer mode
+
+        While playing, steps on without waiting, only showing the line on the frames of the player. Any op,
+            a breakpoint or a watchpoint ends playing.
+        """
+        op = None
+        if self.player.playing:
+            if not self.input.empty():
+                op = self.input.get()
+            elif not self.tracer.at_breakpoint:
+                if self.player.step():
+                    self.line_changed.emit(frame.f_lineno)
+                    self.emit_timeline()
+                return Tracer.STEP
+            self.stop_playing()
+            if op not in (Op.STOP, Op.STEP, Op.SKIP, Op.RESUME, Op.START, Op.CHANGE):
+                #ops which move through the timeline are handled while paused
+                if op is not None and op != Op.PAUSE and op != Op.PLAY:
+                    self.input.put(op)
+                op = None
+
+        if op is None:
+            #replaying the timeline while paused is not part of the run
+            with ExitStack() as stack:
+                if self.counter is not None:
+                    stack.enter_context(self.counter.suspended())
+                stack.enter_context(self.watchpoints.suspended())
+                op = self.wait(frame.f_lineno)
+
+        if op == Op.STOP:
+            raise DebugHalted
+        elif op == Op.PLAY:
+            self.start_playing()
+            return Tracer.STEP
+        elif op == Op.STEP:
+            return Tracer.STEP
+        elif op == Op.SKIP:
+            return Tracer.OVER
         else:
-            return Debugger.debug_ftrace
-
-    def debug_trace(frame, event, arg):
-
-        if event != 'line':
-            return
+            self.watchpoints.next_change = op == Op.CHANGE
+            return Tracer.RESUME
 
-        if frame.f_lineno in Debugger.obj.breakpoints:
-            Debugger.obj.waiting = True
+class ProcessRunner(QObject):
+    """Runs the user's script in a worker process so that heavy scripts can not stall or crash the GUI
 
-        if Debugger.obj.waiting:
-            Debugger.obj.line_changed.emit(frame.f_lineno)
+    The worker shares the state of the graph through a SharedGraphState and reports changed elements,
+        paused lines and the end of the run over a pipe, see graphdebugger.worker. Stopping a run kills
+        the worker process immediately.
+    """
 
-            op = Debugger.obj.input.get()
-
-            if op == Op.STOP:
-                raise DebugHalted
-            elif op == Op.STEP or op == Op.SKIP:
-                return Debugger.debug_trace
-            elif op == Op.RESUME:
-                Debugger.obj.waiting = False
-                return Debugger.debug_trace
-
-
-
-
-
-    # def debug_fbtrace(frame, event, arg):
-
-    #     if event != 'call':
-    #         return
+    line_changed = pyqtSignal(int, name='lineChanged')
+    graph_reloaded = pyqtSignal(object, name='graphReloaded')
+    changes_received = pyqtSignal(list, list, dict, name='changesReceived')
+    finished = pyqtSignal(object, name='finished')
+    logged = pyqtSignal(int, str, name='logged')
+    watch_hit = pyqtSignal(str, name='watchHit')
+    playing_changed = pyqtSignal(bool, name='playingChanged')
+
+    def __init__(self,app,breakpoints,watchpoints):
+        super().__init__()
+        self.app = app
+        self.breakpoints = breakpoints
+        self.watchpoints = watchpoints
+        self.rate = Player().rate
+        self.process = None
+        self.conn = None
+        self.state = None
+        self.snapshot = None
+        self.changes_received.connect(self.apply_changes)
+        self.finished.connect(self.finish)
 
-    #     if not Debugger.obj.file or Debugger.obj.file not in str(inspect.getfile(frame)):
-    #         return
+    @property
+    def running(self):
+        return self.process is not None
+
+    def start(self, next_change=False, play=False):
+        graph = self.app.get_graph()
+        self.snapshot = graph.snapshot()
+        self.nodes = list(graph.nodes)
+        self.edges = list(graph.edges)
+        self.state = SharedGraphState(len(self.nodes), len(self.edges))
+        self.state.write_graph(graph)
+        #the worker builds the graph from the shared state, only the labels are sent along
+        index = {id(n):i for i,n in enumerate(self.nodes)}
+        node_labels = {i:n.label for i,n in enumerate(self.nodes) if n.label}
+        labels = {label:index[id(n)] for label,n in graph.labels.items() if id(n) in index}
+
+        context = multiprocessing.get_context('spawn')
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=worker.run_script, daemon=True,
+                                       args=(child_conn, self.state.name, len(self.nodes), len(self.edges),
+                                             node_labels, labels, self.app.current_file, self.breakpoints.specs(),
+                                             self.watchpoints.specs(graph), next_change,
+                                             self.rate if play else None))
+        self.process.start()
+        child_conn.close()
+        threading.Thread(target=self.receive, args=(self.conn,), daemon=True).start()
+
+    def receive(self, conn):
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                self.finished.emit(None)
+                return
+            if message[0] == 'changes':
+                self.changes_received.emit(message[1], message[2], message[3])
+            elif message[0] == 'line':
+                self.line_changed.emit(message[1])
+            elif message[0] == 'log':
+                self.logged.emit(message[1], message[2])
+            elif message[0] == 'watch':
+                self.watch_hit.emit(message[1])
+            elif message[0] == 'playing':
+                self.playing_changed.emit(message[1])
+            elif message[0] == 'done':
+                self.finished.emit(message[1])
+                return
 
-    #     if frame.f_lineno in Debugger.obj.breakpoints:
-    #         return Debugger.debug_ftrace(frame, event, arg)
-    #     else:
-    #         return Debugger.debug_btrace
+    def send_op(self, op):
+        if op == Op.STOP:
+            self.process.kill()
+            return
+        mode = {Op.STEP:Tracer.STEP, Op.SKIP:Tracer.OVER, Op.RESUME:Tracer.RESUME, Op.START:Tracer.RESUME,
+                Op.CHANGE:'change', Op.PLAY:'play', Op.PAUSE:'pause'}.get(op)
+        if mode is None:
+            return
+        try:
+            self.conn.send(('breakpoints', self.breakpoints.specs()))
+            self.conn.send(('watchpoints', self.watchpoints.specs(self.app.get_graph())))
+            self.conn.send(('op', mode))
+        except (BrokenPipeError, OSError):
+            pass
 
-    # def debug_btrace(frame, event, arg):
+    def set_rate(self, rate):
+        """Set the lines per second of playing, for this and later runs"""
+        self.rate = rate
+        if self.running:
+            try:
+                self.conn.send(('rate', rate))
+            except (BrokenPipeError, OSError):
+                pass
+
+    def apply_changes(self, nodes, edges, labels):
+        if self.state is None:
+            return
+        self.state.read_nodes(self.nodes, nodes, labels)
+        self.state.read_edges(self.edges, edges)
 
-    #     if event != 'return' and event != 'line':
-    #         return
-    #     if frame.f_lineno in Debugger.obj.breakpoints:
-    #         return Debugger.debug_trace(frame,event,arg)
-    #     else:
-    #         return Debugger.debug_btrace
+    def finish(self, error):
+        if self.process is None:
+            return
+        if error:
+            print(error, file=sys.stderr)
+        self.process.join()
+        self.process = None
+        self.conn.close()
+        self.state.close()
+        self.state = None
+        self.line_changed.emit(-2)
+        self.playing_changed.emit(False)
+        self.graph_reloaded.emit(self.snapshot)
+        self.snapshot = None
 
-    # def debug_trace(frame, event, arg):
 
-    #     if event != 'return' and event != 'line':
-    #         return
-    #     Debugger.obj.line_changed.emit(frame.f_lineno)
+class LayoutRunner(QObject):
+    """Runs a force-directed layout of the displayed graph in a background thread
 
-    #     op = Debugger.obj.input.get()
+    Intermediate positions are streamed to the scene, but a new frame is only sent once the previous one
+        has been applied, so large graphs never queue up work on the GUI thread.
+    """
 
-    #     if op == Op.STOP:
-    #         raise DebugHalted
-    #     elif op == Op.STEP:
-    #         return Debugger.debug_trace
-    #     elif op == Op.SKIP:
-    #         return Debugger.debug_ftrace
-    #     elif op == Op.RESUME:
-    #         return Debugger.debug_btrace
+    positions_ready = pyqtSignal(object, object, name='positionsReady')
 
+    def __init__(self,app):
+        super().__init__()
+        self.app = app
+        self.layout = None
+        self.stopped = threading.Event()
+        self.applied = threading.Event()
+        self.positions_ready.connect(self.apply_positions)
+
+    def start(self, nodes=None):
+        """Lay out the displayed graph, or only the provided nodes of it"""
+        self.stop()
+        try:
+            from graphdebugger.layout import ForceLayout
+        except ImportError:
+            QMessageBox.warning(self.app, 'Auto Layout', 'Automatic layout requires NumPy.')
+            return
+        self.layout = ForceLayout(self.app.get_graph(), nodes)
+        self.stopped = threading.Event()
+        self.applied.set()
+        threading.Thread(target=self.run, args=(self.layout, self.stopped), daemon=True).start()
+
+    def run(self, layout, stopped):
+        def send(positions):
+            if stopped.is_set():
+                return False
+            if self.applied.is_set():
+                self.applied.clear()
+                self.positions_ready.emit(layout, positions)
+        layout.run(callback=send)
+        if not stopped.is_set():
+            self.positions_ready.emit(layout, layout.positions())
+
+    def stop(self):
+        self.stopped.set()
+        self.layout = None
+
+    def apply_positions(self, layout, positions):
+        if layout is not self.layout:
+            return
+        layout.apply(positions)
+        self.app.graph_display.scene().update_positions(layout.moved)
+        self.applied.set()
+
+
+class ProfileTable(QTableWidget):
+    """Sortable table of the lines recorded by a LineProfiler, slowest first"""
+
+    line_selected = pyqtSignal(int, name='lineSelected')
+
+    headers = ['Line', 'Hits', 'Time (ms)', '% Time', 'Code']
+
+    def __init__(self):
+        super().__init__(0, len(ProfileTable.headers))
+        self.setHorizontalHeaderLabels(ProfileTable.headers)
+        self.horizontalHeader().setStretchLastSection(True)
+        self.verticalHeader().hide()
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.cellDoubleClicked.connect(lambda row, column : self.line_selected.emit(self.item(row, 0).data(Qt.DisplayRole)))
+
+    def set_results(self, profiler, lines):
+        """Fill the table with the results of profiler, showing the code of each line from lines"""
+        self.setSortingEnabled(False)
+        results = profiler.results()
+        self.setRowCount(len(results))
+        elapsed = profiler.elapsed or 1
+        for row, (line_no, hits, seconds) in enumerate(results):
+            code = lines[line_no-1].strip() if line_no <= len(lines) else ''
+            values = [line_no, hits, round(seconds * 1000, 3), round(100 * seconds / elapsed, 1), code]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem()
+                #numbers are stored as such so that columns sort numerically
+                item.setData(Qt.DisplayRole, value)
+                self.setItem(row, column, item)
+        self.resizeColumnsToContents()
+        self.setSortingEnabled(True)
+        self.sortItems(2, Qt.DescendingOrder)
+
+
+class BreakpointDialog(QDialog):
+    """Edits the condition, hit count and log message of the breakpoint of one line"""
+
+    def __init__(self, parent, lineno, bp=None):
+        super().__init__(parent)
+        self.setWindowTitle('Breakpoint on Line {}'.format(lineno))
+        self.lineno = lineno
+        self.breakpoint = None
+
+        self.condition = QLineEdit(bp.condition or '' if bp else '')
+        self.condition.setPlaceholderText('always stop, e.g. v.label == "target"')
+        self.hit_count = QSpinBox()
+        self.hit_count.setRange(0, 2**31-1)
+        self.hit_count.setSpecialValueText('every hit')
+        self.hit_count.setValue(bp.hit_count if bp else 0)
+        self.log = QLineEdit(bp.log or '' if bp else '')
+        self.log.setPlaceholderText('stop instead, e.g. u={u.label} key={u.key}')
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+
+        form = QFormLayout(self)
+        form.addRow('Condition:', self.condition)
+        form.addRow('Stop after hits:', self.hit_count)
+        form.addRow('Log message:', self.log)
+        form.addRow(buttons)
+
+    def accept(self):
+        try:
+            self.breakpoint = Breakpoint(self.lineno, self.condition.text().strip(), self.hit_count.value(),
+                                         self.log.text())
+        except SyntaxError as e:
+            QMessageBox.warning(self, 'Breakpoint', 'Invalid expression: {}'.format(e.msg))
+            return
+        super().accept()
+
+    @staticmethod
+    def describe(bp):
+        parts = []
+        if bp.condition is not None:
+            parts.append('if ' + bp.condition)
+        if bp.hit_count > 1:
+            parts.append('after {} hits'.format(bp.hit_count))
+        if bp.log is not None:
+            parts.append('log ' + bp.log)
+        return ', '.join(parts)
+
+
+class GenerateDialog(QDialog):
+    """Asks for the kind, number of nodes and seed of a generated graph, see graphdebugger.generators"""
+
+    kinds = [('Random (Erdős–Rényi)', 'erdos_renyi'), ('Scale-free (Barabási–Albert)', 'barabasi_albert'),
+             ('Grid', 'grid'), ('Binary tree', 'tree'), ('Layered DAG', 'dag'), ('Layered flow network', 'flow_network')]
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setWindowTitle('Generate Graph')
+
+        self.kind = QComboBox()
+        for text, kind in GenerateDialog.kinds:
+            self.kind.addItem(text, kind)
+        self.nodes = QSpinBox()
+        self.nodes.setRange(2, 10**7)
+        self.nodes.setValue(100)
+        self.seed = QSpinBox()
+        self.seed.setRange(-1, 2**31-1)
+        self.seed.setSpecialValueText('random')
+        self.seed.setValue(-1)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+
+        form = QFormLayout(self)
+        form.addRow('Kind:', self.kind)
+        form.addRow('Nodes:', self.nodes)
+        form.addRow('Seed:', self.seed)
+        form.addRow(buttons)
+
+
+class WatchpointDialog(QDialog):
+    """Asks for the target, attribute and condition of a new watchpoint"""
+
+    def __init__(self, parent, element=None):
+        super().__init__(parent)
+        self.setWindowTitle('Add Watchpoint')
+        self.watchpoint = None
+
+        self.target = QComboBox()
+        if element is not None:
+            self.target.addItem('This ' + type(element).__name__.lower(), element)
+        self.target.addItem('Any node', Node)
+        self.target.addItem('Any edge', Edge)
+        self.target.addItem('Any element', None)
+        self.attr = QComboBox()
+        self.attr.addItem('Any attribute', None)
+        for attr in ATTRIBUTES:
+            self.attr.addItem(attr.capitalize(), attr)
+        self.condition = QLineEdit()
+        self.condition.setPlaceholderText('always stop, e.g. new >= element.weight')
+        self.condition.setToolTip('Expression using element, attr, old, new and Color')
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+
+        form = QFormLayout(self)
+        form.addRow('Watch:', self.target)
+        form.addRow('Attribute:', self.attr)
+        form.addRow('Condition:', self.condition)
+        form.addRow(buttons)
+
+    def accept(self):
+        attr = self.attr.currentData()
+        try:
+            self.watchpoint = Watchpoint(self.target.currentData(), [attr] if attr else None,
+                                         self.condition.text().strip())
+        except SyntaxError as e:
+            QMessageBox.warning(self, 'Watchpoint', 'Invalid expression: {}'.format(e.msg))
+            return
+        super().accept()
 
-    # def debug_ftrace(frame, event, arg):
 
-    #     if event != 'call':# or frame.f_code.co_filename != Debugger.file:
-    #         return
+class WatchList(QListWidget):
+    """Lists the watchpoints, which can be removed from the context menu or with Delete"""
 
-    #     if not Debugger.obj.file or Debugger.obj.file not in str(inspect.getfile(frame)):
-    #         return
+    def __init__(self, watchpoints):
+        super().__init__()
+        self.watchpoints = watchpoints
+        self.setSelectionMode(QAbstractItemView.ExtendedSelection)
+
+    def refresh(self):
+        self.clear()
+        self.addItems([str(w) for w in self.watchpoints])
+
+    def remove_selected(self):
+        rows = sorted((self.row(item) for item in self.selectedItems()), reverse=True)
+        for row in rows:
+            del self.watchpoints[row]
+        self.refresh()
+
+    def keyPressEvent(self, event):
+        if event.key() in (Qt.Key_Delete, Qt.Key_Backspace):
+            self.remove_selected()
+        else:
+            super().keyPressEvent(event)
 
-    #     Debugger.obj.line_changed.emit(frame.f_lineno)
+    def contextMenuEvent(self, event):
+        if not self.selectedItems():
+            return
+        menu = QMenu()
+        remove = QAction('Remove Watchpoint')
+        remove.triggered.connect(self.remove_selected)
+        menu.addAction(remove)
+        menu.exec(QCursor.pos())
 
-    #     op = Debugger.obj.input.get()
-    #     if op == Op.STOP:
-    #         raise DebugHalted
-    #     elif op == Op.STEP:
-    #         return Debugger.debug_trace
-    #     elif op == Op.SKIP:
-    #         return Debugger.debug_ftrace
-    #     elif op == Op.RESUME:
-    #         return Debugger.debug_btrace
 
 class LineMargin(QWidget):
 
@@ -429,14 +1146,53 @@ class LineMargin(QWidget):
         super().__init__(editor)
         self.editor = editor
         self.max_line_no = 1
-        self.breakpoints = set()
+        self.breakpoints = Breakpoints()
+        self.heat = {}
 
     def mouseDoubleClickEvent(self, event):
         self.flip_breakpoint(event.pos())
 
+    def contextMenuEvent(self, event):
+        lineno = self.line_at(event.pos())
+        menu = QMenu()
+
+        edit = QAction('Edit Breakpoint...' if lineno in self.breakpoints else 'Add Breakpoint...')
+        edit.triggered.connect(lambda : self.edit_breakpoint(lineno))
+        menu.addAction(edit)
+
+        if lineno in self.breakpoints:
+            remove = QAction('Remove Breakpoint')
+            remove.triggered.connect(lambda : self.flip_breakpoint(event.pos()))
+            menu.addAction(remove)
+        menu.exec(QCursor.pos())
+
+    def event(self, event):
+        if event.type() == QEvent.ToolTip:
+            bp = self.breakpoints.get(self.line_at(event.pos()))
+            if bp is not None and not bp.plain:
+                QToolTip.showText(event.globalPos(), BreakpointDialog.describe(bp), self)
+            else:
+                QToolTip.hideText()
+            return True
+        return super().event(event)
+
+    def edit_breakpoint(self, lineno):
+        dialog = BreakpointDialog(self, lineno, self.breakpoints.get(lineno))
+        if dialog.exec() == QDialog.Accepted:
+            self.breakpoints[lineno] = dialog.breakpoint
+            self.update()
 
     def flip_breakpoint(self, pos):
 
+        lineno = self.line_at(pos)
+        if lineno in self.breakpoints:
+            self.breakpoints.remove(lineno)
+        else:
+            self.breakpoints.add(lineno)
+        self.update()
+
+    def line_at(self, pos):
+        """Return the number of the line at the height of pos"""
         line = self.editor.firstVisibleBlock()
         lineno = line.blockNumber()+1
         top_edge = self.editor.blockBoundingGeometry(line).translated(self.editor.contentOffset()).top()
@@ -447,17 +1203,18 @@ class LineMargin(QWidget):
             top_edge = bot_edge
             bot_edge = top_edge + self.editor.blockBoundingRect(line).height()
             lineno = line.blockNumber()+1
-
-        if lineno in self.breakpoints:
-            self.breakpoints.remove(lineno)
-        else:
-            self.breakpoints.add(lineno)
-        self.update()
+        return lineno
 
     def clear_breakpoints(self):
         self.breakpoints.clear()
         self.update()
 
+    def set_heat(self, times):
+        """Color the margin of every line in times, a dict of line number to seconds, by its share of the slowest line"""
+        slowest = max(times.values(), default=0) or 1
+        self.heat = {line_no:heat_color(t / slowest) for line_no, t in times.items()}
+        self.update()
+
     def sizeHint(self):
         return QSize(self.margin_width, 0)
 
@@ -479,14 +1236,29 @@ class LineMargin(QWidget):
         while line.isValid() and top_edge <= event.rect().bottom():
             if line.isVisible() and bot_edge >= event.rect().top():
 
+                if line_no in self.heat:
+                    painter.fillRect(QRect(0, int(top_edge), self.margin_width, int(bot_edge - top_edge)), self.heat[line_no])
+
                 if line_no == self.editor.active_line:
-                    painter.drawText(0,top_edge, self.margin_width-2, height, Qt.AlignRight, '>' + str(line_no))
+                    painter.drawText(0,int(top_edge), self.margin_width-2, height, Qt.AlignRight, '>' + str(line_no))
                 else:
-                    painter.drawText(0,top_edge, self.margin_width-2, height, Qt.AlignRight, str(line_no))
-
-                if line_no in self.breakpoints:
+                    painter.drawText(0,int(top_edge), self.margin_width-2, height, Qt.AlignRight, str(line_no))
+
+                bp = self.breakpoints.get(line_no)
+                if bp is not None and bp.log is not None:
+                    #log breakpoints never stop, and are drawn as a diamond
+                    painter.save()
+                    painter.setRenderHint(QPainter.Antialiasing)
+                    painter.setBrush(QColor(Qt.darkCyan))
+                    r = height / 3
+                    c = QPointF(height / 2, top_edge + height / 2)
+                    painter.drawPolygon(QPolygonF([c + QPointF(0, -r), c + QPointF(r, 0), c + QPointF(0, r), c + QPointF(-r, 0)]))
+                    painter.restore()
+                elif bp is not None:
                     bkpt = QImage(get_image('assets/brkp_obj.png'))
-                    painter.drawImage(QRect(0,top_edge, height, height), bkpt)
+                    painter.drawImage(QRect(0,int(top_edge), height, height), bkpt)
+                    if not bp.plain:
+                        painter.drawText(QRect(0,int(top_edge), height, height), Qt.AlignCenter, '?')
 
 
             line_no += 1
@@ -536,7 +1308,7 @@ class Editor(QPlainTextEdit):
         font.setFamily("Courier")
         font.setStyleHint(QFont.Monospace)
         font.setFixedPitch(True)
-        font.setPointSize(11.5)
+        font.setPointSizeF(11.5)
         self.setFont(font)
 
         metrics = QFontMetrics(font)
@@ -565,6 +1337,12 @@ class Editor(QPlainTextEdit):
         super().setPlainText(s)
         if hasattr(self,"lm"):
             self.lm.clear_breakpoints()
+            self.lm.set_heat({})
+
+    def go_to_line(self, line_no):
+        self.setTextCursor(QTextCursor(self.document().findBlockByLineNumber(line_no-1)))
+        self.centerCursor()
+        self.setFocus()
 
 
     def change_active(self, val):
@@ -1,12 +1,9 @@
-
-
-from PyQt5.QtWidgets import *
-from PyQt5.QtGui import *
-from PyQt5.QtCore import *
 from enum import Enum
 
-import math
 import json
+import gc
+import sys
+import itertools
 
 
 class Color(Enum):
@@ -18,19 +15,241 @@ class Color(Enum):
 	GRAY = 5
 	WHITE = 6
 
-color_to_qt = {
-		Color.RED : Qt.red,
-		Color.BLACK : Qt.black,
-		Color.CYAN : Qt.cyan,
-		Color.BLUE : Qt.blue,
-		Color.GRAY : Qt.gray,
-		Color.WHITE : Qt.white
-	}
-	
+
+def _coords(point):
+	"""Return an (x, y) tuple for a point given either as a tuple or as a QPoint-like object"""
+	if point is None:
+		return 0, 0
+	if isinstance(point, (tuple, list)):
+		return point[0], point[1]
+	return point.x(), point.y()
+
+
+def _side_table_size(x):
+	"""Return the number of bytes used by attributes set on a node or edge outside of its __slots__
+
+	Only inspects the referents of x so that the side table is never allocated just to be measured.
+	"""
+	refs = gc.get_referents(x)
+	for ref in refs:
+		if type(ref) is dict:
+			return sys.getsizeof(ref)
+	#values of a side table which has not been materialized as a dict are stored inline, one pointer each
+	return max(len(refs) - len(type(x).__slots__), 0) * 8
+
+
+class ElementList:
+	"""Insertion ordered collection of nodes or edges with constant time membership tests and removal
+
+	Elements are keyed by identity, so two edges with equal weights are never confused with each other.
+		Supports the parts of the list interface used on Graph.nodes, Graph.edges, Node.out and Node.inc:
+		iteration, len, in, append, extend, remove, copy and indexing. Indexing walks the collection and is
+		therefore linear, except for the first and last elements.
+	"""
+
+	__slots__ = ('_items',)
+
+	def __init__(self, items=()):
+		self._items = {id(x):x for x in items}
+
+	def append(self, x):
+		self._items[id(x)] = x
+
+	def extend(self, items):
+		"""Append every element of items, in order"""
+		self._items.update({id(x):x for x in items})
+
+	def remove(self, x):
+		"""Remove x from the collection. Raises ValueError if x is not present"""
+		if self._items.pop(id(x), None) is None:
+			raise ValueError('element not in collection')
+
+	def discard(self, x):
+		"""Remove x from the collection if it is present"""
+		self._items.pop(id(x), None)
+
+	def copy(self):
+		"""Return a list of the elements, which is safe to iterate while this collection changes"""
+		return list(self._items.values())
+
+	def clear(self):
+		self._items.clear()
+
+	def __contains__(self, x):
+		return id(x) in self._items
+
+	def __iter__(self):
+		return iter(self._items.values())
+
+	def __reversed__(self):
+		return reversed(self._items.values())
+
+	def __len__(self):
+		return len(self._items)
+
+	def __getitem__(self, i):
+		if isinstance(i, slice):
+			return self.copy()[i]
+		n = len(self._items)
+		if i < 0:
+			i += n
+		if not 0 <= i < n:
+			raise IndexError('index out of range')
+		if i == n - 1:
+			return next(reversed(self._items.values()))
+		return next(itertools.islice(self._items.values(), i, None))
+
+	def __sizeof__(self):
+		return object.__sizeof__(self) + self._items.__sizeof__()
+
+	def __repr__(self):
+		return 'ElementList({!r})'.format(self.copy())
+
+
+class IndexedHeap:
+	"""Binary min-heap of nodes keyed by a priority, with O(log n) push, pop_min and decrease_key
+
+	Each node can be in the heap at most once, and membership is tested in constant time. Nodes with equal
+		keys are popped in the order they were pushed, so nodes themselves are never compared. Meant for
+		algorithms such as Dijkstra and Prim, where rebuilding a heapq list on every decrease-key would
+		cost O(V) per update.
+
+	When enter_color or leave_color are provided, nodes are given that color as they are pushed onto or
+		popped from the heap, which shows the frontier of the algorithm in the debugger.
+	"""
+
+	__slots__ = ('heap', 'position', 'count', 'enter_color', 'leave_color')
+
+	def __init__(self, items=(), enter_color=None, leave_color=None):
+		"""Create a heap holding the provided nodes
+
+		args:
+			items(iterable[tuple]): (node, key) pairs to start with. Default = ()
+			enter_color(Color): color given to nodes pushed onto the heap. Default = None, which leaves it
+			leave_color(Color): color given to nodes popped from the heap. Default = None, which leaves it
+		"""
+		self.heap = []
+		self.position = {}
+		self.count = 0
+		self.enter_color = enter_color
+		self.leave_color = leave_color
+		for node, key in items:
+			if id(node) in self.position:
+				raise ValueError('node is already in the heap')
+			self.position[id(node)] = len(self.heap)
+			self.heap.append((key, self.count, node))
+			self.count += 1
+			if enter_color is not None:
+				node.color = enter_color
+		for i in reversed(range(len(self.heap) // 2)):
+			self._sift_down(i)
+
+	def push(self, node, key):
+		"""Add node to the heap with the provided key. Raises ValueError if it is already in the heap"""
+		if id(node) in self.position:
+			raise ValueError('node is already in the heap')
+		self.heap.append((key, self.count, node))
+		self.count += 1
+		self._sift_up(len(self.heap) - 1)
+		if self.enter_color is not None:
+			node.color = self.enter_color
+
+	def pop_min(self):
+		"""Remove and return the (node, key) pair with the smallest key. Raises IndexError if the heap is empty"""
+		if not self.heap:
+			raise IndexError('pop from an empty heap')
+		key, _, node = self.heap[0]
+		last = self.heap.pop()
+		del self.position[id(node)]
+		if self.heap:
+			self.heap[0] = last
+			self.position[id(last[2])] = 0
+			self._sift_down(0)
+		if self.leave_color is not None:
+			node.color = self.leave_color
+		return node, key
+
+	def peek_min(self):
+		"""Return the (node, key) pair with the smallest key without removing it"""
+		if not self.heap:
+			raise IndexError('peek at an empty heap')
+		key, _, node = self.heap[0]
+		return node, key
+
+	def decrease_key(self, node, key):
+		"""Lower the key of a node in the heap. Raises ValueError if key is larger than its current key
+
+		args:
+			node(Node): node in the heap
+			key: new key, which must not be larger than the current one
+		"""
+		i = self.position[id(node)]
+		old, count, _ = self.heap[i]
+		if key > old:
+			raise ValueError('new key is larger than the current key')
+		self.heap[i] = (key, count, node)
+		self._sift_up(i)
+
+	def key_of(self, node):
+		"""Return the key of a node in the heap. Raises KeyError if it is not in the heap"""
+		return self.heap[self.position[id(node)]][0]
+
+	def _sift_up(self, i):
+		heap = self.heap
+		position = self.position
+		entry = heap[i]
+		while i > 0:
+			parent = (i - 1) >> 1
+			if not entry < heap[parent]:
+				break
+			heap[i] = heap[parent]
+			position[id(heap[i][2])] = i
+			i = parent
+		heap[i] = entry
+		position[id(entry[2])] = i
+
+	def _sift_down(self, i):
+		heap = self.heap
+		position = self.position
+		n = len(heap)
+		entry = heap[i]
+		while True:
+			child = 2 * i + 1
+			if child >= n:
+				break
+			if child + 1 < n and heap[child + 1] < heap[child]:
+				child += 1
+			if not heap[child] < entry:
+				break
+			heap[i] = heap[child]
+			position[id(heap[i][2])] = i
+			i = child
+		heap[i] = entry
+		position[id(entry[2])] = i
+
+	def __contains__(self, node):
+		"""Return True if node is in the heap, in constant time"""
+		return id(node) in self.position
+
+	def __len__(self):
+		return len(self.heap)
+
+	def __bool__(self):
+		return bool(self.heap)
+
+	def __iter__(self):
+		"""Iterate over the nodes in the heap, in no particular order"""
+		return (node for _, _, node in self.heap)
+
+
 class Graph:
 
 	app = None
 
+	#callables of the form f(element, attr, old, new), called whenever the color, label, weight or flow
+	#of any node or edge is set
+	observers = []
+
 	def __init__(self, nodes = None, edges = None, labels = None):
 		"""Create a graph object
 
@@ -39,25 +258,33 @@ class Graph:
 			edges(list[Edge]): list of edges to initialize graph. Default = None
 			labels(dict[str,Node]): dict mapping labels to corresponding nodes. Default = None
 		"""
-		self.edges = edges if edges else list()
-		self.nodes = nodes if nodes else list()
+		self.edges = ElementList(edges if edges else ())
+		self.nodes = ElementList(nodes if nodes else ())
 		self.labels = labels if labels else dict()
+		self.node_labels = {}
+		for label, n in self.labels.items():
+			self.node_labels.setdefault(id(n), set()).add(label)
+		self.edge_index = {(e.src, e.targ):e for e in self.edges}
 
 	def write_graph(self, file):
-		"""Write this graph to a JSON file
+		"""Write this graph to a JSON file, or to a binary graph file if the filename ends in .vgb
 
 		args:
 			file(str): filename to write graph to
 		"""
+		from graphdebugger import binary
+		if file.endswith(binary.EXTENSION):
+			binary.write_graph(self, file)
+			return
 		with open(file, 'w') as out:
-			json.dump({'edges':[x.as_dict() for x in self.edges], 
+			json.dump({'edges':[x.as_dict() for x in self.edges],
 					   'nodes':[x.as_dict() for x in self.nodes],
 					   'labels':{s:id(n) for s,n in self.labels.items()}},out)
 
 	def write_graph_to_json(self):
 		"""Returns a dict representation of the graph"""
 
-		return {'edges':[x.as_dict() for x in self.edges], 
+		return {'edges':[x.as_dict() for x in self.edges],
 				'nodes':[x.as_dict() for x in self.nodes],
 				'labels':{s:id(n) for s,n in self.labels.items()}}
 
@@ -70,6 +297,7 @@ class Graph:
 			e(Edge)
 		"""
 		self.edges.append(e)
+		self.edge_index[(e.src, e.targ)] = e
 
 	def remove_edge(self, e):
 		"""Remove the provided edge from the graph
@@ -78,6 +306,39 @@ class Graph:
 			e(Edge)
 		"""
 		self.edges.remove(e)
+		if self.edge_index.get((e.src, e.targ)) is e:
+			del self.edge_index[(e.src, e.targ)]
+			#point the index at a remaining parallel edge, if any
+			for x in itertools.chain(e.src.out, e.targ.inc):
+				if x is not e and x.src is e.src and x.targ is e.targ and x in self.edges:
+					self.edge_index[(e.src, e.targ)] = x
+					break
+
+	def has_edge(self, u, v):
+		"""Return True if the graph contains an edge from u to v
+
+		args:
+			u(Node): source node
+			v(Node): target node
+		"""
+		return (u, v) in self.edge_index
+
+	def get_edge(self, u, v):
+		"""Return the edge from u to v, or None if the graph does not contain one
+
+		args:
+			u(Node): source node
+			v(Node): target node
+		"""
+		return self.edge_index.get((u, v))
+
+	def reverse_of(self, e):
+		"""Return the edge running in the opposite direction of the provided edge, or None if there is none
+
+		args:
+			e(Edge)
+		"""
+		return self.edge_index.get((e.targ, e.src))
 
 	def add_node(self, n):
 		"""Add the provided node to the graph
@@ -94,7 +355,9 @@ class Graph:
 			n(Node)
 		"""
 		self.nodes.remove(n)
-		self.labels = {key:value for key,value in self.labels.items() if value != n}
+		for label in self.node_labels.pop(id(n), ()):
+			if self.labels.get(label) is n:
+				del self.labels[label]
 
 	def create_label(self, n, label):
 		"""Add a label to the graph which corresponds to the provided node
@@ -103,15 +366,25 @@ class Graph:
 			n(Node): node to be given a label
 			label(str): the label for the node n
 		"""
+		previous = self.labels.get(label)
+		if previous is not None and previous is not n:
+			self.node_labels.get(id(previous), set()).discard(label)
 		self.labels[label] = n
+		self.node_labels.setdefault(id(n), set()).add(label)
 		n.label = label
 
 	def read_graph(file):
-		"""Read graph from a JSON file and return the graph object
+		"""Read graph from a JSON, binary graph, edge list, DIMACS or GraphML file and return the graph object
 
 		args:
-			file(str): file to read, JSON format expected
+			file(str): file to read. Binary graph files are detected from their first bytes, the formats of
+				graphdebugger.importers from their extension, and anything else is read as JSON
 		"""
+		from graphdebugger import binary, importers
+		if binary.is_binary_graph(file):
+			return binary.read_graph(file)
+		if importers.format_of(file) is not None:
+			return importers.import_graph(file)
 		with open(file) as json_file:
 			return Graph.read_graph_from_json(json.load(json_file))
 
@@ -135,8 +408,6 @@ class Graph:
 
 			s.out.append(tmp)
 			t.inc.append(tmp)
-			s.adj.append(t)
-			t.adj.append(s)
 
 		for l,n in data['labels'].items():
 			labels[l] = nodes[n]
@@ -144,6 +415,59 @@ class Graph:
 
 		return Graph(list(nodes.values()), list(edges.values()), labels)
 
+	def from_columns(xs, ys, sources, targets, weights=None, flows=None, node_colors=None, edge_colors=None,
+					 node_labels=None, labels=None):
+		"""Build and return a graph from per node and per edge columns in a single pass
+
+		This is the bulk construction path used by the file readers. Edges are wired into the out and inc
+			collections of their nodes directly instead of going through add_edge, and no observers or
+			graphic items are notified.
+
+		args:
+			xs(sequence[float]): x coordinate of every node
+			ys(sequence[float]): y coordinate of every node
+			sources(sequence[int]): index of the source node of every edge
+			targets(sequence[int]): index of the target node of every edge
+			weights(sequence): weight of every edge. Default = None, which gives every edge weight -1
+			flows(sequence): flow of every edge. Default = None, which gives every edge flow 0
+			node_colors(sequence[int]): Color value of every node. Default = None
+			edge_colors(sequence[int]): Color value of every edge. Default = None
+			node_labels(sequence[str]): label of every node. Default = None
+			labels(dict[str,int]): dict mapping labels to node indices. Default = None
+		"""
+		colors = {c.value:c for c in Color}
+		nodes = [Node((x, y)) for x, y in zip(xs, ys)]
+		if node_colors is not None:
+			for n, c in zip(nodes, node_colors):
+				n._color = colors[c]
+		if node_labels is not None:
+			for n, label in zip(nodes, node_labels):
+				n._label = label
+
+		edges = []
+		out = [[] for _ in nodes]
+		inc = [[] for _ in nodes]
+		if weights is None:
+			weights = itertools.repeat(-1)
+		for s, t, w in zip(sources, targets, weights):
+			e = Edge(nodes[s], nodes[t], w)
+			out[s].append(e)
+			inc[t].append(e)
+			edges.append(e)
+		for n, n_out, n_inc in zip(nodes, out, inc):
+			if n_out:
+				n.out.extend(n_out)
+			if n_inc:
+				n.inc.extend(n_inc)
+		if flows is not None:
+			for e, f in zip(edges, flows):
+				e._flow = f
+		if edge_colors is not None:
+			for e, c in zip(edges, edge_colors):
+				e._color = colors[c]
+
+		return Graph(nodes, edges, {label:nodes[i] for label, i in labels.items()} if labels else None)
+
 	def get_node(self,label=None):
 		"""Return the node with the given label if it exists. Otherwise, returns the first node of the graph
 
@@ -154,6 +478,110 @@ class Graph:
 			return self.nodes[0] if len(self.nodes) > 0 else None
 		return self.labels[label]
 
+	def to_csr(self, undirected=False):
+		"""Return a frozen compressed sparse row snapshot of this graph for use with array based kernels
+
+		Requires NumPy. See graphdebugger.csr.CSRGraph for the available kernels.
+
+		args:
+			undirected(bool): store every edge in both directions. Default = False
+		"""
+		from graphdebugger.csr import CSRGraph
+		return CSRGraph(self, undirected)
+
+	def memory_report(self):
+		"""Return a dict describing the memory used by the nodes and edges of this graph, in bytes
+
+		Core fields are stored in __slots__, while attributes added by user scripts (such as key or pi)
+			live in a per-element side table which is only allocated on first use. The report lists the
+			core and side table sizes separately, along with the average size per element.
+		"""
+		report = {}
+		for name, elements, containers in (('nodes', self.nodes, lambda n: (n.out, n.inc)),
+										   ('edges', self.edges, lambda e: ())):
+			core = 0
+			attrs = 0
+			with_attrs = 0
+			for x in elements:
+				core += sys.getsizeof(x) + sum(sys.getsizeof(c) for c in containers(x))
+				size = _side_table_size(x)
+				if size:
+					attrs += size
+					with_attrs += 1
+			count = len(elements)
+			report[name] = {'count':count,
+							'core_bytes':core,
+							'attr_bytes':attrs,
+							'with_attrs':with_attrs,
+							'bytes_per_element':(core + attrs) / count if count else 0}
+		report['total_bytes'] = sum(report[k]['core_bytes'] + report[k]['attr_bytes'] for k in ('nodes', 'edges'))
+		return report
+
+	def snapshot(self):
+		"""Return a GraphSnapshot of the nodes and edges of this graph and their displayed attributes"""
+		return GraphSnapshot(self)
+
+	def restore(self, snapshot):
+		"""Return this graph to the state recorded in the provided snapshot, only touching what changed
+
+		Nodes and edges added since the snapshot are taken out of the graph and removed ones are put back.
+			Colors, labels, weights and flows are only set where they differ, and attributes added by
+			scripts, such as key or pi, are cleared.
+
+		Returns a tuple (added, removed) of the elements which were put back into and taken out of the graph.
+
+		args:
+			snapshot(GraphSnapshot): snapshot previously taken of this graph
+		"""
+		node_ids = {id(n) for n,_,_ in snapshot.nodes}
+		edge_ids = {id(e) for e,_,_,_ in snapshot.edges}
+		removed = [n for n in self.nodes if id(n) not in node_ids] + [e for e in self.edges if id(e) not in edge_ids]
+		added = [n for n,_,_ in snapshot.nodes if n not in self.nodes] + [e for e,_,_,_ in snapshot.edges if e not in self.edges]
+
+		if added or removed or any(len(n.out) != out or len(n.inc) != inc for n,out,inc in snapshot.degrees):
+			self.nodes = ElementList(n for n,_,_ in snapshot.nodes)
+			self.edges = ElementList(e for e,_,_,_ in snapshot.edges)
+			self.edge_index = {(e.src, e.targ):e for e in self.edges}
+			for n in itertools.chain(self.nodes, removed):
+				if isinstance(n, Node):
+					n.out.clear()
+					n.inc.clear()
+			for e in self.edges:
+				e.src.out.append(e)
+				e.targ.inc.append(e)
+
+		for n, color, label in snapshot.nodes:
+			if n.color != color:
+				n.color = color
+			if n.label != label:
+				n.label = label
+			if _side_table_size(n):
+				n.__dict__.clear()
+		for e, color, weight, flow in snapshot.edges:
+			if e.color != color:
+				e.color = color
+			if e.weight != weight:
+				e.weight = weight
+			if e.flow != flow:
+				e.flow = flow
+			if _side_table_size(e):
+				e.__dict__.clear()
+
+		self.labels = dict(snapshot.labels)
+		self.node_labels = {}
+		for label, n in self.labels.items():
+			self.node_labels.setdefault(id(n), set()).add(label)
+		return added, removed
+
+	def notify(element, attr, old, new):
+		"""Pass a change to a displayed attribute of a node or edge on to all registered observers
+
+		Setters call this after notifying the graphic of the element, so an observer which pauses the script,
+			such as a watchpoint, already shows the change.
+		"""
+		for f in Graph.observers:
+			f(element, attr, old, new)
+
 	def get_graph():
 		"""Return the graph currently represented in the user interface."""
 		return Graph.app.get_graph()
@@ -161,7 +589,24 @@ class Graph:
 
 
 
-class Edge(QObject):
+class GraphSnapshot:
+	"""Record of the nodes and edges of a graph and their displayed attributes, see Graph.restore
+
+	Holds references to the recorded elements rather than copies, so taking a snapshot is cheap and
+		restoring it can reuse the existing Node and Edge objects and their graphic items.
+	"""
+
+	__slots__ = ('graph', 'nodes', 'edges', 'degrees', 'labels')
+
+	def __init__(self, graph):
+		self.graph = graph
+		self.nodes = [(n, n.color, n.label) for n in graph.nodes]
+		self.edges = [(e, e.color, e.weight, e.flow) for e in graph.edges]
+		self.degrees = [(n, len(n.out), len(n.inc)) for n in graph.nodes]
+		self.labels = dict(graph.labels)
+
+
+class Edge:
 	"""Edge object intended to be used in user scripts as part of the Graph object
 
 	Must be created after the Node objects it is intended to connect. No support for None type nodes
@@ -170,9 +615,15 @@ class Edge(QObject):
 		the user's scripts will currently not be displayed on the canvas.
 
 	Edge objects are comparable to each other and use their edge weights as a sorting key.
+
+	Edges are plain Python objects and do not depend on Qt. The graphical item for an edge is
+		only created once its graph is attached to a GraphScene, and is otherwise None.
+
+	The core fields of an edge are stored in __slots__. Any other attribute set on an edge is kept
+		in a side table which is only allocated the first time such an attribute is set.
 	"""
 
-	label_changed = pyqtSignal(object)
+	__slots__ = ('graphic', 'src', 'targ', '_weight', '_flow', '_color', '__dict__')
 
 	def __init__(self, src, targ, weight = -1):
 		"""Create an edge object with the provided source and target nodes
@@ -185,13 +636,12 @@ class Edge(QObject):
 			targ(Node): target node for this edge
 			weight(int,float): weight of this edge. Default = -1
 		"""
-		super().__init__()
+		self.graphic = None
 		self.src = src
 		self.targ = targ
-		self.weight = weight
-		self.flow = 0
-		self.color = Color.BLACK
-		self.graphic = GraphicEdge(self)
+		self._weight = weight
+		self._flow = 0
+		self._color = Color.BLACK
 
 	def as_dict(self):
 		"""Return a dictionary representation of this Edge object"""
@@ -204,10 +654,10 @@ class Edge(QObject):
 		d['weight'] = self.weight
 		d['flow'] = self.flow
 		d['color'] = self.color.value
-		d['x1'] = self.graphic.line().p1().x()
-		d['y1'] = self.graphic.line().p1().y()
-		d['x2'] = self.graphic.line().p2().x()
-		d['y2'] = self.graphic.line().p2().y()
+		d['x1'] = self.src.x
+		d['y1'] = self.src.y
+		d['x2'] = self.targ.x
+		d['y2'] = self.targ.y
 
 		return d
 
@@ -220,6 +670,9 @@ class Edge(QObject):
 		"""
 
 		e = Edge(nodes[d['src']], nodes[d['targ']], d['weight'])
+		e._flow = d.get('flow', 0)
+		if 'color' in d:
+			e._color = Color(d['color'])
 		return e
 
 	@property
@@ -229,9 +682,12 @@ class Edge(QObject):
 
 	@weight.setter
 	def weight(self, value):
+		old = self._weight
 		self._weight = value
-		if hasattr(self, 'graphic'):
-			self.label_changed.emit(self.graphic)
+		if self.graphic is not None:
+			self.graphic.notify()
+		if Graph.observers:
+			Graph.notify(self, 'weight', old, value)
 
 	@property
 	def flow(self):
@@ -240,9 +696,12 @@ class Edge(QObject):
 
 	@flow.setter
 	def flow(self, value):
+		old = self._flow
 		self._flow = value
-		if hasattr(self, 'graphic'):
-			self.label_changed.emit(self.graphic)
+		if self.graphic is not None:
+			self.graphic.notify()
+		if Graph.observers:
+			Graph.notify(self, 'flow', old, value)
 
 	def __lt__(self,other):
 		return self.weight < other.weight
@@ -262,6 +721,10 @@ class Edge(QObject):
 	def __ne__(self,other):
 		return self.weight != other.weight
 
+	#defining __eq__ would otherwise make edges unhashable. Hashing by identity lets scripts keep edges in
+	#sets and dicts, and lookups still find the exact edge since identity is checked before equality
+	__hash__ = object.__hash__
+
 	@property
 	def color(self):
 		"""Color: See the Color Enum for colors supported by the graphical display"""
@@ -269,98 +732,55 @@ class Edge(QObject):
 
 	@color.setter
 	def color(self, value):
+		old = self._color
 		self._color = value
-		if hasattr(self, 'graphic'):
-			self.graphic.update()
-	
-
-
-class GraphicEdge(QGraphicsLineItem):
-
-	label_distance = 15
-
-	def __init__(self, edge):
-		super().__init__(QLineF(edge.src.graphic.center(), edge.targ.graphic.center()))
-		self.setZValue(-100)
-		self.edge = edge
-		self.edge_label = None
-
-	def paint(self, painter, option, widget):
-
-		if self.edge.src in [e.targ for e in self.edge.targ.out]:
-			unit = self.line().unitVector()
-			unit.setAngle(unit.angle()+90)
-			unit.setLength(5)
-			line = QLineF(self.edge.src.graphic.center(), self.edge.targ.graphic.center())
-			line.translate(unit.p2() - unit.p1())
-			super().setLine(line)
-		else:
-			super().setLine(QLineF(self.edge.src.graphic.center(), self.edge.targ.graphic.center()))
-		self.setPen(QPen(color_to_qt[self.edge.color]))
-		super().paint(painter, option, widget)
-
-		#draw tip if directed
-		if self.scene().show_direction:
-			arrow_height = 10
-			arrow_width = 10
-			unit = self.line().unitVector()
-			unit.setLength(self.line().length() - self.edge.targ.graphic.boundingRect().height()//2)
-			points = []
-			points.append(unit.p2())
-			unit.setLength(unit.length() - arrow_height)
-			base = unit.p2()
-			unit = unit.normalVector().unitVector()
-			unit.translate(base - unit.p1())
-			unit.setLength(arrow_width//2)
-			points.append(unit.p2())
-			unit.setAngle(unit.angle() + 180)
-			points.append(unit.p2())
-
-			painter.setBrush(color_to_qt[self.edge.color])
-			painter.drawPolygon(QPolygonF(points))
-
-
-	def shape(self):
-		path = super().shape()
-		stroker = QPainterPathStroker()
-		stroker.setWidth(15)
-		return stroker.createStroke(path)
+		if self.graphic is not None:
+			self.graphic.notify()
+		if Graph.observers:
+			Graph.notify(self, 'color', old, value)
 
 
 class Node:
 	"""Node object intended to be used in user scripts as part of the Graph object
 
-	Note that if the Node object is not instantiated with a point argument, the corresponding
-		graphical Node will be given a default position of (0,0). Nodes should generally only
-		be created within the graph canvas. Currently, nodes added by user scripts will not
-		update the graph representation.
+	Note that if the Node object is not instantiated with a point argument, it is given a default
+		position of (0,0). Nodes should generally only be created within the graph canvas. Currently,
+		nodes added by user scripts will not update the graph representation.
 
+	Nodes are plain Python objects and do not depend on Qt. The graphical item for a node is
+		only created once its graph is attached to a GraphScene, and is otherwise None.
+
+	The core fields of a node are stored in __slots__. Attributes added by user scripts, such as
+		key, pi or d, are kept in a side table which is only allocated the first time one is set.
 
 	Node objects should be accessed using the properties:
-		out: a list of all outgoing edges
-		inc: a list of all incoming edges
+		out: an ElementList of all outgoing edges
+		inc: an ElementList of all incoming edges
 		adj: a list of all adjacent nodes, connected by both outgoing and incoming
 		adj_edges: a generator which yields all edges, both inc and out, as an
 					(edge,connected_node) tuple
 
-	
+
 	"""
+
+	__slots__ = ('graphic', 'x', 'y', 'out', 'inc', '_label', '_color', '__dict__')
+
+	radius = 18
+
 	def __init__(self,point=None,label=''):
 		"""Create a Node object with the provided label, if any.
 
 		args:
-			point(QPoint): object point argument used to specify the center of the corresponding
-				graphical node. Default = None
+			point(tuple,QPoint): (x, y) position of the center of this node on the canvas. Any object
+				with x() and y() methods, such as a QPoint, is also accepted. Default = None
 			label(str): string representing the label of this particular Node. Default = None
 		"""
-		self.out = []
-		self.inc = []
-		self.adj = [] #TODO: Should change this to be a generator. Less upkeep, less space. Cleaner remove.
-		self.label = label
+		self.graphic = None
+		self.out = ElementList()
+		self.inc = ElementList()
+		self._label = label
 		self._color = Color.CYAN
-		if point is None:
-			point = QPoint(0,0)
-		self.graphic = GraphicNode(self,point)
+		self.x, self.y = _coords(point)
 
 	def as_dict(self):
 		"""Returns a dictionary representation of this Node object"""
@@ -373,26 +793,25 @@ class Node:
 		d['adj'] = [id(t) for t in self.adj]
 		d['color'] = self.color.value
 		d['label'] = self.label
-		d['x'] = self.graphic.center().x()
-		d['y'] = self.graphic.center().y()
-		d['r'] = self.graphic.boundingRect().height()//2
+		d['x'] = self.x
+		d['y'] = self.y
+		d['r'] = Node.radius
 
 		return d
 
 	def from_dict(d):
 		"""Returns a Node object based on the data provided in the dictionary
 		"""
-		n = Node(QPoint(d['x'], d['y']))
-		#TODO: read color?
+		n = Node((d['x'], d['y']), d.get('label') or '')
+		if 'color' in d:
+			n._color = Color(d['color'])
 		return n
 
 	def remove(self, e):
 		"""Removes the provided Edge object from this nodes outgoing and incoming edge sets"""
-		if e.src == self:
-			self.adj = [v for v in self.adj if v != e.targ]
+		if e.src is self:
 			self.out.remove(e)
 		else:
-			self.adj = [v for v in self.adj if v != e.src]
 			self.inc.remove(e)
 
 	def _adj_edges(self):
@@ -401,11 +820,20 @@ class Node:
 		for e in self.out:
 			yield e,e.targ
 
+	@property
+	def adj(self):
+		"""Returns a list of all nodes connected to this node by an outgoing or incoming edge
+
+		The list is built from the out and inc edges on each access rather than stored, so it can
+			not become out of date when edges are added or removed.
+		"""
+		return list(dict.fromkeys([e.targ for e in self.out] + [e.src for e in self.inc]))
+
 	@property
 	def adj_edges(self):
 		"""Returns a generator which yields all outgoing and incoming edges as an edge,node tuple"""
 		return self._adj_edges()
-	
+
 
 	@property
 	def color(self):
@@ -414,9 +842,12 @@ class Node:
 
 	@color.setter
 	def color(self, value):
+		old = self._color
 		self._color = value
-		if hasattr(self, 'graphic'):
-			self.graphic.update()
+		if self.graphic is not None:
+			self.graphic.notify()
+		if Graph.observers:
+			Graph.notify(self, 'color', old, value)
 
 	@property
 	def label(self):
@@ -425,273 +856,9 @@ class Node:
 
 	@label.setter
 	def label(self, value):
+		old = self._label
 		self._label = value
-		if hasattr(self, 'graphic'):
-			self.graphic.setToolTip(self._label)
-	
-
-class GraphicNode(QGraphicsEllipseItem):
-	default_radius = 18
-
-	def __init__(self,node,point):
-		r = GraphicNode.default_radius
-		super().__init__(point.x()-r,point.y()-r,2*r,2*r)
-		self.node = node
-
-		self.setBrush(QBrush(color_to_qt[self.node.color]))
-
-	def center(self):
-		return self.sceneBoundingRect().center()
-
-	def paint(self, painter, option, widget):
-		self.setBrush(QBrush(color_to_qt[self.node.color]))
-		super().paint(painter, option, widget)
-
-class GraphScene(QGraphicsScene):
-
-	def __init__(self):
-		super().__init__()
-		gui = self
-		self.setSceneRect(0,0,500,500)
-		self.running = False
-		self.current_line = None
-		self.current_start = None
-		self.graph = Graph()
-		self.show_weight = False
-		self.show_flow = False
-		self.show_direction = False
-
-	def set_show_weight(self, value):
-		if value != self.show_weight:
-			self.show_weight = value
-			for e in self.graph.edges:
-				self.update_label(e.graphic)
-
-	def set_show_flow(self, value):
-		if value != self.show_flow:
-			self.show_flow = value
-			for e in self.graph.edges:
-				self.update_label(e.graphic)
-
-	def set_show_direction(self, value):
-		if  value != self.show_direction:
-			self.show_direction = value
-			for e in self.graph.edges:
-				e.graphic.update()
-
-	def set_graph(self, graph):
-		self.clear()
-
-		self.graph = graph
-
-		for n in graph.nodes:
-			self.addItem(n.graphic)
-		for e in graph.edges:
-			self.add_edge_graphic(e)
-			self.update_label(e.graphic)
-
-	def set_graph_from_json(self, data):
-		self.clear()
-
-		self.graph = Graph.read_graph_from_json(data)
-
-		for n in self.graph.nodes:
-			self.addItem(n.graphic)
-		for e in self.graph.edges:
-			self.add_edge_graphic(e)
-			self.update_label(e.graphic)
-
-	def get_graph(self):
-		return self.graph
-
-	def mouseDoubleClickEvent(self, event):
-		self.mousePressEvent(event)
-
-	def mousePressEvent(self, event):
-		super().mousePressEvent(event)
-		if not self.running:
-			if event.button() == Qt.LeftButton:
-				item = self.itemAt(event.scenePos(), QTransform())
-
-				if not item:
-					self.put_node(event.scenePos())
-				elif type(item) == GraphicNode:
-					if not self.current_line:
-						self.current_line = QGraphicsLineItem(QLineF(item.center(), item.center()))
-						self.current_line.setZValue(-100)
-						self.current_start = item
-						self.addItem(self.current_line)
-
-	def mouseReleaseEvent(self,event):
-		super().mouseReleaseEvent(event)
-		if not self.running:
-			if event.button() == Qt.LeftButton:
-				item = self.itemAt(event.scenePos(), QTransform())
-				if (not item or type(item) != GraphicNode) and self.current_line:
-					self.removeItem(self.current_line)
-					self.current_line = None
-					self.current_start = None
-				elif item != self.current_start and self.current_start:
-					self.removeItem(self.current_line)
-
-					self.put_edge(self.current_start, item)
-					self.current_line = None
-					self.current_start = None
-
-	def mouseMoveEvent(self, event):
-		if not self.running:
-			if self.current_line:
-				self.current_line.setLine(QLineF(self.current_line.line().p1(), event.scenePos()))
-
-	def contextMenuEvent(self, event):
-
-		item = self.itemAt(event.scenePos(), QTransform())
-
-		if type(item) == GraphicEdge:
-			menu = QMenu()
-
-			set_weight = QAction('Set Edge Weight')
-			set_weight.triggered.connect(lambda : self.set_edge_weight(item.edge))
-
-			flip_edge = QAction('Flip Edge Direction')
-			flip_edge.triggered.connect(lambda : self.flip_graphic_edge(item))
-
-			remove_edge = QAction('Remove Edge')
-			remove_edge.triggered.connect(lambda : self.remove_graphic_edge(item))
-
-			menu.addAction(set_weight)
-			menu.addAction(flip_edge)
-			menu.addAction(remove_edge)
-			menu.exec(QCursor.pos())
-
-		elif type(item) == GraphicNode:
-			menu = QMenu()
-
-			label_node = QAction('Label Node')
-			label_node.triggered.connect(lambda : self.label_graphic_node(item))
-
-			remove_node = QAction('Remove Node')
-			remove_node.triggered.connect(lambda : self.remove_graphic_node(item))
-
-			menu.addAction(label_node)
-			menu.addAction(remove_node)
-			menu.exec(QCursor.pos())
-
-
-
-	def put_node(self,pos):
-		u = Node(pos)
-		self.graph.add_node(u)
-		self.addItem(u.graphic)
-
-	def put_edge(self, u, v, w = None):
-		u = u.node
-		v = v.node
-
-		if u == v or v in [e.targ for e in u.out]:
-			return
-
-		e = Edge(u,v,w)
-		u.out.append(e)
-		v.inc.append(e)
-
-		if v not in u.adj:
-			u.adj.append(v)
-		if u not in v.adj:
-			v.adj.append(u)
-		self.graph.add_edge(e)
-		self.add_edge_graphic(e)
-
-		for tmp in v.out:
-			if tmp.targ == u:
-				self.update_label(tmp.graphic)
-
-		if w is None and self.show_weight:
-			self.set_edge_weight(e)
-
-	def add_edge_graphic(self, e):
-		self.addItem(e.graphic)
-		e.label_changed.connect(self.update_label)
-
-
-	def set_edge_weight(self, e):
-		value, ok_pressed = QInputDialog.getDouble(None, "Input Weight", "Weight=")
-		e.weight = value
-
-	def remove_graphic_edge(self, e):
-		self.removeItem(e)
-		if e.edge_label:
-			self.removeItem(e.edge_label)
-		e = e.edge
-		e.src.remove(e)
-		e.targ.remove(e)
-		self.graph.remove_edge(e)
-
-	def remove_graphic_node(self, n):
-		self.removeItem(n)
-		n = n.node
-		for e in n.out.copy():
-			self.remove_graphic_edge(e.graphic)
-		for e in n.inc.copy():
-			self.remove_graphic_edge(e.graphic)
-		self.graph.remove_node(n)
-
-	def flip_graphic_edge(self, e):
-		s = e.edge.src
-		t = e.edge.targ
-		w = e.edge.weight
-		self.remove_graphic_edge(e)
-
-		e = Edge(t,s,w)
-		t.out.append(e)
-		s.inc.append(e)
-		t.adj.append(s)
-		s.adj.append(t)
-		self.graph.add_edge(e)
-		self.addItem(e.graphic)
-		self.update_label(e.graphic)
-
-	def label_graphic_node(self,n):
-		value, ok_pressed = QInputDialog.getText(None, "Input Label", "Label=")
-		if not ok_pressed:
-			return
-		self.graph.create_label(n.node,value)
-
-	def update_label(self, e):
-		if not isinstance(e, GraphicEdge):
-			return
-		
-		w = e.edge.weight
-		f = e.edge.flow
-
-		n = e.line().normalVector()
-		d = e.line().unitVector()
-		d.setLength(e.line().length()//2)
-		n.translate(d.p2() - d.p1())
-		n.setLength(GraphicEdge.label_distance)
-
-		if not e.edge_label:
-			e.edge_label = QGraphicsTextItem('')
-			self.addItem(e.edge_label)
-		if self.show_flow and self.show_weight:
-			e.edge_label.setPlainText('{:g}/{:g}'.format(f if f is not None else math.nan,w if w is not None else math.nan))
-		elif self.show_weight:
-			e.edge_label.setPlainText('{:g}'.format(w if w is not None else math.nan))
-		elif self.show_flow:
-			e.edge_label.setPlainText('{:g}'.format(f if f is not None else math.nan))
-		else:
-			e.edge_label.setPlainText('')
-
-
-		if 90 < n.angle() < 270 and e.edge.src not in [e.targ for e in e.edge.targ.out]:
-			n.setAngle(n.angle() + 180)
-
-		x = n.p2().x() - e.edge_label.boundingRect().width() / 2
-		y = n.p2().y() - e.edge_label.boundingRect().height() / 2
-		e.edge_label.setPos(x,y)
-
-
-
-		
-
-
+		if self.graphic is not None:
+			self.graphic.notify()
+		if Graph.observers:
+			Graph.notify(self, 'label', old, value)
@@ -0,0 +1,781 @@
+from PyQt5.QtWidgets import *
+from PyQt5.QtGui import *
+from PyQt5.QtCore import *
+from PyQt5 import sip
+from graphdebugger.Graph import Color, Graph, Node, Edge
+
+import itertools
+import math
+import threading
+import time
+
+
+color_to_qt = {
+		Color.RED : Qt.red,
+		Color.BLACK : Qt.black,
+		Color.CYAN : Qt.cyan,
+		Color.BLUE : Qt.blue,
+		Color.GRAY : Qt.gray,
+		Color.WHITE : Qt.white
+	}
+
+#color of elements which were never accessed while a heatmap is shown
+heat_idle = QColor(Qt.lightGray)
+
+
+def heat_color(fraction):
+	"""Return a color from pale yellow for a fraction of 0 to red for a fraction of 1"""
+	return QColor.fromHsv(int(60 * (1 - fraction)), int(40 + 215 * fraction), 255)
+
+
+class ChangeBuffer:
+	"""Lock protected set of graphic items whose underlying nodes or edges changed since the last frame
+
+	Written to by whichever thread mutates the graph and drained by the GUI thread. Repeated changes to
+		the same element before the next frame collapse into a single entry.
+	"""
+
+	def __init__(self):
+		self.lock = threading.Lock()
+		self.pending = {}
+
+	def mark(self, item):
+		"""Add item to the buffer. Returns True if the buffer was empty, meaning a flush must be scheduled"""
+		with self.lock:
+			first = not self.pending
+			self.pending[id(item)] = item
+			return first
+
+	def drain(self):
+		"""Remove and return all buffered items"""
+		with self.lock:
+			items = self.pending
+			self.pending = {}
+		return items.values()
+
+
+class GraphicEdge(QGraphicsLineItem):
+	"""Graphic item for an Edge
+
+	The line and pen are set by update_geometry whenever the edge changes, instead of on every paint, and
+		the arrowhead is computed on its first paint after that. Repainting an edge only draws the cached
+		geometry.
+	"""
+
+	label_distance = 15
+	arrow_height = 10
+	arrow_width = 10
+
+	def __init__(self, edge, scene):
+		super().__init__()
+		self.setZValue(-100)
+		self.edge = edge
+		self.graph_scene = scene
+		self.edge_label = None
+		self.tile = None
+		self.arrow = None
+		self.bounds = None
+		self.outline = None
+		self.update_geometry()
+
+	def notify(self):
+		"""Called by the underlying Edge, from any thread, when one of its displayed attributes changes"""
+		self.graph_scene.mark_changed(self)
+
+	def update_geometry(self):
+		"""Recompute the line and pen of this edge from the positions and color of the edge"""
+		line = QLineF(self.edge.src.graphic.center(), self.edge.targ.graphic.center())
+		if self.edge.src is not self.edge.targ and self.graph_scene.graph.reverse_of(self.edge) is not None:
+			unit = line.unitVector()
+			unit.setAngle(unit.angle()+90)
+			unit.setLength(5)
+			line.translate(unit.p2() - unit.p1())
+		self.prepareGeometryChange()
+		self.arrow = None
+		self.bounds = None
+		self.outline = None
+		self.setLine(line)
+		self.setPen(QPen(self.graph_scene.element_color(self.edge)))
+
+	def arrowhead(self):
+		line = self.line()
+		if line.length() == 0:
+			return QPolygonF()
+		unit = QLineF(line)
+		unit.setLength(max(line.length() - GraphicNode.default_radius, 0))
+		points = [unit.p2()]
+		unit.setLength(max(unit.length() - GraphicEdge.arrow_height, 0))
+		base = unit.p2()
+		unit = unit.normalVector().unitVector()
+		unit.translate(base - unit.p1())
+		unit.setLength(GraphicEdge.arrow_width//2)
+		points.append(unit.p2())
+		unit.setAngle(unit.angle() + 180)
+		points.append(unit.p2())
+		return QPolygonF(points)
+
+	def boundingRect(self):
+		if self.bounds is None:
+			#leave room for the arrowhead, which never extends further than half its width from the line
+			d = GraphicEdge.arrow_width / 2 + 1
+			line = self.line()
+			self.bounds = QRectF(line.p1(), line.p2()).normalized().adjusted(-d, -d, d, d)
+		return self.bounds
+
+	def paint(self, painter, option, widget):
+		super().paint(painter, option, widget)
+
+		#draw tip if directed
+		if self.graph_scene.show_direction:
+			if self.arrow is None:
+				self.arrow = self.arrowhead()
+			painter.setBrush(self.pen().color())
+			painter.drawPolygon(self.arrow)
+
+	def shape(self):
+		if self.outline is None:
+			path = QPainterPath(self.line().p1())
+			path.lineTo(self.line().p2())
+			stroker = QPainterPathStroker()
+			stroker.setWidth(15)
+			self.outline = stroker.createStroke(path)
+		return self.outline
+
+
+class EdgeLabel(QGraphicsSimpleTextItem):
+	"""Weight and flow label of an edge. Only created for edges which have something to display"""
+
+	def __init__(self):
+		super().__init__()
+		self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+
+
+class EdgeTile(QGraphicsItem):
+	"""Draws all edges whose midpoint lies in one square of the scene with a single call per color
+
+	Used instead of the individual GraphicEdge items when zoomed out, without arrowheads or labels. The
+		batches are rebuilt lazily on the next paint after an edge of the tile changes. Tiles are never hit
+		by mouse events, so clicks go through to the nodes and the empty canvas below them.
+	"""
+
+	size = 1024
+
+	def __init__(self):
+		super().__init__()
+		self.setZValue(-100)
+		self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+		self.edges = {}
+		self.lines = None
+		self.bounds = None
+
+	def add(self, graphic):
+		self.edges[id(graphic)] = graphic
+		graphic.tile = self
+		self.changed()
+
+	def remove(self, graphic):
+		self.edges.pop(id(graphic), None)
+		graphic.tile = None
+		self.changed()
+
+	def changed(self):
+		"""Recompute the bounds and batches of this tile after edges were added, removed or moved"""
+		self.prepareGeometryChange()
+		self.bounds = None
+		self.invalidate()
+
+	def invalidate(self):
+		"""Rebuild the batches of this tile the next time it is painted"""
+		self.lines = None
+		self.update()
+
+	def boundingRect(self):
+		if self.bounds is None:
+			rect = QRectF()
+			for graphic in self.edges.values():
+				rect = rect.united(QRectF(graphic.line().p1(), graphic.line().p2()).normalized())
+			self.bounds = rect.adjusted(-1, -1, 1, 1)
+		return self.bounds
+
+	def shape(self):
+		return QPainterPath()
+
+	def paint(self, painter, option, widget):
+		if self.lines is None:
+			self.lines = {}
+			for graphic in self.edges.values():
+				color = QColor(graphic.graph_scene.element_color(graphic.edge))
+				self.lines.setdefault(color.rgba(), (color, []))[1].append(graphic.line())
+		for color, lines in self.lines.values():
+			painter.setPen(QPen(color, 0))
+			painter.drawLines(lines)
+
+
+class GraphicNode(QGraphicsEllipseItem):
+	default_radius = Node.radius
+
+	def __init__(self,node,scene):
+		r = GraphicNode.default_radius
+		super().__init__(node.x-r,node.y-r,2*r,2*r)
+		self.node = node
+		self.graph_scene = scene
+
+		self.setBrush(QBrush(scene.element_color(node)))
+		self.setToolTip(self.node.label)
+
+	def notify(self):
+		"""Called by the underlying Node, from any thread, when one of its displayed attributes changes"""
+		self.graph_scene.mark_changed(self)
+
+	def center(self):
+		return self.sceneBoundingRect().center()
+
+
+class GraphView(QGraphicsView):
+	"""View of a GraphScene with zoom and pan support
+
+	The mouse wheel zooms around the cursor and dragging with the middle mouse button pans. The current
+		scale is passed on to the scene, which switches to its zoomed out level of detail below
+		GraphScene.detail_threshold.
+	"""
+
+	zoom_step = 1.25
+	min_scale = 0.01
+	max_scale = 8
+
+	def __init__(self, scene):
+		super().__init__(scene)
+		self.setRenderHint(QPainter.Antialiasing)
+		self.setMouseTracking(True)
+		self.setOptimizationFlags(QGraphicsView.DontSavePainterState | QGraphicsView.DontAdjustForAntialiasing)
+		self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
+		self.setCacheMode(QGraphicsView.CacheBackground)
+		self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+		self.setResizeAnchor(QGraphicsView.AnchorViewCenter)
+		self.pan_start = None
+
+	def current_scale(self):
+		return self.transform().m11()
+
+	def zoom(self, factor):
+		"""Scale the view by factor, clamped to min_scale and max_scale"""
+		current = self.current_scale()
+		scale = min(max(current * factor, GraphView.min_scale), GraphView.max_scale)
+		self.scale(scale / current, scale / current)
+		self.scale_changed()
+
+	def reset_zoom(self):
+		self.resetTransform()
+		self.scale_changed()
+
+	def fit_graph(self):
+		"""Zoom out until the whole graph is visible, without zooming in past the default scale"""
+		rect = self.scene().itemsBoundingRect()
+		if rect.isEmpty():
+			return self.reset_zoom()
+		self.fitInView(rect, Qt.KeepAspectRatio)
+		if self.current_scale() > 1:
+			self.resetTransform()
+			self.centerOn(rect.center())
+		self.scale_changed()
+
+	def scale_changed(self):
+		detailed = self.scene().set_level_of_detail(self.current_scale())
+		self.setRenderHint(QPainter.Antialiasing, detailed)
+
+	def wheelEvent(self, event):
+		self.zoom(GraphView.zoom_step ** (event.angleDelta().y() / 120))
+
+	def mousePressEvent(self, event):
+		if event.button() == Qt.MiddleButton:
+			self.pan_start = event.pos()
+			self.viewport().setCursor(Qt.ClosedHandCursor)
+			return
+		super().mousePressEvent(event)
+
+	def mouseMoveEvent(self, event):
+		if self.pan_start is not None:
+			delta = event.pos() - self.pan_start
+			self.pan_start = event.pos()
+			self.horizontalScrollBar().setValue(self.horizontalScrollBar().value() - delta.x())
+			self.verticalScrollBar().setValue(self.verticalScrollBar().value() - delta.y())
+			return
+		super().mouseMoveEvent(event)
+
+	def mouseReleaseEvent(self, event):
+		if event.button() == Qt.MiddleButton:
+			self.pan_start = None
+			self.viewport().unsetCursor()
+			return
+		super().mouseReleaseEvent(event)
+
+
+class GraphScene(QGraphicsScene):
+
+	changes_pending = pyqtSignal()
+	#emitted with a Node or Edge when a watchpoint on it is requested from the context menu
+	watch_requested = pyqtSignal(object)
+
+	max_fps = 60
+
+	#view scale below which edges are drawn in batches by EdgeTile, without arrowheads or labels
+	detail_threshold = 0.5
+
+	#space left around the graph when growing the scene to fit it
+	margin = 500
+
+	#number of edges above which update_positions rebuilds the item index instead of updating it
+	bulk_limit = 1000
+
+	def __init__(self):
+		super().__init__()
+		gui = self
+		self.setSceneRect(0,0,500,500)
+		self.running = False
+		self.current_line = None
+		self.current_start = None
+		self.graph = Graph()
+		self.show_weight = False
+		self.show_flow = False
+		self.show_direction = False
+		self.changes = ChangeBuffer()
+		self.last_flush = 0
+		self.detailed = True
+		self.tiles = {}
+		self.heat = None
+		self.changes_pending.connect(self.schedule_flush)
+
+	def set_show_weight(self, value):
+		if value != self.show_weight:
+			self.show_weight = value
+			for e in self.graph.edges:
+				self.update_label(e.graphic)
+
+	def set_show_flow(self, value):
+		if value != self.show_flow:
+			self.show_flow = value
+			for e in self.graph.edges:
+				self.update_label(e.graphic)
+
+	def set_show_direction(self, value):
+		if  value != self.show_direction:
+			self.show_direction = value
+			if self.detailed:
+				for e in self.graph.edges:
+					if e.graphic is not None:
+						e.graphic.update()
+
+	def set_level_of_detail(self, scale):
+		"""Switch between individual and batched edges for the provided view scale. Returns True if detailed
+
+		args:
+			scale(float): current scale of the view
+		"""
+		detailed = scale >= GraphScene.detail_threshold
+		if detailed != self.detailed:
+			self.detailed = detailed
+			for tile in self.tiles.values():
+				tile.setVisible(not detailed)
+			for e in self.graph.edges:
+				if e.graphic is None:
+					continue
+				e.graphic.setVisible(detailed)
+				if e.graphic.edge_label:
+					e.graphic.edge_label.setVisible(detailed and bool(e.graphic.edge_label.text()))
+		return detailed
+
+	def element_color(self, x):
+		"""Return the color to draw the provided node or edge in, which is its heat while a heatmap is shown"""
+		if self.heat is not None:
+			return self.heat.get(id(x), heat_idle)
+		return color_to_qt[x.color]
+
+	def show_heat(self, counts):
+		"""Draw every node and edge in a color showing its count, or in its own color again if counts is None
+
+		Colors go from pale yellow to red on a logarithmic scale up to the largest count, and elements
+			without a count are drawn in light gray.
+
+		args:
+			counts(dict): maps nodes and edges to a number, such as the totals of an AccessCounter
+		"""
+		if counts is None:
+			self.heat = None
+		else:
+			scale = math.log1p(max(counts.values(), default=0)) or 1
+			self.heat = {id(x):heat_color(math.log1p(n) / scale) for x, n in counts.items()}
+		for x in itertools.chain(self.graph.nodes, self.graph.edges):
+			if x.graphic is not None:
+				self.refresh_graphic(x.graphic)
+
+	def detach_graph(self):
+		"""Drop the graphic items of the current graph so its nodes and edges can outlive this scene"""
+		for n in self.graph.nodes:
+			n.graphic = None
+		for e in self.graph.edges:
+			e.graphic = None
+		self.changes.drain()
+		self.clear()
+		self.tiles = {}
+		self.heat = None
+
+	def set_graph(self, graph):
+		self.detach_graph()
+
+		self.graph = graph
+
+		for n in graph.nodes:
+			self.add_node_graphic(n)
+		for e in graph.edges:
+			self.add_edge_graphic(e)
+			self.update_label(e.graphic)
+		self.fit_scene_rect()
+
+	def fit_scene_rect(self):
+		"""Grow the scene so that the whole graph fits in it with some margin around"""
+		self.setSceneRect(self.itemsBoundingRect().adjusted(-GraphScene.margin, -GraphScene.margin,
+							GraphScene.margin, GraphScene.margin).united(QRectF(0,0,500,500)))
+
+	def update_positions(self, nodes=None):
+		"""Move the graphic items of the provided nodes, and of their edges, to the current x and y of the nodes
+
+		args:
+			nodes(iterable[Node]): nodes which moved. Default = None, which updates every node
+		"""
+		#moving many items one by one through the BSP index is much slower than rebuilding it once
+		bulk = len(self.graph.edges) > GraphScene.bulk_limit
+		if bulk:
+			self.setItemIndexMethod(QGraphicsScene.NoIndex)
+
+		r = GraphicNode.default_radius
+		edges = {}
+		bounds = QRectF()
+		for n in self.graph.nodes if nodes is None else nodes:
+			if n.graphic is None:
+				continue
+			n.graphic.setRect(n.x-r, n.y-r, 2*r, 2*r)
+			bounds = bounds.united(n.graphic.rect())
+			for e in itertools.chain(n.out, n.inc):
+				edges[id(e)] = e
+		graphics = [e.graphic for e in edges.values() if e.graphic is not None]
+		for graphic in graphics:
+			graphic.update_geometry()
+			self.update_label(graphic)
+		self.retile(graphics)
+		if bulk:
+			self.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+		if not bounds.isEmpty():
+			m = GraphScene.margin
+			self.setSceneRect(self.sceneRect().united(bounds.adjusted(-m, -m, m, m)))
+
+	def set_graph_from_json(self, data):
+		self.set_graph(Graph.read_graph_from_json(data))
+
+	def restore_graph(self, snapshot):
+		"""Return the displayed graph to the provided snapshot, reusing the existing graphic items
+
+		args:
+			snapshot(GraphSnapshot): snapshot taken of the displayed graph
+		"""
+		if snapshot.graph is not self.graph:
+			return
+		added, removed = self.graph.restore(snapshot)
+		for x in removed:
+			if x.graphic is None:
+				continue
+			if isinstance(x, Edge):
+				self.remove_edge_items(x.graphic)
+			else:
+				self.removeItem(x.graphic)
+			x.graphic = None
+		for x in added:
+			if isinstance(x, Node):
+				self.add_node_graphic(x)
+		for x in added:
+			if isinstance(x, Edge):
+				self.add_edge_graphic(x)
+				self.update_label(x.graphic)
+		for x in itertools.chain(added, removed):
+			if isinstance(x, Edge):
+				self.refresh_reverse(x)
+
+	def get_graph(self):
+		return self.graph
+
+	def mark_changed(self, item):
+		"""Queue item to be refreshed on the next frame. Safe to call from any thread"""
+		if self.changes.mark(item):
+			self.changes_pending.emit()
+
+	def schedule_flush(self):
+		delay = self.last_flush + 1 / self.max_fps - time.monotonic()
+		QTimer.singleShot(max(0, int(delay * 1000)), self.flush_changes)
+
+	def flush_changes(self):
+		"""Refresh every graphic item whose element changed since the last frame"""
+		self.last_flush = time.monotonic()
+		for item in self.changes.drain():
+			self.refresh_graphic(item)
+
+	def refresh_graphic(self, item):
+		if sip.isdeleted(item) or item.scene() is not self:
+			return
+		if isinstance(item, GraphicNode):
+			item.setBrush(QBrush(self.element_color(item.node)))
+			item.setToolTip(item.node.label)
+		else:
+			item.update_geometry()
+			self.update_label(item)
+			if item.tile is not None:
+				item.tile.invalidate()
+
+	def mouseDoubleClickEvent(self, event):
+		self.mousePressEvent(event)
+
+	def mousePressEvent(self, event):
+		super().mousePressEvent(event)
+		if not self.running:
+			if event.button() == Qt.LeftButton:
+				item = self.itemAt(event.scenePos(), QTransform())
+
+				if not item:
+					self.put_node(event.scenePos())
+				elif type(item) == GraphicNode:
+					if not self.current_line:
+						self.current_line = QGraphicsLineItem(QLineF(item.center(), item.center()))
+						self.current_line.setZValue(-100)
+						self.current_start = item
+						self.addItem(self.current_line)
+
+	def mouseReleaseEvent(self,event):
+		super().mouseReleaseEvent(event)
+		if not self.running:
+			if event.button() == Qt.LeftButton:
+				item = self.itemAt(event.scenePos(), QTransform())
+				if (not item or type(item) != GraphicNode) and self.current_line:
+					self.removeItem(self.current_line)
+					self.current_line = None
+					self.current_start = None
+				elif item != self.current_start and self.current_start:
+					self.removeItem(self.current_line)
+
+					self.put_edge(self.current_start, item)
+					self.current_line = None
+					self.current_start = None
+
+	def mouseMoveEvent(self, event):
+		if not self.running:
+			if self.current_line:
+				self.current_line.setLine(QLineF(self.current_line.line().p1(), event.scenePos()))
+
+	def contextMenuEvent(self, event):
+
+		item = self.itemAt(event.scenePos(), QTransform())
+
+		if type(item) == GraphicEdge:
+			menu = QMenu()
+
+			set_weight = QAction('Set Edge Weight')
+			set_weight.triggered.connect(lambda : self.set_edge_weight(item.edge))
+
+			flip_edge = QAction('Flip Edge Direction')
+			flip_edge.triggered.connect(lambda : self.flip_graphic_edge(item))
+
+			remove_edge = QAction('Remove Edge')
+			remove_edge.triggered.connect(lambda : self.remove_graphic_edge(item))
+
+			watch_edge = QAction('Watch Edge...')
+			watch_edge.triggered.connect(lambda : self.watch_requested.emit(item.edge))
+
+			menu.addAction(set_weight)
+			menu.addAction(flip_edge)
+			menu.addAction(remove_edge)
+			menu.addSeparator()
+			menu.addAction(watch_edge)
+			menu.exec(QCursor.pos())
+
+		elif type(item) == GraphicNode:
+			menu = QMenu()
+
+			label_node = QAction('Label Node')
+			label_node.triggered.connect(lambda : self.label_graphic_node(item))
+
+			remove_node = QAction('Remove Node')
+			remove_node.triggered.connect(lambda : self.remove_graphic_node(item))
+
+			watch_node = QAction('Watch Node...')
+			watch_node.triggered.connect(lambda : self.watch_requested.emit(item.node))
+
+			menu.addAction(label_node)
+			menu.addAction(remove_node)
+			menu.addSeparator()
+			menu.addAction(watch_node)
+			menu.exec(QCursor.pos())
+
+
+
+	def put_node(self,pos):
+		u = Node(pos)
+		self.graph.add_node(u)
+		self.add_node_graphic(u)
+
+	def put_edge(self, u, v, w = None):
+		u = u.node
+		v = v.node
+
+		if u == v or self.graph.has_edge(u, v):
+			return
+
+		e = Edge(u,v,w)
+		u.out.append(e)
+		v.inc.append(e)
+
+		self.graph.add_edge(e)
+		self.add_edge_graphic(e)
+		self.update_label(e.graphic)
+
+		self.refresh_reverse(e)
+
+		if w is None and self.show_weight:
+			self.set_edge_weight(e)
+
+	def add_node_graphic(self, n):
+		n.graphic = GraphicNode(n, self)
+		self.addItem(n.graphic)
+
+	def add_edge_graphic(self, e):
+		e.graphic = GraphicEdge(e, self)
+		e.graphic.setVisible(self.detailed)
+		self.addItem(e.graphic)
+		self.place_in_tile(e.graphic)
+
+	def tile_at(self, point):
+		"""Return the tile containing the provided scene position, creating it if needed"""
+		key = (int(point.x() // EdgeTile.size), int(point.y() // EdgeTile.size))
+		tile = self.tiles.get(key)
+		if tile is None:
+			tile = self.tiles[key] = EdgeTile()
+			tile.setVisible(not self.detailed)
+			self.addItem(tile)
+		return tile
+
+	def place_in_tile(self, graphic):
+		"""Add an edge's graphic item to the tile containing its midpoint, moving it out of its current one"""
+		tile = self.tile_at(graphic.line().center())
+		if graphic.tile is not None:
+			graphic.tile.remove(graphic)
+		tile.add(graphic)
+
+	def retile(self, graphics):
+		"""Move the graphic items of edges whose geometry changed into the right tiles, updating each tile once"""
+		changed = {}
+		for graphic in graphics:
+			tile = self.tile_at(graphic.line().center())
+			if graphic.tile is not tile:
+				if graphic.tile is not None:
+					graphic.tile.edges.pop(id(graphic), None)
+					changed[id(graphic.tile)] = graphic.tile
+				tile.edges[id(graphic)] = graphic
+				graphic.tile = tile
+			changed[id(tile)] = tile
+		for tile in changed.values():
+			tile.changed()
+
+	def remove_edge_items(self, graphic):
+		"""Remove the line, label and tile entry of an edge from the scene"""
+		self.removeItem(graphic)
+		if graphic.edge_label:
+			self.removeItem(graphic.edge_label)
+		if graphic.tile is not None:
+			graphic.tile.remove(graphic)
+
+	def refresh_reverse(self, e):
+		"""Update the geometry of the edge in the opposite direction of e, which is offset while both exist"""
+		reverse = self.graph.reverse_of(e)
+		if reverse is not None and reverse.graphic is not None:
+			reverse.graphic.update_geometry()
+			self.update_label(reverse.graphic)
+
+
+	def set_edge_weight(self, e):
+		value, ok_pressed = QInputDialog.getDouble(None, "Input Weight", "Weight=")
+		e.weight = value
+
+	def remove_graphic_edge(self, e):
+		self.remove_edge_items(e)
+		e = e.edge
+		e.graphic = None
+		e.src.remove(e)
+		e.targ.remove(e)
+		self.graph.remove_edge(e)
+		self.refresh_reverse(e)
+
+	def remove_graphic_node(self, n):
+		self.removeItem(n)
+		n = n.node
+		n.graphic = None
+		for e in n.out.copy():
+			self.remove_graphic_edge(e.graphic)
+		for e in n.inc.copy():
+			self.remove_graphic_edge(e.graphic)
+		self.graph.remove_node(n)
+
+	def flip_graphic_edge(self, e):
+		s = e.edge.src
+		t = e.edge.targ
+		w = e.edge.weight
+		self.remove_graphic_edge(e)
+
+		e = Edge(t,s,w)
+		t.out.append(e)
+		s.inc.append(e)
+		self.graph.add_edge(e)
+		self.add_edge_graphic(e)
+		self.update_label(e.graphic)
+
+		self.refresh_reverse(e)
+
+	def label_graphic_node(self,n):
+		value, ok_pressed = QInputDialog.getText(None, "Input Label", "Label=")
+		if not ok_pressed:
+			return
+		self.graph.create_label(n.node,value)
+
+	def update_label(self, e):
+		if not isinstance(e, GraphicEdge):
+			return
+
+		w = e.edge.weight
+		f = e.edge.flow
+
+		n = e.line().normalVector()
+		d = e.line().unitVector()
+		d.setLength(e.line().length()//2)
+		n.translate(d.p2() - d.p1())
+		n.setLength(GraphicEdge.label_distance)
+
+		if self.show_flow and self.show_weight:
+			text = '{:g}/{:g}'.format(f if f is not None else math.nan,w if w is not None else math.nan)
+		elif self.show_weight:
+			text = '{:g}'.format(w if w is not None else math.nan)
+		elif self.show_flow:
+			text = '{:g}'.format(f if f is not None else math.nan)
+		else:
+			text = ''
+
+		if not e.edge_label:
+			if not text:
+				return
+			e.edge_label = EdgeLabel()
+			self.addItem(e.edge_label)
+		e.edge_label.setText(text)
+		e.edge_label.setVisible(self.detailed and bool(text))
+		if not text:
+			return
+
+		if 90 < n.angle() < 270 and self.graph.reverse_of(e.edge) is None:
+			n.setAngle(n.angle() + 180)
+
+		x = n.p2().x() - e.edge_label.boundingRect().width() / 2
+		y = n.p2().y() - e.edge_label.boundingRect().height() / 2
+		e.edge_label.setPos(x,y)
@@ -0,0 +1,456 @@
+"""Reference implementations of shortest path and minimum spanning tree algorithms
+
+Every algorithm accepts either a Graph or a CSRGraph snapshot of one. The graph is first flattened into
+	lists in compressed sparse row order, which the algorithms then walk by node index, so they scale to
+	large graphs without touching the Node and Edge objects in their inner loops. Results are returned
+	keyed by the Node and Edge objects, so they can be compared directly with those of a user script.
+
+Shortest path functions return a (dist, pred) pair of dicts, mapping every node to its distance from the
+	source (math.inf if unreachable) and to the edge it was reached by (None for the source and
+	unreachable nodes). Use path_to to turn pred into a path. Spanning tree functions return a list of
+	the edges of the tree.
+
+Edge weights are read from Edge.weight, or from the provided weight function. Note that edges created
+	without a weight have a weight of -1. Prim and Kruskal treat every edge as undirected.
+
+The optional on_visit and on_finalize callbacks are called with nodes and edges as the algorithm reaches
+	them and as their result becomes final, see coloring for callbacks which color them.
+"""
+
+from graphdebugger.Graph import Color
+
+from collections import deque
+import heapq
+import math
+
+
+def coloring(visited=Color.GRAY, finalized=Color.BLACK):
+	"""Return on_visit and on_finalize callbacks which color the elements passed to them
+
+	Use as dijkstra(graph, source, **coloring()).
+
+	args:
+		visited(Color): color of nodes and edges which were reached. Default = Color.GRAY
+		finalized(Color): color of nodes and edges whose result is final. Default = Color.BLACK
+	"""
+	def on_visit(x):
+		x.color = visited
+
+	def on_finalize(x):
+		x.color = finalized
+
+	return {'on_visit':on_visit, 'on_finalize':on_finalize}
+
+
+def dijkstra(graph, source, target=None, weight=None, on_visit=None, on_finalize=None):
+	"""Return the (dist, pred) shortest paths from source, which requires non-negative weights
+
+	on_visit is called with a node whenever its distance improves, and on_finalize with the edge a node
+		was reached by and then with the node once its distance is final.
+
+	args:
+		graph(Graph,CSRGraph): graph to search
+		source(Node): node to start from
+		target(Node): node at which to stop, leaving the distances of farther nodes unknown. Default = None
+		weight(callable): f(edge) -> weight. Default = None, which uses Edge.weight
+		on_visit(callable): f(node). Default = None
+		on_finalize(callable): f(element). Default = None
+	"""
+	adj = _Adjacency(graph, weight)
+	adj.check_weights(negative=False)
+	s = adj.index_of(source)
+	t = adj.index_of(target) if target is not None else -1
+	nodes, offsets, targets, weights = adj.nodes, adj.offsets, adj.targets, adj.weights
+	dist = [math.inf] * len(nodes)
+	pred = [-1] * len(nodes)
+	done = bytearray(len(nodes))
+
+	dist[s] = 0
+	heap = [(0, s)]
+	if on_visit is not None:
+		on_visit(nodes[s])
+	while heap:
+		d, u = heapq.heappop(heap)
+		if done[u]:
+			continue
+		done[u] = 1
+		if on_finalize is not None:
+			adj.finalize(on_finalize, u, pred[u])
+		if u == t:
+			break
+		for k in range(offsets[u], offsets[u+1]):
+			v = targets[k]
+			nd = d + weights[k]
+			if nd < dist[v]:
+				dist[v] = nd
+				pred[v] = k
+				heapq.heappush(heap, (nd, v))
+				if on_visit is not None:
+					on_visit(nodes[v])
+	return adj.results(dist, pred)
+
+
+def bellman_ford(graph, source, weight=None, on_visit=None, on_finalize=None):
+	"""Return the (dist, pred) shortest paths from source, allowing negative weights
+
+	Only nodes whose distance improved are rescanned, in first in first out order. Raises ValueError if
+		a negative cycle is reachable from source. on_visit is called with a node whenever its distance
+		improves, and on_finalize with the edge each reached node was reached by and with the node once
+		the search is over.
+
+	args:
+		graph(Graph,CSRGraph): graph to search
+		source(Node): node to start from
+		weight(callable): f(edge) -> weight. Default = None, which uses Edge.weight
+		on_visit(callable): f(node). Default = None
+		on_finalize(callable): f(element). Default = None
+	"""
+	adj = _Adjacency(graph, weight)
+	adj.check_weights(negative=True)
+	s = adj.index_of(source)
+	nodes, offsets, targets, weights = adj.nodes, adj.offsets, adj.targets, adj.weights
+	n = len(nodes)
+	dist = [math.inf] * n
+	pred = [-1] * n
+	#number of edges on the current path to each node, a path of n edges means a negative cycle
+	length = [0] * n
+	queued = bytearray(n)
+
+	dist[s] = 0
+	queue = deque([s])
+	queued[s] = 1
+	if on_visit is not None:
+		on_visit(nodes[s])
+	while queue:
+		u = queue.popleft()
+		queued[u] = 0
+		du = dist[u]
+		for k in range(offsets[u], offsets[u+1]):
+			v = targets[k]
+			nd = du + weights[k]
+			if nd < dist[v]:
+				dist[v] = nd
+				pred[v] = k
+				length[v] = length[u] + 1
+				if length[v] >= n:
+					raise ValueError('graph contains a negative cycle reachable from the source')
+				if on_visit is not None:
+					on_visit(nodes[v])
+				if not queued[v]:
+					queued[v] = 1
+					queue.append(v)
+
+	if on_finalize is not None:
+		for u in range(n):
+			if dist[u] < math.inf:
+				adj.finalize(on_finalize, u, pred[u])
+	return adj.results(dist, pred)
+
+
+def astar(graph, source, target, heuristic=None, weight=None, on_visit=None, on_finalize=None):
+	"""Return the (dist, pred) shortest paths found by an A* search from source to target
+
+	Only the distance of target, and of the nodes on its path, are guaranteed to be exact. The heuristic
+		must never overestimate the distance to target. Nodes are reopened if a shorter path to them is
+		found later, so it does not need to be consistent. on_visit is called with a node whenever its
+		distance improves, and on_finalize with the edge a node was reached by and then with the node
+		when it is expanded.
+
+	args:
+		graph(Graph,CSRGraph): graph to search
+		source(Node): node to start from
+		target(Node): node to find a path to
+		heuristic(callable): f(node, target) -> lower bound of the distance from node to target, such as
+			euclidean when weights are at least the length of edges on the canvas. Default = None, which
+			searches like Dijkstra
+		weight(callable): f(edge) -> weight. Default = None, which uses Edge.weight
+		on_visit(callable): f(node). Default = None
+		on_finalize(callable): f(element). Default = None
+	"""
+	if heuristic is None:
+		return dijkstra(graph, source, target, weight, on_visit, on_finalize)
+	adj = _Adjacency(graph, weight)
+	adj.check_weights(negative=False)
+	s = adj.index_of(source)
+	t = adj.index_of(target)
+	nodes, offsets, targets, weights = adj.nodes, adj.offsets, adj.targets, adj.weights
+	dist = [math.inf] * len(nodes)
+	pred = [-1] * len(nodes)
+	estimate = {}
+
+	dist[s] = 0
+	heap = [(heuristic(nodes[s], target), 0, s)]
+	if on_visit is not None:
+		on_visit(nodes[s])
+	while heap:
+		f, d, u = heapq.heappop(heap)
+		if d > dist[u]:
+			continue
+		if on_finalize is not None:
+			adj.finalize(on_finalize, u, pred[u])
+		if u == t:
+			break
+		for k in range(offsets[u], offsets[u+1]):
+			v = targets[k]
+			nd = d + weights[k]
+			if nd < dist[v]:
+				dist[v] = nd
+				pred[v] = k
+				h = estimate.get(v)
+				if h is None:
+					h = estimate[v] = heuristic(nodes[v], target)
+				heapq.heappush(heap, (nd + h, nd, v))
+				if on_visit is not None:
+					on_visit(nodes[v])
+	return adj.results(dist, pred)
+
+
+def euclidean(u, v):
+	"""Return the distance between the positions of two nodes on the canvas"""
+	return math.hypot(u.x - v.x, u.y - v.y)
+
+
+def path_to(pred, target):
+	"""Return the list of edges on the path to target found by a shortest path search
+
+	The list is empty if target is the source or was not reached.
+
+	args:
+		pred(dict): predecessor edges as returned by the shortest path functions
+		target(Node): last node of the path
+	"""
+	path = []
+	e = pred.get(target)
+	while e is not None:
+		path.append(e)
+		e = pred.get(e.src)
+	path.reverse()
+	return path
+
+
+def prim(graph, root=None, weight=None, on_visit=None, on_finalize=None):
+	"""Return the edges of a minimum spanning tree built by Prim's algorithm, ignoring edge direction
+
+	on_visit is called with a node whenever a lighter edge to it is found, and on_finalize with every
+		tree edge and then with the node it adds to the tree.
+
+	args:
+		graph(Graph,CSRGraph): graph to span
+		root(Node): node to grow the tree from. Default = None, which returns a minimum spanning forest
+			covering every component
+		weight(callable): f(edge) -> weight. Default = None, which uses Edge.weight
+		on_visit(callable): f(node). Default = None
+		on_finalize(callable): f(element). Default = None
+	"""
+	adj = _Adjacency(graph, weight, undirected=True)
+	adj.check_weights(negative=True)
+	nodes, offsets, targets, weights, edges = adj.nodes, adj.offsets, adj.targets, adj.weights, adj.edges
+	n = len(nodes)
+	best = [math.inf] * n
+	slot = [-1] * n
+	in_tree = bytearray(n)
+	tree = []
+
+	for r in [adj.index_of(root)] if root is not None else range(n):
+		if in_tree[r]:
+			continue
+		heap = [(0, r)]
+		best[r] = 0
+		while heap:
+			w, u = heapq.heappop(heap)
+			if in_tree[u] or w > best[u]:
+				continue
+			in_tree[u] = 1
+			if slot[u] >= 0:
+				tree.append(edges[slot[u]])
+			if on_finalize is not None:
+				adj.finalize(on_finalize, u, slot[u])
+			for k in range(offsets[u], offsets[u+1]):
+				v = targets[k]
+				if not in_tree[v] and weights[k] < best[v]:
+					best[v] = weights[k]
+					slot[v] = k
+					heapq.heappush(heap, (weights[k], v))
+					if on_visit is not None:
+						on_visit(nodes[v])
+	return tree
+
+
+def kruskal(graph, weight=None, on_visit=None, on_finalize=None):
+	"""Return the edges of a minimum spanning forest built by Kruskal's algorithm, ignoring edge direction
+
+	on_visit is called with every edge as it is considered, in order of weight, and on_finalize with the
+		edges added to the forest.
+
+	args:
+		graph(Graph,CSRGraph): graph to span
+		weight(callable): f(edge) -> weight. Default = None, which uses Edge.weight
+		on_visit(callable): f(edge). Default = None
+		on_finalize(callable): f(edge). Default = None
+	"""
+	adj = _Adjacency(graph, weight)
+	adj.check_weights(negative=True)
+	sources, targets, weights, edges = adj.sources(), adj.targets, adj.weights, adj.edges
+	#a snapshot stored in both directions holds every edge twice, only the first copy is needed
+	seen = set()
+	order = []
+	for k in sorted(range(len(edges)), key=weights.__getitem__):
+		if adj.undirected:
+			if id(edges[k]) in seen:
+				continue
+			seen.add(id(edges[k]))
+		order.append(k)
+
+	forest = UnionFind(len(adj.nodes))
+	tree = []
+	for k in order:
+		if on_visit is not None:
+			on_visit(edges[k])
+		if forest.union(sources[k], targets[k]):
+			tree.append(edges[k])
+			if on_finalize is not None:
+				on_finalize(edges[k])
+			if len(tree) == len(adj.nodes) - 1:
+				break
+	return tree
+
+
+class UnionFind:
+	"""Disjoint sets of the integers 0 to n-1, with union by size and path halving"""
+
+	__slots__ = ('parent', 'size', 'count')
+
+	def __init__(self, n):
+		"""Create n singleton sets
+
+		args:
+			n(int): number of elements
+		"""
+		self.parent = list(range(n))
+		self.size = [1] * n
+		self.count = n
+
+	def find(self, x):
+		"""Return the representative of the set containing x"""
+		parent = self.parent
+		while parent[x] != x:
+			parent[x] = parent[parent[x]]
+			x = parent[x]
+		return x
+
+	def union(self, x, y):
+		"""Merge the sets containing x and y. Returns False if they were already the same set"""
+		x = self.find(x)
+		y = self.find(y)
+		if x == y:
+			return False
+		if self.size[x] < self.size[y]:
+			x, y = y, x
+		self.parent[y] = x
+		self.size[x] += self.size[y]
+		self.count -= 1
+		return True
+
+	def connected(self, x, y):
+		return self.find(x) == self.find(y)
+
+	def __len__(self):
+		"""Return the number of disjoint sets"""
+		return self.count
+
+
+class _Adjacency:
+	"""A graph flattened into lists in compressed sparse row order
+
+	The edges leaving the node with index i are stored in the slots offsets[i]:offsets[i+1] of targets,
+		weights and edges. When undirected, every edge is stored once from each of its ends.
+	"""
+
+	def __init__(self, graph, weight=None, undirected=False):
+		if hasattr(graph, 'offsets') and hasattr(graph, 'edge_ids'):
+			self._from_snapshot(graph, undirected)
+		else:
+			self._from_graph(graph, undirected)
+		if weight is not None:
+			self.weights = [weight(e) for e in self.edges]
+
+	def _from_graph(self, graph, undirected):
+		self.nodes = list(graph.nodes)
+		self.index = {id(n):i for i,n in enumerate(self.nodes)}
+		self.undirected = undirected
+		self.offsets = offsets = [0]
+		self.targets = targets = []
+		self.weights = weights = []
+		self.edges = edges = []
+		index = self.index
+		for n in self.nodes:
+			for e in n.out:
+				j = index.get(id(e.targ))
+				if j is not None:
+					targets.append(j)
+					weights.append(e.weight)
+					edges.append(e)
+			if undirected:
+				for e in n.inc:
+					j = index.get(id(e.src))
+					if j is not None:
+						targets.append(j)
+						weights.append(e.weight)
+						edges.append(e)
+			offsets.append(len(targets))
+
+	def _from_snapshot(self, csr, undirected):
+		self.nodes = csr.nodes
+		self.index = {id(n):i for i,n in enumerate(self.nodes)}
+		self.undirected = undirected or csr.undirected
+		if undirected and not csr.undirected:
+			#store every slot a second time from its target, then regroup the slots by their first end
+			import numpy as np
+			m = csr.num_edges
+			ends = np.concatenate((csr.sources, csr.targets))
+			slots = np.concatenate((np.arange(m), np.arange(m)))[np.argsort(ends, kind='stable')]
+			others = np.concatenate((csr.targets, csr.sources))[np.argsort(ends, kind='stable')]
+			offsets = np.zeros(len(self.nodes) + 1, dtype=np.int64)
+			np.cumsum(np.bincount(ends, minlength=len(self.nodes)), out=offsets[1:])
+			self.offsets = offsets.tolist()
+			self.targets = others.tolist()
+			self.weights = csr.weights[slots].tolist()
+			self.edges = [csr.edges[k] for k in slots.tolist()]
+		else:
+			self.offsets = csr.offsets.tolist()
+			self.targets = csr.targets.tolist()
+			self.weights = csr.weights.tolist()
+			self.edges = csr.edges
+
+	def index_of(self, node):
+		try:
+			return self.index[id(node)]
+		except KeyError:
+			raise ValueError('node is not in the graph') from None
+
+	def sources(self):
+		"""Return the node index at which every slot starts"""
+		sources = []
+		for i in range(len(self.nodes)):
+			sources += [i] * (self.offsets[i+1] - self.offsets[i])
+		return sources
+
+	def check_weights(self, negative):
+		for w in self.weights:
+			if w is None or w != w:
+				raise ValueError('every edge needs a numeric weight, pass weight= to provide one')
+			if w < 0 and not negative:
+				raise ValueError('negative edge weight {}, use bellman_ford or pass weight= to provide others'.format(w))
+
+	def finalize(self, on_finalize, u, k):
+		"""Call on_finalize with the edge in slot k, if any, and then with node u"""
+		if k >= 0:
+			on_finalize(self.edges[k])
+		on_finalize(self.nodes[u])
+
+	def results(self, dist, pred):
+		"""Return the dist and pred lists as dicts keyed by node"""
+		nodes = self.nodes
+		edges = self.edges
+		return ({nodes[i]:d for i,d in enumerate(dist)},
+				{nodes[i]:(edges[k] if k >= 0 else None) for i,k in enumerate(pred)})
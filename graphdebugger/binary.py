@@ -0,0 +1,241 @@
+"""Versioned binary graph file format which is read through mmap
+
+All values are little endian and every section starts on an 8 byte boundary. Nodes and edges are identified
+	by their index, which follows the order of Graph.nodes and Graph.edges.
+
+	header      magic b'VGDB', version u16, flags u16, node count u64, edge count u64, label count u64.
+				Flag INT_WEIGHTS, or INT_FLOWS, is set when every weight, or flow, is an int or None, and
+				INT_COORDS when every node coordinate is an int
+	node_x      f8[nodes], read back as ints when INT_COORDS is set
+	node_y      f8[nodes]
+	edge_weight f8[edges], None is stored as NaN
+	edge_flow   f8[edges], None is stored as NaN. Read back as ints when their flag is set
+	edge_src    u4[edges]
+	edge_targ   u4[edges]
+	node_color  u1[nodes], the value of the node's Color
+	edge_color  u1[edges]
+	label_node  u4[labels], node index of each entry of Graph.labels
+	label_offs  u8[nodes + labels + 1], non decreasing offsets into the string table of every node label,
+				then every Graph.labels key. The last one is the size of the string table
+	strings     utf-8 string table
+
+Opening a file with GraphFile maps it into memory and exposes the columns as memoryviews, without creating
+	any Node or Edge objects until to_graph is called.
+"""
+
+from graphdebugger.Graph import Graph
+
+from array import array
+import itertools
+import math
+import mmap
+import struct
+import sys
+
+
+MAGIC = b'VGDB'
+VERSION = 1
+EXTENSION = '.vgb'
+
+#header flags
+INT_WEIGHTS = 1
+INT_FLOWS = 2
+INT_COORDS = 4
+
+_header = struct.Struct('<4sHHQQQ')
+
+
+def _align(offset):
+	return (offset + 7) & ~7
+
+
+def _layout(n, m, k):
+	"""Return a dict mapping each section name to its (offset, count, format) in a file of the given size"""
+	layout = {}
+	offset = _align(_header.size)
+	for name, count, fmt, size in (('node_x', n, 'd', 8), ('node_y', n, 'd', 8),
+								   ('edge_weight', m, 'd', 8), ('edge_flow', m, 'd', 8),
+								   ('edge_src', m, 'I', 4), ('edge_targ', m, 'I', 4),
+								   ('node_color', n, 'B', 1), ('edge_color', m, 'B', 1),
+								   ('label_node', k, 'I', 4), ('label_offs', n + k + 1, 'Q', 8)):
+		layout[name] = (offset, count, fmt)
+		offset = _align(offset + count * size)
+	layout['strings'] = (offset, None, 'B')
+	return layout
+
+
+def is_binary_graph(file):
+	"""Return True if the provided file starts with the magic bytes of this format"""
+	try:
+		with open(file, 'rb') as f:
+			return f.read(len(MAGIC)) == MAGIC
+	except OSError:
+		return False
+
+
+def write_graph(graph, file):
+	"""Write the provided graph to a file in the binary format
+
+	args:
+		graph(Graph): graph to write
+		file(str): filename to write graph to
+	"""
+	nodes = list(graph.nodes)
+	edges = list(graph.edges)
+	index = {id(n):i for i,n in enumerate(nodes)}
+	labels = [(label, index[id(n)]) for label, n in graph.labels.items() if id(n) in index]
+	n, m, k = len(nodes), len(edges), len(labels)
+
+	strings = bytearray()
+	offsets = [0]
+	for s in [x.label or '' for x in nodes] + [label for label,_ in labels]:
+		strings += s.encode('utf-8')
+		offsets.append(len(strings))
+
+	columns = {
+		'node_x':[float(x.x) for x in nodes],
+		'node_y':[float(x.y) for x in nodes],
+		'edge_weight':[_to_double(e.weight) for e in edges],
+		'edge_flow':[_to_double(e.flow) for e in edges],
+		'edge_src':[index[id(e.src)] for e in edges],
+		'edge_targ':[index[id(e.targ)] for e in edges],
+		'node_color':[x.color.value for x in nodes],
+		'edge_color':[e.color.value for e in edges],
+		'label_node':[i for _,i in labels],
+		'label_offs':offsets,
+	}
+
+	flags = 0
+	if _all_ints(e.weight for e in edges):
+		flags |= INT_WEIGHTS
+	if _all_ints(e.flow for e in edges):
+		flags |= INT_FLOWS
+	if _all_ints(itertools.chain((x.x for x in nodes), (x.y for x in nodes))):
+		flags |= INT_COORDS
+
+	with open(file, 'wb') as out:
+		out.write(_header.pack(MAGIC, VERSION, flags, n, m, k))
+		for name, (offset, count, fmt) in _layout(n, m, k).items():
+			out.write(b'\0' * (offset - out.tell()))
+			if name == 'strings':
+				out.write(strings)
+			else:
+				array(fmt, columns[name]).tofile(out)
+
+
+def read_graph(file):
+	"""Read a graph from a file in the binary format and return the graph object"""
+	with GraphFile(file) as f:
+		return f.to_graph()
+
+
+class GraphFile:
+	"""A memory mapped graph file in the binary format
+
+	The columns of the file are available as read only memoryviews named after their section, such as
+		node_x or edge_src. Node and Edge objects are only created by to_graph.
+	"""
+
+	def __init__(self, file):
+		"""Open and map the provided file. Raises ValueError if it is not a supported graph file"""
+		if sys.byteorder != 'little':
+			raise ValueError('reading binary graph files requires a little endian machine')
+		self._file = open(file, 'rb')
+		try:
+			self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+		except ValueError:
+			self._file.close()
+			raise ValueError('{} is empty'.format(file))
+		self._views = []
+		if len(self._mmap) < _header.size:
+			self.close()
+			raise ValueError('{} is a truncated VGDB file'.format(file))
+		magic, version, flags, n, m, k = _header.unpack_from(self._mmap)
+		if magic != MAGIC:
+			self.close()
+			raise ValueError('{} is not a binary graph file'.format(file))
+		if version > VERSION:
+			self.close()
+			raise ValueError('{} uses version {} of the binary graph format, only up to {} is supported'.format(file, version, VERSION))
+		layout = _layout(n, m, k)
+		if len(self._mmap) < layout['strings'][0]:
+			self.close()
+			raise ValueError('{} is a truncated VGDB file'.format(file))
+		self.version = version
+		self.flags = flags
+		self.num_nodes = n
+		self.num_edges = m
+		self.num_labels = k
+
+		buf = memoryview(self._mmap)
+		self._views.append(buf)
+		for name, (offset, count, fmt) in layout.items():
+			if name == 'strings':
+				view = buf[offset:]
+			else:
+				view = buf[offset:offset + count * struct.calcsize(fmt)].cast(fmt)
+			self._views.append(view)
+			setattr(self, name, view)
+
+		offsets = self.label_offs.tolist()
+		if offsets[-1] > len(self.strings):
+			self.close()
+			raise ValueError('{} is a truncated VGDB file'.format(file))
+		if any(a > b for a, b in zip(offsets, itertools.islice(offsets, 1, None))):
+			self.close()
+			raise ValueError('{} has invalid label offsets'.format(file))
+
+	def node_label(self, i):
+		"""Return the label of the node with index i"""
+		return self._string(i)
+
+	def labels(self):
+		"""Return a dict mapping every entry of Graph.labels to its node index"""
+		n = self.num_nodes
+		return {self._string(n + j):self.label_node[j] for j in range(self.num_labels)}
+
+	def _string(self, j):
+		return bytes(self.strings[self.label_offs[j]:self.label_offs[j+1]]).decode('utf-8')
+
+	def to_graph(self):
+		"""Create and return the Graph stored in this file"""
+		n = self.num_nodes
+		int_weights = self.flags & INT_WEIGHTS
+		int_flows = self.flags & INT_FLOWS
+		xs, ys = self.node_x, self.node_y
+		if self.flags & INT_COORDS:
+			xs, ys = [int(x) for x in xs], [int(y) for y in ys]
+		return Graph.from_columns(xs, ys, self.edge_src, self.edge_targ,
+								  weights=[_from_double(w, int_weights) for w in self.edge_weight],
+								  flows=[_from_double(f, int_flows) for f in self.edge_flow],
+								  node_colors=self.node_color, edge_colors=self.edge_color,
+								  node_labels=[self._string(i) for i in range(n)],
+								  labels=self.labels())
+
+	def close(self):
+		for view in reversed(self._views):
+			view.release()
+		self._views = []
+		self._mmap.close()
+		self._file.close()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *args):
+		self.close()
+
+
+def _to_double(value):
+	return math.nan if value is None else float(value)
+
+
+def _from_double(value, integer=False):
+	if value != value:
+		return None
+	return int(value) if integer else value
+
+
+def _all_ints(values):
+	"""Return True if every value is None or an int which a double holds exactly"""
+	return all(v is None or (type(v) is int and abs(v) <= 2**53) for v in values)
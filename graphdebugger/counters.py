@@ -0,0 +1,132 @@
+"""Optional counters of how many times a running script reads or writes each node and edge
+
+Reads are the accesses to out, inc, adj and adj_edges of a node and to weight and flow of an edge. Writes
+	are the assignments to color of nodes and edges and to weight and flow of edges. While counting, the
+	descriptors of these attributes on the Node and Edge classes are swapped for counting wrappers, which
+	are swapped back once counting stops, so there is no cost at all when no counter is running.
+
+Only accesses made from the thread which started the counter are counted, so the GUI redrawing the graph
+	does not show up in the counts.
+"""
+
+from graphdebugger.Graph import Edge, Node
+
+from contextlib import contextmanager
+import csv
+import threading
+
+
+class AccessCounter:
+	"""Counts the reads and writes of every node and edge between start and stop
+
+	After stopping, reads and writes map each element to its number of reads and writes. Only one counter
+		can run at a time.
+	"""
+
+	node_reads = ('out', 'inc', 'adj', 'adj_edges')
+	node_writes = ('color',)
+	edge_reads = ('weight', 'flow')
+	edge_writes = ('color', 'weight', 'flow')
+
+	#the counter which is currently running, if any
+	active = None
+
+	def __init__(self):
+		self.reads = {}
+		self.writes = {}
+		self.thread = None
+		self.saved = []
+
+	def start(self):
+		"""Start counting accesses made from the calling thread. Raises RuntimeError if another counter runs"""
+		if AccessCounter.active is not None:
+			raise RuntimeError('another AccessCounter is already running')
+		AccessCounter.active = self
+		self.thread = threading.get_ident()
+		for cls, reads, writes in ((Node, AccessCounter.node_reads, AccessCounter.node_writes),
+								   (Edge, AccessCounter.edge_reads, AccessCounter.edge_writes)):
+			for name in dict.fromkeys(reads + writes):
+				descriptor = cls.__dict__[name]
+				self.saved.append((cls, name, descriptor))
+				setattr(cls, name, _Counted(descriptor, self.reads if name in reads else None,
+											self.writes if name in writes else None, self))
+
+	def stop(self):
+		"""Stop counting and restore the original attributes of Node and Edge"""
+		for cls, name, descriptor in reversed(self.saved):
+			setattr(cls, name, descriptor)
+		self.saved = []
+		self.thread = None
+		if AccessCounter.active is self:
+			AccessCounter.active = None
+
+	@contextmanager
+	def suspended(self):
+		"""Context manager which stops counting accesses from every thread while it is active"""
+		thread = self.thread
+		self.thread = None
+		try:
+			yield self
+		finally:
+			self.thread = thread
+
+	def totals(self):
+		"""Return a dict mapping every accessed element to its number of reads and writes combined"""
+		totals = dict(self.reads)
+		for x, n in self.writes.items():
+			totals[x] = totals.get(x, 0) + n
+		return totals
+
+	def write_csv(self, graph, file):
+		"""Write the counts of every node and edge of graph to a CSV file
+
+		Nodes and edges are identified by their index in graph.nodes and graph.edges, and edges also list
+			the indices of their ends.
+
+		args:
+			graph(Graph): graph whose elements are written
+			file(str): filename to write the counts to
+		"""
+		index = {id(n):i for i,n in enumerate(graph.nodes)}
+		with open(file, 'w', newline='') as out:
+			writer = csv.writer(out)
+			writer.writerow(['kind', 'index', 'label', 'source', 'target', 'reads', 'writes', 'total'])
+			for i, n in enumerate(graph.nodes):
+				reads, writes = self.reads.get(n, 0), self.writes.get(n, 0)
+				writer.writerow(['node', i, n.label, '', '', reads, writes, reads + writes])
+			for i, e in enumerate(graph.edges):
+				reads, writes = self.reads.get(e, 0), self.writes.get(e, 0)
+				writer.writerow(['edge', i, '', index.get(id(e.src), ''), index.get(id(e.targ), ''),
+								 reads, writes, reads + writes])
+
+	def __enter__(self):
+		self.start()
+		return self
+
+	def __exit__(self, *args):
+		self.stop()
+
+
+class _Counted:
+	"""Wraps the descriptor of an attribute to count its reads and writes per instance"""
+
+	__slots__ = ('descriptor', 'reads', 'writes', 'counter')
+
+	def __init__(self, descriptor, reads, writes, counter):
+		self.descriptor = descriptor
+		self.reads = reads
+		self.writes = writes
+		self.counter = counter
+
+	def __get__(self, obj, cls=None):
+		if obj is not None and self.reads is not None and self.counter.thread == threading.get_ident():
+			self.reads[obj] = self.reads.get(obj, 0) + 1
+		return self.descriptor.__get__(obj, cls)
+
+	def __set__(self, obj, value):
+		if self.writes is not None and self.counter.thread == threading.get_ident():
+			self.writes[obj] = self.writes.get(obj, 0) + 1
+		self.descriptor.__set__(obj, value)
+
+	def __delete__(self, obj):
+		self.descriptor.__delete__(obj)
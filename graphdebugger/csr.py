@@ -0,0 +1,237 @@
+"""Compressed sparse row snapshots of a Graph with NumPy algorithm kernels
+
+Requires NumPy, which can be installed along with this package using the 'fast' extra.
+"""
+
+import math
+
+import numpy as np
+
+
+class CSRGraph:
+	"""A frozen compressed sparse row (CSR) snapshot of a Graph
+
+	The outgoing edges of the node with index i are stored in the slots offsets[i]:offsets[i+1] of the
+		targets, weights and flows arrays. Node indices follow the order of Graph.nodes and the Node
+		object for an index can be found in nodes, while edges[k] is the Edge stored in slot k.
+
+	The snapshot does not follow later changes to the graph. Results computed on the snapshot can be
+		written back onto the original Node and Edge objects using write_nodes and write_edges.
+	"""
+
+	def __init__(self, graph, undirected=False):
+		"""Create a CSR snapshot of the provided graph
+
+		args:
+			graph(Graph): graph to take a snapshot of
+			undirected(bool): store every edge in both directions. Default = False
+		"""
+		self.nodes = list(graph.nodes)
+		self.index = {n:i for i,n in enumerate(self.nodes)}
+		self.undirected = undirected
+
+		edges = [e for e in graph.edges if e.src in self.index and e.targ in self.index]
+		m = len(edges)
+		src = np.fromiter((self.index[e.src] for e in edges), dtype=np.int64, count=m)
+		targ = np.fromiter((self.index[e.targ] for e in edges), dtype=np.int64, count=m)
+		weights = np.fromiter((_number(e.weight) for e in edges), dtype=np.float64, count=m)
+		flows = np.fromiter((_number(e.flow) for e in edges), dtype=np.float64, count=m)
+		ids = np.arange(m, dtype=np.int64)
+
+		if undirected:
+			src, targ = np.concatenate((src, targ)), np.concatenate((targ, src))
+			weights = np.concatenate((weights, weights))
+			flows = np.concatenate((flows, flows))
+			ids = np.concatenate((ids, ids))
+
+		order = np.argsort(src, kind='stable')
+		n = len(self.nodes)
+
+		self.offsets = np.zeros(n + 1, dtype=np.int64)
+		np.cumsum(np.bincount(src, minlength=n), out=self.offsets[1:])
+		self.sources = src[order]
+		self.targets = targ[order]
+		self.weights = weights[order]
+		self.flows = flows[order]
+		self.edge_ids = ids[order]
+		self.edges = [edges[k] for k in self.edge_ids.tolist()]
+
+	@property
+	def num_nodes(self):
+		return len(self.nodes)
+
+	@property
+	def num_edges(self):
+		return len(self.targets)
+
+	def neighbors(self, i):
+		"""Return the array of node indices reachable from node index i by a single edge"""
+		return self.targets[self.offsets[i]:self.offsets[i+1]]
+
+	def _expand(self, frontier):
+		"""Return the CSR slots of all edges leaving the nodes in frontier"""
+		starts = self.offsets[frontier]
+		counts = self.offsets[frontier + 1] - starts
+		total = int(counts.sum())
+		if total == 0:
+			return np.empty(0, dtype=np.int64)
+		shift = np.repeat(starts - np.cumsum(counts) + counts, counts)
+		return shift + np.arange(total, dtype=np.int64)
+
+	def bfs_levels(self, source):
+		"""Return an array holding the BFS level of every node starting from source
+
+		Unreachable nodes have level -1.
+
+		args:
+			source(Node,int): node, or node index, to start the search from
+		"""
+		source = self._node_index(source)
+		levels = np.full(self.num_nodes, -1, dtype=np.int64)
+		levels[source] = 0
+		frontier = np.array([source], dtype=np.int64)
+		level = 0
+		while frontier.size:
+			level += 1
+			reached = np.unique(self.targets[self._expand(frontier)])
+			frontier = reached[levels[reached] < 0]
+			levels[frontier] = level
+		return levels
+
+	def degree_stats(self):
+		"""Return a dict with the out and in degree arrays of all nodes along with summary statistics"""
+		out_degree = np.diff(self.offsets)
+		in_degree = np.bincount(self.targets, minlength=self.num_nodes)
+		stats = {'out_degree':out_degree, 'in_degree':in_degree}
+		for name, degree in (('out', out_degree), ('in', in_degree)):
+			if degree.size:
+				stats[name + '_min'] = int(degree.min())
+				stats[name + '_max'] = int(degree.max())
+				stats[name + '_mean'] = float(degree.mean())
+		return stats
+
+	def connected_components(self):
+		"""Return an array assigning a component id to every node, ignoring edge direction
+
+		Component ids are the smallest node index in each component.
+		"""
+		labels = np.arange(self.num_nodes, dtype=np.int64)
+		while True:
+			previous = labels
+			labels = labels.copy()
+			np.minimum.at(labels, self.sources, previous[self.targets])
+			np.minimum.at(labels, self.targets, previous[self.sources])
+			#pointer jumping to shortcut long chains of labels
+			while True:
+				jumped = labels[labels]
+				if np.array_equal(jumped, labels):
+					break
+				labels = jumped
+			if np.array_equal(labels, previous):
+				return labels
+
+	def relax(self, dist):
+		"""Relax every edge once and return the new distance array along with a mask of improved nodes
+
+		args:
+			dist(ndarray): current distance estimate of every node
+		"""
+		new = dist.copy()
+		np.minimum.at(new, self.targets, dist[self.sources] + self.weights)
+		return new, new < dist
+
+	def shortest_paths(self, source, max_sweeps=None):
+		"""Return the distance array and predecessor slot array of a Bellman-Ford search from source
+
+		The predecessor of an unreached node, or of source itself, is -1. Otherwise it is the CSR slot
+			of the edge used to reach the node, see edges. Raises ValueError on a negative cycle.
+
+		args:
+			source(Node,int): node, or node index, to start the search from
+			max_sweeps(int): maximum number of relaxation sweeps. Default = number of nodes
+		"""
+		source = self._node_index(source)
+		dist = np.full(self.num_nodes, math.inf)
+		dist[source] = 0
+		pred = np.full(self.num_nodes, -1, dtype=np.int64)
+		sweeps = max_sweeps if max_sweeps is not None else self.num_nodes
+		for _ in range(sweeps):
+			new, improved = self.relax(dist)
+			if not improved.any():
+				break
+			#only an edge which strictly improved its target becomes its predecessor, so that tight edges
+			#on zero weight cycles can not make the predecessors loop
+			slots = np.flatnonzero(improved[self.targets])
+			slots = slots[dist[self.sources[slots]] + self.weights[slots] == new[self.targets[slots]]]
+			pred[self.targets[slots]] = slots
+			dist = new
+		else:
+			if max_sweeps is None and self.relax(dist)[1].any():
+				raise ValueError('graph contains a negative cycle reachable from the source')
+		return dist, pred
+
+	def write_nodes(self, colors=None, labels=None):
+		"""Write per node results back onto the Node objects of the graph in a single pass
+
+		The new values are compared with the current ones as arrays, and only the nodes whose values differ
+			are set, so observers and the scene only hear of real changes.
+
+		args:
+			colors(sequence[Color]): color for every node index, entries of None are left unchanged. Default = None
+			labels(sequence[str]): label for every node index, entries of None are left unchanged. Default = None
+		"""
+		_write(self.nodes, 'color', colors)
+		_write(self.nodes, 'label', labels)
+
+	def write_edges(self, colors=None, flows=None):
+		"""Write per slot results back onto the Edge objects of the graph in a single pass
+
+		Like write_nodes, only the edges whose values differ from the current ones are set.
+
+		args:
+			colors(sequence[Color]): color for every CSR slot, entries of None are left unchanged. Default = None
+			flows(sequence[float]): flow for every CSR slot, NaN or None entries are left unchanged. Default = None
+		"""
+		_write(self.edges, 'color', colors)
+		if flows is None:
+			return
+		values = np.asarray(flows, dtype=object).tolist()
+		new = np.array([_number(f) for f in values], dtype=np.float64)
+		old = np.fromiter((_number(e.flow) for e in self.edges), dtype=np.float64, count=len(self.edges))
+		for k in np.flatnonzero(~np.isnan(new) & (new != old)).tolist():
+			self.edges[k].flow = values[k]
+
+	def color_nodes(self, mask, color):
+		"""Set the color of every node selected by the boolean mask"""
+		for i in np.flatnonzero(mask).tolist():
+			if self.nodes[i].color is not color:
+				self.nodes[i].color = color
+
+	def color_edges(self, mask, color):
+		"""Set the color of every edge whose CSR slot is selected by the boolean mask"""
+		for k in np.flatnonzero(mask).tolist():
+			if self.edges[k].color is not color:
+				self.edges[k].color = color
+
+	def _node_index(self, n):
+		return n if isinstance(n, (int, np.integer)) else self.index[n]
+
+
+def _number(value):
+	return math.nan if value is None else value
+
+
+def _write(elements, attr, values):
+	"""Set attr on the elements whose new value is not None and differs from the current one"""
+	if values is None:
+		return
+	new = _objects(values)
+	old = _objects([getattr(x, attr) for x in elements])
+	for i in np.flatnonzero((new != None) & (new != old)).tolist():
+		setattr(elements[i], attr, new[i])
+
+
+def _objects(values):
+	array = np.empty(len(values), dtype=object)
+	array[:] = values.tolist() if isinstance(values, np.ndarray) else list(values)
+	return array
@@ -0,0 +1,277 @@
+"""Seeded generators of large synthetic graphs for load and scale testing
+
+Every generator draws its edges as arrays of node indices with NumPy and builds the graph in a single pass
+	with Graph.from_columns, so no observers, graphic items or add_edge calls are involved. Weights, and
+	the capacities of flow networks, are random integers between the bounds of the weights argument,
+	inclusive. The same seed always gives the same graph.
+
+Nodes are placed where the structure of the graph suggests: on a grid, in the levels of a tree or in the
+	layers of a DAG or flow network. Random graphs have no such structure and are placed like imported
+	graphs without coordinates, on a circle when small and on a grid otherwise, ready for View > Auto
+	Layout. The first node is labeled 'source' and the last one 'target', as expected by the samples.
+
+Requires NumPy, which can be installed along with this package using the 'fast' extra.
+"""
+
+from graphdebugger.Graph import Graph, Node
+from graphdebugger.importers import auto_positions
+
+import math
+
+import numpy as np
+
+
+#distance between neighboring nodes
+spacing = 4 * Node.radius
+
+
+def erdos_renyi(n, m=None, p=None, directed=True, weights=(1, 10), seed=None):
+	"""Return a uniformly random graph with n nodes and either m edges or an edge between any two nodes with probability p
+
+	args:
+		n(int): number of nodes
+		m(int): number of edges. Default = None, which uses p, or 2 * n edges if p is None as well
+		p(float): probability of every possible edge. Default = None
+		directed(bool): allow edges in both directions between two nodes. Default = True
+		weights(tuple[int,int]): bounds of the edge weights. Default = (1, 10)
+		seed(int): random seed. Default = None
+	"""
+	rng = np.random.default_rng(seed)
+	possible = n * (n - 1) if directed else n * (n - 1) // 2
+	if m is None:
+		m = rng.binomial(possible, p) if p is not None else min(2 * n, possible)
+	sources, targets = _distinct_pairs(rng, n, m, directed)
+	return _random_graph(rng, n, sources, targets, weights)
+
+
+def barabasi_albert(n, m=2, weights=(1, 10), seed=None):
+	"""Return a scale-free graph in which every new node links to m earlier nodes chosen by preferential attachment
+
+	Edges point from the newer node to the older one. Uses the algorithm of Batagelj and Brandes, which
+		is sequential by nature; its rare self loops and repeated edges are dropped afterwards, so the
+		graph can have slightly fewer than n * m edges.
+
+	args:
+		n(int): number of nodes
+		m(int): number of edges added with every node. Default = 2
+		weights(tuple[int,int]): bounds of the edge weights. Default = (1, 10)
+		seed(int): random seed. Default = None
+	"""
+	rng = np.random.default_rng(seed)
+	size = 2 * n * m
+	ends = [0] * size
+	draws = rng.random(n * m).tolist()
+	for k in range(n * m):
+		ends[2*k] = k // m
+		#every end so far, including the new node itself, is picked with equal probability
+		ends[2*k+1] = ends[int(draws[k] * (2*k + 1))]
+	ends = np.array(ends, dtype=np.int64)
+	sources, targets = ends[0::2], ends[1::2]
+	keep = sources != targets
+	sources, targets = _unique_pairs(sources[keep], targets[keep], n, directed=False)
+	return _random_graph(rng, n, np.maximum(sources, targets), np.minimum(sources, targets), weights)
+
+
+def grid(rows, cols=None, diagonals=False, weights=(1, 10), seed=None):
+	"""Return a rows by cols grid graph with edges pointing right and down, and down-right if diagonals is True
+
+	args:
+		rows(int): number of rows
+		cols(int): number of columns. Default = None, which makes a square grid
+		diagonals(bool): also link every node to the one below and to the right. Default = False
+		weights(tuple[int,int]): bounds of the edge weights. Default = (1, 10)
+		seed(int): random seed. Default = None
+	"""
+	cols = rows if cols is None else cols
+	rng = np.random.default_rng(seed)
+	index = np.arange(rows * cols, dtype=np.int64).reshape(rows, cols)
+	pairs = [(index[:,:-1], index[:,1:]), (index[:-1,:], index[1:,:])]
+	if diagonals:
+		pairs.append((index[:-1,:-1], index[1:,1:]))
+	sources = np.concatenate([s.ravel() for s, t in pairs])
+	targets = np.concatenate([t.ravel() for s, t in pairs])
+	xs = spacing * (1 + index % cols)
+	ys = spacing * (1 + index // cols)
+	return _build(rng, xs.ravel(), ys.ravel(), sources, targets, weights)
+
+
+def tree(n, branching=2, weights=(1, 10), seed=None):
+	"""Return a tree of n nodes with edges pointing from parents to children, drawn level by level
+
+	args:
+		n(int): number of nodes
+		branching(int): number of children of every inner node of a complete tree. Default = 2. None
+			gives a random recursive tree instead, where every node is the child of a uniformly chosen
+			earlier node
+		weights(tuple[int,int]): bounds of the edge weights. Default = (1, 10)
+		seed(int): random seed. Default = None
+	"""
+	rng = np.random.default_rng(seed)
+	children = np.arange(1, n, dtype=np.int64)
+	if branching is None:
+		parents = (rng.random(n - 1) * children).astype(np.int64)
+	else:
+		parents = (children - 1) // branching
+
+	#place the levels one below the other, keeping the children of a node in the order of their parents
+	xs = np.zeros(n)
+	ys = np.zeros(n)
+	rank = np.zeros(n, dtype=np.int64)
+	in_level = np.zeros(n, dtype=bool)
+	level = np.zeros(1, dtype=np.int64)
+	depth = 0
+	while len(level):
+		order = level if depth == 0 else level[np.lexsort((level, rank[parents[level-1]]))]
+		rank[order] = np.arange(len(order))
+		xs[order] = spacing * (np.arange(len(order)) - (len(order) - 1) / 2)
+		ys[order] = spacing * (1 + 2 * depth)
+		in_level[:] = False
+		in_level[level] = True
+		level = children[in_level[parents]]
+		depth += 1
+	xs += spacing - xs.min()
+	return _build(rng, xs, ys, parents, children, weights)
+
+
+def dag(n, m=None, layers=None, weights=(1, 10), seed=None):
+	"""Return a random directed acyclic graph whose nodes are split into layers and whose edges point to later layers
+
+	args:
+		n(int): number of nodes
+		m(int): number of edges. Default = None, which gives 2 * n edges, or as many as possible
+		layers(int): number of layers. Default = None, which uses the square root of n
+		weights(tuple[int,int]): bounds of the edge weights. Default = (1, 10)
+		seed(int): random seed. Default = None
+	"""
+	rng = np.random.default_rng(seed)
+	layers = max(1, min(n, layers or round(math.sqrt(n))))
+	layer = np.arange(n, dtype=np.int64) * layers // n
+	sizes = np.bincount(layer, minlength=layers)
+	possible = (n * n - int((sizes * sizes).sum())) // 2
+	m = min(2 * n, possible) if m is None else m
+	#node indices grow with the layers, so the smaller index of a pair is in the earlier layer
+	sources, targets = _distinct_pairs(rng, n, m, False, lambda s, t : layer[s] != layer[t], possible)
+	xs, ys = _layered_positions(layer, sizes)
+	return _build(rng, xs, ys, sources, targets, weights)
+
+
+def flow_network(layers, width, degree=3, weights=(1, 20), seed=None):
+	"""Return a layered flow network from a 'source' node, through layers of width nodes, to a 'target' node
+
+	The source links to every node of the first layer and every node of the last layer links to the
+		target. Every other node links to degree random nodes of the next layer, with repeats dropped.
+		Edge weights are the capacities.
+
+	args:
+		layers(int): number of layers between the source and the target
+		width(int): number of nodes in every layer
+		degree(int): number of links from every node to the next layer. Default = 3
+		weights(tuple[int,int]): bounds of the capacities. Default = (1, 20)
+		seed(int): random seed. Default = None
+	"""
+	rng = np.random.default_rng(seed)
+	n = layers * width + 2
+	inner = np.arange(1, n - 1, dtype=np.int64)
+	first, last = inner[:width], inner[-width:]
+	links = inner[:-width].repeat(degree)
+	next_layer = ((links - 1) // width + 1) * width + 1
+	sources, targets = _unique_pairs(links, next_layer + rng.integers(0, width, len(links)), n, directed=True)
+	sources = np.concatenate([np.zeros(width, dtype=np.int64), sources, last])
+	targets = np.concatenate([first, targets, np.full(width, n - 1, dtype=np.int64)])
+	layer = np.concatenate([[0], (inner - 1) // width + 1, [layers + 1]])
+	xs, ys = _layered_positions(layer, np.bincount(layer), horizontal=True)
+	return _build(rng, xs, ys, sources, targets, weights)
+
+
+GENERATORS = {
+	'erdos_renyi':erdos_renyi,
+	'barabasi_albert':barabasi_albert,
+	'grid':grid,
+	'tree':tree,
+	'dag':dag,
+	'flow_network':flow_network,
+}
+
+
+def generate(kind, n, seed=None):
+	"""Return a graph of about n nodes made by the generator named kind, with its default parameters
+
+	Grids are square and flow networks have about as many layers as nodes per layer.
+
+	args:
+		kind(str): name of a generator in GENERATORS
+		n(int): number of nodes
+		seed(int): random seed. Default = None
+	"""
+	if kind not in GENERATORS:
+		raise ValueError('unknown generator: {}'.format(kind))
+	n = max(n, 2)
+	if kind == 'grid':
+		side = math.ceil(math.sqrt(n))
+		return grid(side, side, seed=seed)
+	if kind == 'flow_network':
+		layers = max(round(math.sqrt(n - 2)), 1)
+		return flow_network(layers, max((n - 2) // layers, 1), seed=seed)
+	return GENERATORS[kind](n, seed=seed)
+
+
+def _distinct_pairs(rng, n, m, directed, accept=None, possible=None):
+	"""Return arrays of the sources and targets of m distinct random pairs of different nodes
+
+	Undirected pairs have the smaller index first. Pairs are drawn in batches, so that only pairs for
+		which accept(sources, targets) is True are kept, until there are m different ones.
+	"""
+	if possible is None:
+		possible = n * (n - 1) if directed else n * (n - 1) // 2
+	if m > possible:
+		raise ValueError('a graph of {} nodes has room for at most {} edges, not {}'.format(n, possible, m))
+	codes = np.zeros(0, dtype=np.int64)
+	while len(codes) < m:
+		k = int(1.1 * (m - len(codes))) + 16
+		sources = rng.integers(0, n, k)
+		targets = rng.integers(0, n, k)
+		keep = sources != targets
+		if accept is not None:
+			keep &= accept(sources, targets)
+		sources, targets = sources[keep], targets[keep]
+		if not directed:
+			sources, targets = np.minimum(sources, targets), np.maximum(sources, targets)
+		codes = np.unique(np.concatenate([codes, sources * n + targets]))
+	codes = rng.permutation(codes)[:m]
+	return codes // n, codes % n
+
+
+def _unique_pairs(sources, targets, n, directed):
+	"""Drop repeated pairs, and pairs which repeat another in the opposite direction unless directed is True"""
+	if directed:
+		codes = sources * n + targets
+	else:
+		codes = np.minimum(sources, targets) * n + np.maximum(sources, targets)
+	_, first = np.unique(codes, return_index=True)
+	first.sort()
+	return sources[first], targets[first]
+
+
+def _layered_positions(layer, sizes, horizontal=False):
+	"""Return coordinates which place every layer on a line, centered, in the order of the nodes"""
+	offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+	along = np.arange(len(layer)) - offsets[layer] - (sizes[layer] - 1) / 2
+	along = spacing * (along - along.min() + 1)
+	across = 3 * spacing * (layer + 1)
+	return (across, along) if horizontal else (along, across)
+
+
+def _random_graph(rng, n, sources, targets, weights):
+	xs, ys = auto_positions(n)
+	return _build(rng, np.array(xs), np.array(ys), sources, targets, weights)
+
+
+def _build(rng, xs, ys, sources, targets, weights):
+	n = len(xs)
+	labels = [''] * n
+	labels[0] = 'source'
+	labels[-1] = 'target'
+	weights = rng.integers(weights[0], weights[1] + 1, len(sources)).tolist() if weights is not None else None
+	return Graph.from_columns(np.round(xs, 1).tolist(), np.round(ys, 1).tolist(), sources.tolist(),
+							  targets.tolist(), weights=weights, node_labels=labels,
+							  labels={'source':0, 'target':n - 1})
@@ -0,0 +1,112 @@
+"""Runs a script against a graph without the GUI, for batch runs in CI or on servers without a display
+
+The script runs at full speed, without tracing or rendering, with Graph.get_graph returning the loaded
+	graph. Changes to the color, label, weight and flow of nodes and edges are counted through
+	Graph.observers, and the final graph is written to a file once the script finishes.
+"""
+
+from graphdebugger.Graph import Graph, Node
+
+from collections import Counter
+import os
+import runpy
+import sys
+import time
+import traceback
+
+try:
+	import resource
+except ImportError:
+	resource = None
+
+
+class HeadlessApp:
+	"""Stands in for the GraphApp so that Graph.get_graph returns the provided graph"""
+
+	def __init__(self, graph):
+		self.graph = graph
+
+	def get_graph(self):
+		return self.graph
+
+
+def run_headless(graph_file, script_file, output=None):
+	"""Run a script against the graph read from graph_file and return a dict of statistics about the run
+
+	The returned dict holds the wall time of the script in seconds ('time'), the peak resident memory of
+		the process in bytes or None where unavailable ('peak_memory'), a Counter of changes keyed by
+		element type and attribute such as 'node color' ('mutations'), the final number of nodes and
+		edges, and the formatted traceback if the script raised an exception ('error').
+
+	args:
+		graph_file(str,Graph): graph to load, in any format accepted by Graph.read_graph, or a Graph to run on
+		script_file(str): path of the script to run
+		output(str): file to write the final graph to, in the format given by its extension. Default = None,
+			which writes nothing
+	"""
+	graph = graph_file if isinstance(graph_file, Graph) else Graph.read_graph(graph_file)
+	mutations = Counter()
+
+	def count(element, attr, old, new):
+		mutations[('node ' if isinstance(element, Node) else 'edge ') + attr] += 1
+
+	previous_app = Graph.app
+	Graph.app = HeadlessApp(graph)
+	Graph.observers.append(count)
+	sys.path.insert(0, os.path.dirname(os.path.abspath(script_file)))
+	error = None
+	start = time.perf_counter()
+	try:
+		runpy.run_path(script_file, run_name='__main__')
+	except BaseException:
+		error = traceback.format_exc()
+	finally:
+		elapsed = time.perf_counter() - start
+		Graph.observers.remove(count)
+		Graph.app = previous_app
+		sys.path.pop(0)
+
+	if output is not None and error is None:
+		graph.write_graph(output)
+
+	return {
+		'time':elapsed,
+		'peak_memory':peak_memory(),
+		'mutations':mutations,
+		'nodes':len(graph.nodes),
+		'edges':len(graph.edges),
+		'error':error,
+	}
+
+
+def peak_memory():
+	"""Return the peak resident memory of this process in bytes, or None if it cannot be measured"""
+	if resource is None:
+		return None
+	peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	#ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+	return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def format_stats(stats):
+	"""Return a human readable report of the statistics returned by run_headless"""
+	lines = ['wall time: {:.3f} s'.format(stats['time'])]
+	if stats['peak_memory'] is not None:
+		lines.append('peak memory: {:.1f} MiB'.format(stats['peak_memory'] / 2**20))
+	mutations = stats['mutations']
+	lines.append('mutations: {}'.format(sum(mutations.values())))
+	for name, n in sorted(mutations.items()):
+		lines.append('  {}: {}'.format(name, n))
+	lines.append('final graph: {} nodes, {} edges'.format(stats['nodes'], stats['edges']))
+	return '\n'.join(lines)
+
+
+def main(graph_file, script_file, output=None):
+	"""Run the script, print its statistics and return the exit status of the run"""
+	stats = run_headless(graph_file, script_file, output)
+	if stats['error']:
+		print(stats['error'], file=sys.stderr, end='')
+	print(format_stats(stats))
+	if output is not None and not stats['error']:
+		print('graph written to {}'.format(output))
+	return 1 if stats['error'] else 0
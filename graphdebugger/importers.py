@@ -0,0 +1,323 @@
+"""Streaming importers for edge list, DIMACS and GraphML graph files
+
+Edge list and DIMACS files are read in chunks of whole lines, so memory use while parsing is bounded by
+	chunk_size no matter how large the file is. Files larger than parallel_threshold are split into chunks
+	which are parsed by a pool of worker processes. GraphML is parsed incrementally with iterparse.
+
+All formats build their graph with Graph.from_columns. Nodes without coordinates in the file are placed
+	automatically, on a circle for small graphs and on a grid otherwise.
+
+Supported formats:
+	edgelist    one 'u v [weight]' edge per line, separated by whitespace or commas. Lines starting with
+				# or % are comments, and a first line such as 'u,v,weight', whose weight is not a number,
+				is a header. Nodes are numbered in order of first appearance, and ids which are not
+				numbers become node labels
+	dimacs      DIMACS shortest path (p sp), max flow (p max) or edge (p edge) files. Arc weights and
+				capacities become edge weights, and the source and sink of a max flow problem are labeled
+				'source' and 'target'
+	graphml     GraphML, with node and edge data named x, y, label, weight (or capacity) and flow read
+"""
+
+from graphdebugger.Graph import Graph, Node
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+import math
+import multiprocessing
+import os
+import xml.etree.ElementTree as ET
+
+
+EXTENSIONS = {
+	'.txt':'edgelist', '.edges':'edgelist', '.el':'edgelist', '.csv':'edgelist', '.tsv':'edgelist',
+	'.dimacs':'dimacs', '.max':'dimacs', '.gr':'dimacs', '.col':'dimacs',
+	'.graphml':'graphml',
+}
+
+#filter string for file dialogs listing every supported format
+FILE_FILTER = ('Edge List (*.txt *.edges *.el *.csv *.tsv);;DIMACS Graph (*.dimacs *.max *.gr *.col);;'
+			   'GraphML (*.graphml)')
+
+chunk_size = 8 * 2**20
+parallel_threshold = 64 * 2**20
+
+
+def format_of(file):
+	"""Return the name of the format of the provided file based on its extension, or None if not supported"""
+	return EXTENSIONS.get(os.path.splitext(file)[1].lower())
+
+
+def import_graph(file, format=None, workers=None):
+	"""Read a graph from a file in one of the supported formats and return the graph object
+
+	args:
+		file(str): file to read
+		format(str): one of 'edgelist', 'dimacs' or 'graphml'. Default = None, which uses the file extension
+		workers(int): number of processes used to parse large edge list and DIMACS files. Default = None,
+			which uses one per CPU once the file is larger than parallel_threshold
+	"""
+	format = format or format_of(file)
+	if format == 'edgelist':
+		return read_edge_list(file, workers)
+	if format == 'dimacs':
+		return read_dimacs(file, workers)
+	if format == 'graphml':
+		return read_graphml(file)
+	raise ValueError('unsupported graph format: {}'.format(format))
+
+
+def read_edge_list(file, workers=None):
+	"""Read a graph from an edge list file and return the graph object
+
+	args:
+		file(str): file to read
+		workers(int): number of parsing processes. Default = None
+	"""
+	ids = {}
+	sources = array('q')
+	targets = array('q')
+	weights = []
+	for chunk in _read_chunks(file, 'edgelist', workers):
+		#ids are numbered in order of first appearance, which chunks preserve since they arrive in order
+		for u, v in zip(chunk.sources, chunk.targets):
+			sources.append(ids.setdefault(u, len(ids)))
+			targets.append(ids.setdefault(v, len(ids)))
+		weights += chunk.weights
+
+	#numeric ids are only an index in the file, labeling every node of a large graph with them would
+	#only clutter the scene and Graph.labels
+	labels = {u:i for u, i in ids.items() if not _is_number(u)}
+	node_labels = [''] * len(ids)
+	for u, i in labels.items():
+		node_labels[i] = u
+	xs, ys = auto_positions(len(ids))
+	return Graph.from_columns(xs, ys, sources, targets, weights=weights, node_labels=node_labels, labels=labels)
+
+
+def read_dimacs(file, workers=None):
+	"""Read a graph from a DIMACS file and return the graph object
+
+	args:
+		file(str): file to read
+		workers(int): number of parsing processes. Default = None
+	"""
+	num_nodes = 0
+	sources = array('q')
+	targets = array('q')
+	weights = []
+	labels = {}
+	for chunk in _read_chunks(file, 'dimacs', workers):
+		num_nodes = max(num_nodes, chunk.num_nodes)
+		sources += chunk.sources
+		targets += chunk.targets
+		weights += chunk.weights
+		labels.update(chunk.labels)
+	if sources:
+		num_nodes = max(num_nodes, max(sources) + 1, max(targets) + 1)
+
+	node_labels = [''] * num_nodes
+	for label, i in labels.items():
+		node_labels[i] = label
+	xs, ys = auto_positions(num_nodes)
+	return Graph.from_columns(xs, ys, sources, targets, weights=weights, node_labels=node_labels, labels=labels)
+
+
+def read_graphml(file):
+	"""Read a graph from a GraphML file and return the graph object
+
+	The file is parsed incrementally, and every node and edge element is removed from the tree as soon as
+		it has been read, so memory use does not grow with the number of elements.
+
+	args:
+		file(str): file to read
+	"""
+	keys = {}
+	ids = {}
+	xs = []
+	ys = []
+	node_labels = []
+	sources = array('q')
+	targets = array('q')
+	weights = []
+	flows = []
+
+	def node_index(node_id):
+		i = ids.get(node_id)
+		if i is None:
+			i = ids[node_id] = len(ids)
+			xs.append(None)
+			ys.append(None)
+			node_labels.append(node_id)
+		return i
+
+	#open elements, whose last entry is the parent of the element which just ended
+	open_elements = []
+	for event, elem in ET.iterparse(file, events=('start', 'end')):
+		if event == 'start':
+			open_elements.append(elem)
+			continue
+		open_elements.pop()
+		tag = _local_name(elem.tag)
+		if tag == 'key':
+			keys[elem.get('id')] = (elem.get('attr.name') or elem.get('id')).lower()
+		elif tag == 'node':
+			i = node_index(elem.get('id'))
+			data = _data(elem, keys)
+			xs[i] = _number(data['x']) if 'x' in data else None
+			ys[i] = _number(data['y']) if 'y' in data else None
+			if 'label' in data:
+				node_labels[i] = data['label']
+			_discard(elem, open_elements)
+		elif tag == 'edge':
+			sources.append(node_index(elem.get('source')))
+			targets.append(node_index(elem.get('target')))
+			data = _data(elem, keys)
+			weight = data.get('weight', data.get('capacity'))
+			weights.append(_number(weight) if weight is not None else -1)
+			flows.append(_number(data['flow']) if 'flow' in data else 0)
+			_discard(elem, open_elements)
+
+	if any(x is None for x in xs) or any(y is None for y in ys):
+		xs, ys = auto_positions(len(ids))
+	labels = {label:i for i, label in enumerate(node_labels) if label}
+	return Graph.from_columns(xs, ys, sources, targets, weights=weights, flows=flows, node_labels=node_labels,
+							  labels=labels)
+
+
+def auto_positions(n):
+	"""Return lists of x and y coordinates for n nodes, on a circle when n is small and on a grid otherwise"""
+	spacing = 4 * Node.radius
+	if n <= 32:
+		r = max(spacing * n / (2 * math.pi), spacing)
+		angles = [2 * math.pi * i / max(n, 1) for i in range(n)]
+		return ([round(r + spacing + r * math.cos(a)) for a in angles],
+				[round(r + spacing + r * math.sin(a)) for a in angles])
+	columns = math.ceil(math.sqrt(n))
+	return ([spacing * (1 + i % columns) for i in range(n)],
+			[spacing * (1 + i // columns) for i in range(n)])
+
+
+class _Chunk:
+	"""Edges and metadata parsed from one chunk of lines"""
+
+	def __init__(self, integer_ids):
+		self.sources = array('q') if integer_ids else []
+		self.targets = array('q') if integer_ids else []
+		self.weights = []
+		self.labels = {}
+		self.num_nodes = 0
+
+
+def _parse_edge_list(lines, first):
+	chunk = _Chunk(False)
+	for line in lines:
+		parts = line.replace(',', ' ').split()
+		if len(parts) < 2 or parts[0][0] in '#%':
+			continue
+		if first:
+			first = False
+			if len(parts) > 2 and not _is_number(parts[2]):
+				continue
+		chunk.sources.append(parts[0])
+		chunk.targets.append(parts[1])
+		chunk.weights.append(_number(parts[2]) if len(parts) > 2 else -1)
+	return chunk
+
+
+def _parse_dimacs(lines, first):
+	chunk = _Chunk(True)
+	for line in lines:
+		kind = line[:1]
+		if kind == 'a' or kind == 'e':
+			parts = line.split()
+			chunk.sources.append(int(parts[1]) - 1)
+			chunk.targets.append(int(parts[2]) - 1)
+			chunk.weights.append(_number(parts[3]) if len(parts) > 3 else -1)
+		elif kind == 'p':
+			chunk.num_nodes = int(line.split()[2])
+		elif kind == 'n':
+			parts = line.split()
+			if len(parts) > 2 and parts[2] in ('s', 't'):
+				chunk.labels['source' if parts[2] == 's' else 'target'] = int(parts[1]) - 1
+	return chunk
+
+
+_parsers = {'edgelist':_parse_edge_list, 'dimacs':_parse_dimacs}
+
+
+def _read_range(file, start, end, format):
+	"""Parse the lines in the byte range [start, end) of file, which must start and end on line boundaries"""
+	with open(file, 'rb') as f:
+		f.seek(start)
+		lines = f.read(end - start).decode('utf-8').splitlines()
+	return _parsers[format](lines, start == 0)
+
+
+def _ranges(file):
+	"""Split the file into byte ranges of roughly chunk_size which start and end on line boundaries"""
+	size = os.path.getsize(file)
+	ranges = []
+	start = 0
+	with open(file, 'rb') as f:
+		while start < size:
+			f.seek(min(start + chunk_size, size))
+			f.readline()
+			end = min(f.tell(), size)
+			ranges.append((start, end))
+			start = end
+	return ranges
+
+
+def _read_chunks(file, format, workers):
+	"""Yield the parsed chunks of file in order, using a process pool for large files"""
+	ranges = _ranges(file)
+	if workers is None:
+		workers = (os.cpu_count() or 1) if os.path.getsize(file) > parallel_threshold else 1
+	workers = min(workers, len(ranges))
+	if workers <= 1:
+		for start, end in ranges:
+			yield _read_range(file, start, end, format)
+		return
+
+	#only keep a bounded number of chunks in flight so that parsed results do not pile up in memory
+	with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+		pending = []
+		for start, end in ranges:
+			pending.append(pool.submit(_read_range, file, start, end, format))
+			if len(pending) >= 2 * workers:
+				yield pending.pop(0).result()
+		for future in pending:
+			yield future.result()
+
+
+def _local_name(tag):
+	return tag.rsplit('}', 1)[-1]
+
+
+def _data(elem, keys):
+	"""Return a dict of the data children of a GraphML node or edge, keyed by attribute name"""
+	return {keys.get(d.get('key'), d.get('key')):(d.text or '').strip()
+			for d in elem if _local_name(d.tag) == 'data'}
+
+
+def _discard(elem, open_elements):
+	"""Empty a parsed element and detach it from its parent"""
+	elem.clear()
+	if open_elements:
+		open_elements[-1].remove(elem)
+
+
+def _is_number(token):
+	try:
+		float(token)
+	except ValueError:
+		return False
+	return True
+
+
+def _number(token):
+	"""Return the int or float written in token"""
+	try:
+		return int(token)
+	except ValueError:
+		return float(token)
@@ -0,0 +1,290 @@
+"""Force-directed automatic layout of a Graph, vectorized with NumPy
+
+Uses the Fruchterman-Reingold model: every pair of nodes repels with force k²/d and the ends of every
+	edge attract with force d²/k, where k is the ideal edge length. Up to exact_limit nodes the repulsion
+	is computed between all pairs. Larger graphs use a grid approximation: repulsion is computed exactly
+	between nodes in neighboring cells of a fine grid of size 2k, while the other nodes are grouped into
+	the cells of a coarse grid, made of whole fine cells, which each repel as a single weighted node,
+	similar to one level of a Barnes-Hut tree. Every pair of nodes is counted exactly once. A weak pull
+	towards the center keeps disconnected parts together.
+
+Requires NumPy, which can be installed along with this package using the 'fast' extra.
+"""
+
+from graphdebugger.Graph import Node
+
+import math
+import time
+
+import numpy as np
+
+
+class ForceLayout:
+	"""Incremental force-directed layout of all or some of the nodes of a graph
+
+	Positions are kept in an array and only written back onto the Node objects by apply, so the layout
+		can run in a background thread while the graph is displayed. Nodes which are not laid out stay
+		where they are, but still push and pull the nodes which are.
+	"""
+
+	#largest number of nodes for which repulsion is computed between all pairs
+	exact_limit = 1000
+
+	#number of node pairs whose forces are computed at once, which bounds the memory used by a step
+	pair_chunk = 2**22
+
+	#number of cells along each side of the coarse grid used for the repulsion of distant nodes
+	far_cells = 32
+
+	cooling = 0.95
+	gravity = 0.02
+
+	def __init__(self, graph, nodes=None, spacing=6*Node.radius, seed=None):
+		"""Create a layout of the provided graph starting from the current positions of its nodes
+
+		Nodes being laid out which share their position with another node are moved by a small random
+			offset first, since forces cannot separate nodes at the same point.
+
+		args:
+			graph(Graph): graph to lay out
+			nodes(iterable[Node]): nodes to move. Default = None, which moves every node
+			spacing(float): ideal edge length. Default = 6 * Node.radius
+			seed(int): seed for the random offsets. Default = None
+		"""
+		self.nodes = list(graph.nodes)
+		index = {id(n):i for i,n in enumerate(self.nodes)}
+		edges = [e for e in graph.edges if e.src is not e.targ and id(e.src) in index and id(e.targ) in index]
+		self.sources = np.fromiter((index[id(e.src)] for e in edges), dtype=np.int64, count=len(edges))
+		self.targets = np.fromiter((index[id(e.targ)] for e in edges), dtype=np.int64, count=len(edges))
+		self.pos = np.array([(n.x, n.y) for n in self.nodes], dtype=np.float64).reshape(-1, 2)
+
+		if nodes is None:
+			self.movable = np.ones(len(self.nodes), dtype=bool)
+		else:
+			self.movable = np.zeros(len(self.nodes), dtype=bool)
+			self.movable[[index[id(n)] for n in nodes if id(n) in index]] = True
+		self.moved = [n for n, m in zip(self.nodes, self.movable.tolist()) if m]
+
+		self.k = float(spacing)
+		self.iteration = 0
+		moving = int(self.movable.sum())
+		self.temperature = self.k * max(math.sqrt(moving), 1)
+		self.min_temperature = self.k / 100
+
+		rng = np.random.default_rng(seed)
+		_, inverse, counts = np.unique(self.pos, axis=0, return_inverse=True, return_counts=True)
+		stacked = self.movable & (counts[inverse.reshape(-1)] > 1)
+		spread = self.k * max(math.sqrt(stacked.sum()), 1)
+		self.pos[stacked] += rng.uniform(-spread, spread, size=(int(stacked.sum()), 2))
+
+	@property
+	def converged(self):
+		return self.temperature <= self.min_temperature
+
+	def step(self):
+		"""Run a single iteration and return the largest distance a node moved"""
+		if not self.movable.any():
+			self.temperature = self.min_temperature
+			return 0.0
+
+		if len(self.nodes) <= ForceLayout.exact_limit:
+			disp = self._exact_repulsion()
+		else:
+			cells = np.floor(self.pos / (2 * self.k)).astype(np.int64)
+			cells -= cells.min(axis=0) - 1
+			disp = self._grid_repulsion(cells) + self._far_repulsion(cells)
+			disp += ForceLayout.gravity * (self.pos.mean(axis=0) - self.pos)
+
+		delta = self.pos[self.targets] - self.pos[self.sources]
+		dist = np.maximum(np.hypot(delta[:,0], delta[:,1]), 0.01)
+		pull = delta * (dist / self.k)[:,None]
+		_accumulate(disp, self.sources, pull)
+		_accumulate(disp, self.targets, -pull)
+
+		length = np.maximum(np.hypot(disp[:,0], disp[:,1]), 1e-9)
+		disp *= (np.minimum(length, self.temperature) / length)[:,None]
+		disp[~self.movable] = 0
+		self.pos += disp
+
+		self.temperature = max(self.temperature * ForceLayout.cooling, self.min_temperature)
+		self.iteration += 1
+		return float(np.minimum(length, self.temperature).max())
+
+	def run(self, iterations=None, callback=None, interval=0.05):
+		"""Step until the layout converges or iterations steps have run
+
+		args:
+			iterations(int): maximum number of steps. Default = None, which runs until converged
+			callback(callable): f(positions) -> bool, called at most once every interval seconds with a copy
+				of the positions of the moved nodes. The layout stops when it returns False. Default = None
+			interval(float): minimum number of seconds between calls to callback. Default = 0.05
+		"""
+		last = time.monotonic()
+		count = 0
+		while not self.converged and (iterations is None or count < iterations):
+			self.step()
+			count += 1
+			if callback is not None and time.monotonic() - last >= interval:
+				last = time.monotonic()
+				if callback(self.positions()) is False:
+					return
+
+	def positions(self):
+		"""Return a copy of the positions of the moved nodes, in the order of ForceLayout.moved"""
+		return self.pos[self.movable].copy()
+
+	def apply(self, positions=None):
+		"""Write positions onto the x and y of the moved nodes
+
+		args:
+			positions(ndarray): positions as returned by positions. Default = None, which uses the current ones
+		"""
+		if positions is None:
+			positions = self.positions()
+		if len(self.moved) == len(self.nodes) and len(positions):
+			#a full layout is moved next to the origin of the scene
+			positions = positions - positions.min(axis=0) + self.k
+		for n, (x, y) in zip(self.moved, positions.tolist()):
+			n.x = x
+			n.y = y
+
+	def _exact_repulsion(self):
+		n = len(self.nodes)
+		disp = np.zeros_like(self.pos)
+		k2 = self.k * self.k
+		rows = max(1, ForceLayout.pair_chunk // max(n, 1))
+		for start in range(0, n, rows):
+			delta = self.pos[start:start+rows,None,:] - self.pos[None,:,:]
+			d2 = (delta ** 2).sum(axis=2)
+			np.fill_diagonal(d2[:,start:], np.inf)
+			disp[start:start+rows] = (delta * (k2 / np.maximum(d2, 0.01))[:,:,None]).sum(axis=1)
+		return disp
+
+	def _grid_repulsion(self, cells):
+		"""Return the exact repulsion between the nodes of neighboring fine cells
+
+		args:
+			cells(ndarray): fine cell of every node, with coordinates starting at 1
+		"""
+		disp = np.zeros_like(self.pos)
+		k2 = self.k * self.k
+		height = int(cells[:,1].max()) + 2
+		keys = cells[:,0] * height + cells[:,1]
+
+		order = np.argsort(keys, kind='stable')
+		sorted_keys = keys[order]
+		unique, starts, counts = np.unique(sorted_keys, return_index=True, return_counts=True)
+
+		for dx in (-1, 0, 1):
+			for dy in (-1, 0, 1):
+				neighbor = keys + dx * height + dy
+				slot = np.minimum(np.searchsorted(unique, neighbor), len(unique) - 1)
+				found = unique[slot] == neighbor
+				nodes = np.flatnonzero(found)
+				first = starts[slot[nodes]]
+				count = counts[slot[nodes]]
+				#walk the nodes in batches so that at most pair_chunk pairs exist at once
+				bounds = np.searchsorted(np.cumsum(count), np.arange(0, count.sum(), ForceLayout.pair_chunk))
+				for b, end in zip(bounds, list(bounds[1:]) + [len(nodes)]):
+					i = np.repeat(nodes[b:end], count[b:end])
+					shift = np.repeat(first[b:end] - np.cumsum(count[b:end]) + count[b:end], count[b:end])
+					j = order[shift + np.arange(len(i))]
+					delta = self.pos[i] - self.pos[j]
+					d2 = (delta ** 2).sum(axis=1)
+					force = np.where(i == j, 0, k2 / np.maximum(d2, 0.01))
+					_accumulate(disp, i, delta * force[:,None])
+		return disp
+
+	def _far_repulsion(self, cells):
+		"""Return the repulsion of the nodes outside the neighboring fine cells of each node
+
+		Coarse cells more than one cell away act as a single node at their centroid, weighted by their
+			number of nodes, on the centroid of the cell of each node. The nodes of the coarse cell of a
+			node and of its neighbors, minus those of its neighboring fine cells which are repelled exactly
+			by _grid_repulsion, act as a single node per coarse cell on the node itself.
+
+		args:
+			cells(ndarray): fine cell of every node, with coordinates starting at 1
+		"""
+		k2 = self.k * self.k
+		#fine cells per side of a coarse cell, so that fine cells never straddle two coarse cells
+		ratio = max(int(cells.max()) // ForceLayout.far_cells + 1, 1)
+		coarse = cells // ratio + 1
+		height = int(coarse[:,1].max()) + 2
+		keys = coarse[:,0] * height + coarse[:,1]
+		unique, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+		inverse = inverse.reshape(-1)
+		sums = np.stack((np.bincount(inverse, weights=self.pos[:,0]),
+						 np.bincount(inverse, weights=self.pos[:,1])), axis=1)
+		centroids = sums / counts[:,None]
+		cell_xy = np.stack((unique // height, unique % height), axis=1)
+
+		#cells more than one cell apart, evaluated between centroids
+		dx = centroids[:,0,None] - centroids[None,:,0]
+		dy = centroids[:,1,None] - centroids[None,:,1]
+		near = (np.abs(cell_xy[:,0,None] - cell_xy[None,:,0]) <= 1) & (np.abs(cell_xy[:,1,None] - cell_xy[None,:,1]) <= 1)
+		weight = k2 * counts[None,:] / np.maximum(dx * dx + dy * dy, 0.01)
+		weight[near] = 0
+		disp = np.stack(((dx * weight).sum(axis=1), (dy * weight).sum(axis=1)), axis=1)[inverse]
+
+		#count and position sum of the neighboring fine cells of every node, by the coarse cell holding them
+		fine_height = int(cells[:,1].max()) + 2
+		fine_keys = cells[:,0] * fine_height + cells[:,1]
+		fine_unique, fine_inverse, fine_counts = np.unique(fine_keys, return_inverse=True, return_counts=True)
+		fine_inverse = fine_inverse.reshape(-1)
+		fine_sums = np.stack((np.bincount(fine_inverse, weights=self.pos[:,0]),
+							  np.bincount(fine_inverse, weights=self.pos[:,1])), axis=1)
+		n = len(self.pos)
+		excluded = np.zeros((n, 9))
+		excluded_sums = np.zeros((n, 9, 2))
+		rows = np.arange(n)
+		for dx in (-1, 0, 1):
+			for dy in (-1, 0, 1):
+				neighbor = fine_keys + dx * fine_height + dy
+				slot = np.minimum(np.searchsorted(fine_unique, neighbor), len(fine_unique) - 1)
+				found = fine_unique[slot] == neighbor
+				offset = (cells + (dx, dy)) // ratio + 1 - coarse
+				column = (offset[:,0] + 1) * 3 + offset[:,1] + 1
+				excluded[rows[found], column[found]] += fine_counts[slot[found]]
+				excluded_sums[rows[found], column[found]] += fine_sums[slot[found]]
+
+		#the rest of the coarse cell of every node and of its neighbors, evaluated at the node
+		for dx in (-1, 0, 1):
+			for dy in (-1, 0, 1):
+				column = (dx + 1) * 3 + dy + 1
+				neighbor = keys + dx * height + dy
+				slot = np.minimum(np.searchsorted(unique, neighbor), len(unique) - 1)
+				remaining = np.where(unique[slot] == neighbor, counts[slot] - excluded[:,column], 0)
+				nodes = np.flatnonzero(remaining > 0)
+				if not len(nodes):
+					continue
+				rest = remaining[nodes]
+				center = (sums[slot[nodes]] - excluded_sums[nodes, column]) / rest[:,None]
+				delta = self.pos[nodes] - center
+				#the remaining nodes lie outside the neighboring fine cells, so they are not closer than k on the whole
+				d2 = np.maximum((delta ** 2).sum(axis=1), k2)
+				_accumulate(disp, nodes, delta * (k2 * rest / d2)[:,None])
+		return disp
+
+
+def _accumulate(disp, indices, forces):
+	"""Add every row of forces onto the row of disp given by indices, which may repeat"""
+	n = len(disp)
+	disp[:,0] += np.bincount(indices, weights=forces[:,0], minlength=n)
+	disp[:,1] += np.bincount(indices, weights=forces[:,1], minlength=n)
+
+
+def force_layout(graph, nodes=None, iterations=None, spacing=6*Node.radius, seed=None):
+	"""Lay out the graph, or only the provided nodes of it, and write the new positions onto the nodes
+
+	args:
+		graph(Graph): graph to lay out
+		nodes(iterable[Node]): nodes to move. Default = None, which moves every node
+		iterations(int): maximum number of steps. Default = None, which runs until converged
+		spacing(float): ideal edge length. Default = 6 * Node.radius
+		seed(int): seed for the random offsets of stacked nodes. Default = None
+	"""
+	layout = ForceLayout(graph, nodes, spacing, seed)
+	layout.run(iterations)
+	layout.apply()
+	return layout
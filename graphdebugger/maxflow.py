@@ -0,0 +1,307 @@
+"""Maximum flow and minimum cut of a Graph, with Dinic's algorithm or push-relabel
+
+The capacities of the edges, read from Edge.weight, are copied into a residual network stored in flat
+	lists: edge k of the graph becomes the arc 2k with its capacity and the reverse arc 2k+1 with none,
+	and the arcs leaving each node are grouped together. Both algorithms are iterative, so they are not
+	limited by the recursion limit, and their running time does not depend on the capacity values.
+
+The flows are only written back onto the Edge objects by write_flows, in a single pass once the algorithm
+	is done, or after every phase from an on_phase callback to animate the algorithm in the debugger:
+
+	network = maxflow.max_flow(graph, s, t, on_phase=lambda network, phase: network.write_flows())
+	network.mark_min_cut()
+"""
+
+from graphdebugger.Graph import Color
+
+from collections import deque
+
+
+class FlowNetwork:
+	"""Residual network of a graph between a source and a sink
+
+	After running dinic or push_relabel, value holds the value of the maximum flow and flows the flow of
+		every edge, in the order of edges.
+	"""
+
+	#number of relabels, as a multiple of the number of nodes, between global relabels in push_relabel
+	global_relabel_rate = 1
+
+	def __init__(self, graph, source, sink, capacity=None):
+		"""Create the residual network of graph, with no flow on any edge
+
+		args:
+			graph(Graph): graph to compute a flow on
+			source(Node): node the flow leaves from
+			sink(Node): node the flow arrives at
+			capacity(callable): f(edge) -> capacity. Default = None, which uses Edge.weight
+		"""
+		self.nodes = list(graph.nodes)
+		index = {id(n):i for i,n in enumerate(self.nodes)}
+		if id(source) not in index or id(sink) not in index:
+			raise ValueError('source and sink must be nodes of the graph')
+		if source is sink:
+			raise ValueError('source and sink must be different nodes')
+		self.source = index[id(source)]
+		self.sink = index[id(sink)]
+		self.edges = [e for e in graph.edges if id(e.src) in index and id(e.targ) in index]
+
+		n = len(self.nodes)
+		self.head = head = []
+		self.residual = residual = []
+		self.capacity = []
+		counts = [0] * (n + 1)
+		for e in self.edges:
+			c = e.weight if capacity is None else capacity(e)
+			if c is None or c != c or c < 0:
+				raise ValueError('every edge needs a non-negative capacity, got {}'.format(c))
+			u, v = index[id(e.src)], index[id(e.targ)]
+			head += (v, u)
+			residual += (c, 0)
+			self.capacity.append(c)
+			counts[u] += 1
+			counts[v] += 1
+
+		#arc ids grouped by the node they leave, the arcs of node u are arcs[offsets[u]:offsets[u+1]]
+		self.offsets = offsets = [0] * (n + 1)
+		for u in range(n):
+			offsets[u+1] = offsets[u] + counts[u]
+		fill = offsets[:n]
+		self.arcs = arcs = [0] * len(head)
+		for a in range(len(head)):
+			#an arc leaves the head of its partner
+			u = head[a ^ 1]
+			arcs[fill[u]] = a
+			fill[u] += 1
+		self.value = 0
+
+	def flows(self):
+		"""Return the flow of every edge, in the order of edges"""
+		return self.residual[1::2]
+
+	def write_flows(self):
+		"""Set Edge.flow of every edge to its current flow, skipping edges whose flow did not change"""
+		for e, f in zip(self.edges, self.flows()):
+			if e.flow != f:
+				e.flow = f
+
+	def dinic(self, on_phase=None):
+		"""Compute a maximum flow with Dinic's algorithm and return its value
+
+		Each phase finds the distances from the source in the residual network and then saturates a
+			blocking flow made of shortest augmenting paths, found by an iterative depth first search
+			which never revisits an arc that led to a dead end.
+
+		args:
+			on_phase(callable): f(network, phase), called after the blocking flow of every phase. Default = None
+		"""
+		n = len(self.nodes)
+		s, t = self.source, self.sink
+		head, residual, arcs, offsets = self.head, self.residual, self.arcs, self.offsets
+		phase = 0
+		while True:
+			level = self._levels()
+			if level[t] < 0:
+				return self.value
+			current = offsets[:n]
+			path = []
+			u = s
+			while True:
+				if u == t:
+					pushed = min(residual[a] for a in path)
+					for a in path:
+						residual[a] -= pushed
+						residual[a ^ 1] += pushed
+					self.value += pushed
+					#retreat to the tail of the first saturated arc and search on from there
+					for i, a in enumerate(path):
+						if residual[a] == 0:
+							del path[i:]
+							u = head[a ^ 1]
+							break
+					continue
+				end = offsets[u+1]
+				i = current[u]
+				while i < end:
+					a = arcs[i]
+					if residual[a] > 0 and level[head[a]] == level[u] + 1:
+						break
+					i += 1
+				current[u] = i
+				if i < end:
+					path.append(arcs[i])
+					u = head[arcs[i]]
+				elif u == s:
+					break
+				else:
+					#dead end, remove u from the level graph and step back
+					level[u] = -1
+					u = head[path.pop() ^ 1]
+					current[u] += 1
+			phase += 1
+			if on_phase is not None:
+				on_phase(self, phase)
+
+	def push_relabel(self, on_phase=None):
+		"""Compute a maximum flow with the FIFO push-relabel algorithm and return its value
+
+		Heights are reset to exact distances by a global relabel at the start and after every
+			global_relabel_rate * n relabels, which count as the phases of the algorithm. Excess which
+			can not reach the sink is returned to the source, so the result is a flow and not only a preflow.
+
+		args:
+			on_phase(callable): f(network, phase), called after every global relabel. Default = None
+		"""
+		n = len(self.nodes)
+		s, t = self.source, self.sink
+		head, residual, arcs, offsets = self.head, self.residual, self.arcs, self.offsets
+		excess = [0] * n
+		for i in range(offsets[s], offsets[s+1]):
+			a = arcs[i]
+			c = residual[a]
+			if c > 0:
+				residual[a] = 0
+				residual[a ^ 1] += c
+				excess[head[a]] += c
+				excess[s] -= c
+
+		height = self._heights()
+		active = deque(u for u in range(n) if excess[u] > 0 and u != s and u != t)
+		queued = bytearray(n)
+		for u in active:
+			queued[u] = 1
+		current = offsets[:n]
+		relabels = 0
+		limit = max(FlowNetwork.global_relabel_rate * n, 1)
+		phase = 0
+		while active:
+			u = active.popleft()
+			queued[u] = 0
+			if height[u] >= 2 * n:
+				continue
+			end = offsets[u+1]
+			#discharge u, pushing along admissible arcs and relabeling when none is left
+			while excess[u] > 0:
+				i = current[u]
+				if i == end:
+					lowest = 2 * n
+					for j in range(offsets[u], end):
+						a = arcs[j]
+						if residual[a] > 0 and height[head[a]] < lowest:
+							lowest = height[head[a]]
+					height[u] = lowest + 1
+					current[u] = offsets[u]
+					relabels += 1
+					if height[u] >= 2 * n:
+						break
+					continue
+				a = arcs[i]
+				v = head[a]
+				if residual[a] > 0 and height[u] == height[v] + 1:
+					pushed = min(excess[u], residual[a])
+					residual[a] -= pushed
+					residual[a ^ 1] += pushed
+					excess[u] -= pushed
+					excess[v] += pushed
+					if not queued[v] and v != s and v != t:
+						queued[v] = 1
+						active.append(v)
+				else:
+					current[u] = i + 1
+			if relabels >= limit:
+				relabels = 0
+				height = self._heights()
+				current = offsets[:n]
+				phase += 1
+				self.value = excess[t]
+				if on_phase is not None:
+					on_phase(self, phase)
+		self.value = excess[t]
+		if on_phase is not None:
+			on_phase(self, phase + 1)
+		return self.value
+
+	def min_cut(self):
+		"""Return the nodes on the source side of a minimum cut and the edges crossing it
+
+		Only meaningful once a maximum flow has been computed. The source side holds the nodes which can
+			still be reached from the source in the residual network.
+		"""
+		reached = self._reachable()
+		cut = [e for k, e in enumerate(self.edges)
+			   if reached[self.head[2*k+1]] and not reached[self.head[2*k]]]
+		return [x for x, r in zip(self.nodes, reached) if r], cut
+
+	def mark_min_cut(self, source_color=Color.BLUE, sink_color=Color.WHITE, cut_color=Color.RED):
+		"""Color the nodes on each side of a minimum cut and the edges crossing it
+
+		args:
+			source_color(Color): color of the nodes on the source side. Default = Color.BLUE
+			sink_color(Color): color of the nodes on the sink side. Default = Color.WHITE
+			cut_color(Color): color of the edges crossing the cut. Default = Color.RED
+		"""
+		source_side, cut = self.min_cut()
+		source_ids = {id(x) for x in source_side}
+		for x in self.nodes:
+			x.color = source_color if id(x) in source_ids else sink_color
+		for e in cut:
+			e.color = cut_color
+
+	def _levels(self):
+		"""Return the number of residual arcs from the source to every node, or -1 if it can not be reached"""
+		level = [-1] * len(self.nodes)
+		level[self.source] = 0
+		queue = deque([self.source])
+		head, residual, arcs, offsets = self.head, self.residual, self.arcs, self.offsets
+		while queue:
+			u = queue.popleft()
+			for i in range(offsets[u], offsets[u+1]):
+				a = arcs[i]
+				v = head[a]
+				if residual[a] > 0 and level[v] < 0:
+					level[v] = level[u] + 1
+					queue.append(v)
+		return level
+
+	def _reachable(self):
+		return [d >= 0 for d in self._levels()]
+
+	def _heights(self):
+		"""Return exact push-relabel heights: the residual distance to the sink, or n plus that to the source"""
+		n = len(self.nodes)
+		height = [2 * n] * n
+		head, residual, arcs, offsets = self.head, self.residual, self.arcs, self.offsets
+		for root, base in ((self.sink, 0), (self.source, n)):
+			height[root] = base
+			queue = deque([root])
+			while queue:
+				v = queue.popleft()
+				for i in range(offsets[v], offsets[v+1]):
+					#the partner of an arc leaving v enters v, and can be used if it has residual capacity
+					a = arcs[i] ^ 1
+					u = head[a ^ 1]
+					if residual[a] > 0 and height[u] == 2 * n and u != self.source:
+						height[u] = height[v] + 1
+						queue.append(u)
+		return height
+
+
+def max_flow(graph, source, sink, method='dinic', capacity=None, on_phase=None, write=True):
+	"""Compute a maximum flow from source to sink and return the FlowNetwork holding it
+
+	args:
+		graph(Graph): graph to compute a flow on
+		source(Node): node the flow leaves from
+		sink(Node): node the flow arrives at
+		method(str): 'dinic' or 'push_relabel'. Default = 'dinic'
+		capacity(callable): f(edge) -> capacity. Default = None, which uses Edge.weight
+		on_phase(callable): f(network, phase), called after every phase. Default = None
+		write(bool): write the final flows onto the edges. Default = True
+	"""
+	if method not in ('dinic', 'push_relabel'):
+		raise ValueError('unknown max flow method: {}'.format(method))
+	network = FlowNetwork(graph, source, sink, capacity)
+	getattr(network, method)(on_phase)
+	if write:
+		network.write_flows()
+	return network
@@ -0,0 +1,63 @@
+"""Paces the steps of a script played in the debugger, independently of how often the display is updated
+
+While playing, the debugger steps through the script line by line, calling Player.step on every line.
+	Steps are spread evenly at rate lines per second, measured from when the rate was last set, so short
+	sleeps are merged and the rate holds even when single steps take different times. Only one step per
+	1/max_fps seconds is reported as a frame, on which the paused line and timeline are shown, so at high
+	rates many steps are batched into every frame and the GUI never falls behind the script.
+"""
+
+import time
+
+
+class Player:
+	"""Decides when each step of a played script happens and which steps are shown"""
+
+	#most frames reported per second, whatever the rate
+	max_fps = 60
+	#sleeps shorter than this, in seconds, are postponed and merged with those of the next steps
+	min_sleep = 0.002
+	#lag, in seconds, after which the schedule restarts instead of running steps unpaced to catch up
+	max_lag = 0.25
+
+	min_rate = 1
+	max_rate = 10000
+
+	def __init__(self, rate=10):
+		"""Create a stopped player
+
+		args:
+			rate(float): lines per second, clamped to min_rate and max_rate. Default = 10
+		"""
+		self.playing = False
+		self.set_rate(rate)
+
+	def set_rate(self, rate):
+		"""Change the number of lines per second, taking effect from the next step"""
+		self.rate = max(Player.min_rate, min(Player.max_rate, rate))
+		self.started = time.monotonic()
+		self.steps = 0
+
+	def start(self):
+		self.set_rate(self.rate)
+		self.last_frame = float('-inf')
+		self.playing = True
+
+	def stop(self):
+		self.playing = False
+
+	def step(self):
+		"""Wait until the next step is due and return True if it should be shown as a frame"""
+		self.steps += 1
+		now = time.monotonic()
+		ahead = self.started + self.steps / self.rate - now
+		if ahead >= Player.min_sleep:
+			time.sleep(ahead)
+			now += ahead
+		elif ahead < -Player.max_lag:
+			self.started = now
+			self.steps = 0
+		if now - self.last_frame >= 1 / Player.max_fps:
+			self.last_frame = now
+			return True
+		return False
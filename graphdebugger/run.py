@@ -1,21 +1,47 @@
-
-from graphdebugger import DebuggerUI
 import sys
 import argparse
-from PyQt5.QtWidgets import QApplication
 
 
 
 def main():
 	parser = argparse.ArgumentParser(description='Open the Graph Visual Debugger GUI.')
-	parser.add_argument('-g','--graphfile',nargs='?',help='Graph JSON file.')
+	parser.add_argument('-g','--graphfile',nargs='?',help='Graph JSON, binary (.vgb), edge list, DIMACS or GraphML file.')
 	parser.add_argument('-s','--scriptfile',nargs='?',help='Script py file.')
+	parser.add_argument('--headless',action='store_true',help='Run the script against the graph without the GUI and print statistics.')
+	parser.add_argument('-o','--output',nargs='?',help='File the final graph is written to in headless mode. Nothing is written without it.')
+	parser.add_argument('--generate',nargs=2,metavar=('KIND','NODES'),help='Generate a random graph instead of loading one. '
+						'KIND is one of erdos_renyi, barabasi_albert, grid, tree, dag and flow_network. Without a script, '
+						'-o writes the generated graph to a file. Requires NumPy.')
+	parser.add_argument('--seed',type=int,help='Random seed of --generate.')
 
 	args = parser.parse_args()
+	graph = args.graphfile
+	if args.generate:
+		if args.graphfile:
+			parser.error('-g and --generate can not be used together')
+		from graphdebugger import generators
+		kind, nodes = args.generate
+		if kind not in generators.GENERATORS or not nodes.isdigit():
+			parser.error('--generate expects one of {} and a number of nodes'.format(', '.join(generators.GENERATORS)))
+		graph = generators.generate(kind, int(nodes), args.seed)
+		if args.output and not args.scriptfile:
+			graph.write_graph(args.output)
+			sys.exit(0)
+
+	if args.headless:
+		if not graph or not args.scriptfile:
+			parser.error('--headless requires both -g, or --generate, and -s')
+		from graphdebugger import headless
+		sys.exit(headless.main(graph, args.scriptfile, args.output))
+
+	from graphdebugger import DebuggerUI
+	from PyQt5.QtWidgets import QApplication
 	app = QApplication(sys.argv)
 	e = DebuggerUI.GraphApp(graph=args.graphfile, script=args.scriptfile)
+	if args.generate:
+		e.set_graph(graph)
 	e.show()
 	sys.exit(app.exec_())
 
 if __name__ == '__main__':
-	main()
\ No newline at end of file
+	main()
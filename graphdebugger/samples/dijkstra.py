@@ -1,6 +1,5 @@
-
-from graphdebugger.Graph import Color, Graph
-import heapq, math
+from graphdebugger.Graph import Color, Graph, IndexedHeap
+import math
 
 
 def dijkstra(g):
@@ -13,14 +12,11 @@ def dijkstra(g):
 	src = g.get_node("source") #requires a node in graph to be given the "source" tag
 	src.key = 0
 
-	for i,v in enumerate(g.nodes):
-		v.index = i
-	q = [(v.key, v.index, v) for v in g.nodes]
-	heapq.heapify(q)
+	#every node is queued, so unreachable ones are finalized with a distance of inf as well
+	q = IndexedHeap([(v, v.key) for v in g.nodes], leave_color=Color.BLACK)
 
 	while q:
-		k,i,u = heapq.heappop(q)
-		u.color = Color.BLACK
+		u,k = q.pop_min()
 		u.label = str(u.key) if not u.label else '{:s}:{:s}'.format(u.label,str(u.key))
 		for e in u.out:
 			relax(e,q)
@@ -32,11 +28,9 @@ def relax(e,q):
 	if v.key > u.key + e.weight:
 
 		v.pi = (u,e)
-		j = q.index((v.key, v.index, v))
 		v.key = e.weight+u.key
-		q[j] = (v.key, v.index, v)
-		heapq.heapify(q)
+		q.decrease_key(v, v.key)
 
 
-graph = EditDebugger.app.get_graph()
+graph = Graph.get_graph()
 dijkstra(graph)
@@ -45,6 +45,6 @@ def get_path(g,s,t,path,path_set):
 			path_set.remove(e)
 			path.pop()
 	return None
-graph = EditDebugger.app.get_graph()
+graph = Graph.get_graph()
 fordfulkerson(graph)
 pass
\ No newline at end of file
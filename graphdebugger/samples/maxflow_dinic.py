@@ -0,0 +1,17 @@
+from graphdebugger.Graph import Graph
+from graphdebugger import maxflow
+
+
+def show_phase(network, phase):
+	#writing the flows back after every blocking flow lets the debugger animate the phases,
+	#set a breakpoint on the next line to pause on each of them
+	network.write_flows()
+
+
+graph = Graph.get_graph()
+s = graph.get_node('source') #requires nodes in graph to be given the "source" and "target" tags
+t = graph.get_node('target')
+
+network = maxflow.max_flow(graph, s, t, on_phase=show_phase)
+network.mark_min_cut()
+t.label = '{:s}:{:s}'.format(t.label, str(network.value)) #show the value of the flow on the target
@@ -1,6 +1,6 @@
 
-from graphdebugger.Graph import Color, Graph
-import heapq, math
+from graphdebugger.Graph import Color, Graph, IndexedHeap
+import math
 
 def prim(g):
 
@@ -14,26 +14,19 @@ def prim(g):
 	r = g.nodes[0]
 	r.key = 0
 
-	for i,v in enumerate(g.nodes):
-		v.index = i
-	q = [(v.key, v.index, v) for v in g.nodes]
-	heapq.heapify(q)
+	q = IndexedHeap([(v, v.key) for v in g.nodes], leave_color=Color.BLACK)
 
 	while q:
-		prior,i,u = heapq.heappop(q)
-		u.color = Color.BLACK
+		u,prior = q.pop_min()
 		if u.pi is not None:
 			u.pi[1].color = Color.BLACK
 		for e,v in u.adj_edges:
-			if v.color == Color.WHITE and e.weight < v.key:
-				#lazy "decrease key" since heapq doesn't natively support it
+			if v in q and e.weight < v.key:
 				v.pi = (u,e)
-				j = q.index((v.key, v.index, v))
 				v.key = e.weight
-				q[j] = (v.key, v.index, v)
-				heapq.heapify(q)
+				q.decrease_key(v, v.key)
 
-graph = EditDebugger.app.get_graph()
+graph = Graph.get_graph()
 
 prim(graph)
 pass
\ No newline at end of file
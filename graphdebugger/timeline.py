@@ -0,0 +1,187 @@
+"""Bounded history of graph mutations used to step backwards through a debugging session"""
+
+from graphdebugger.Graph import Graph
+
+from collections import deque
+import itertools
+
+
+class Timeline:
+	"""Records every change to the color, label, weight and flow of a graph's nodes and edges
+
+	The history is split into steps, one per traced line of the user script. Each step holds the line
+		number it started on and the (element, attr, old, new) deltas made until the next traced line.
+		A full checkpoint of the graph is also stored every checkpoint_interval steps so that seeking
+		far back does not have to undo every delta in between.
+
+	Oldest steps are discarded once the estimated memory use of the history exceeds the budget.
+		Attributes set by scripts outside of the displayed ones (such as key or pi) are not recorded.
+	"""
+
+	#rough per entry costs, in bytes, used to enforce the memory budget
+	delta_size = 120
+	step_size = 80
+	element_size = 90
+
+	def __init__(self, graph, budget=64*2**20, checkpoint_interval=1000):
+		"""Create an empty timeline for the provided graph
+
+		args:
+			graph(Graph): graph whose changes are recorded
+			budget(int): approximate maximum number of bytes used by the history. Default = 64 MiB
+			checkpoint_interval(int): number of steps between full checkpoints. Default = 1000
+		"""
+		self.graph = graph
+		self.budget = budget
+		self.checkpoint_interval = checkpoint_interval
+		self.lines = deque()
+		self.deltas = deque()
+		self.checkpoints = {}
+		self.first = 0
+		self.position = -1
+		self.size = 0
+		self.recording = True
+
+	def __len__(self):
+		return len(self.lines)
+
+	@property
+	def head(self):
+		"""Absolute index of the most recent step"""
+		return self.first + len(self.lines) - 1
+
+	def at_head(self):
+		return self.position == self.head
+
+	def line(self):
+		"""Line number of the step currently displayed"""
+		return self.lines[self.position - self.first]
+
+	def attach(self):
+		Graph.observers.append(self.record)
+
+	def detach(self):
+		if self.record in Graph.observers:
+			Graph.observers.remove(self.record)
+
+	def record(self, element, attr, old, new):
+		"""Graph observer which appends a delta to the current step"""
+		if not self.recording or not self.lines or old is new:
+			return
+		step = self.deltas[-1]
+		if step is None:
+			step = self.deltas[-1] = []
+		step.append((element, attr, old, new))
+		self.size += Timeline.delta_size
+		self._enforce_budget()
+
+	def mark(self, lineno):
+		"""Start a new step at the provided line. Only valid while the timeline is at its head"""
+		self.lines.append(lineno)
+		self.deltas.append(None)
+		self.size += Timeline.step_size
+		self.position = self.head
+		if self.position % self.checkpoint_interval == 0:
+			self.checkpoints[self.position] = self._snapshot()
+			self.size += Timeline.element_size * (len(self.graph.nodes) + len(self.graph.edges))
+		self._enforce_budget()
+
+	def back(self):
+		"""Undo the previous step and return its line number, or None if at the oldest retained step"""
+		if self.position <= self.first:
+			return None
+		self.position -= 1
+		self._apply(self.deltas[self.position - self.first], undo=True)
+		return self.line()
+
+	def forward(self):
+		"""Redo the current step and return the line number of the next one, or None if at the head"""
+		if self.position >= self.head:
+			return None
+		self._apply(self.deltas[self.position - self.first], undo=False)
+		self.position += 1
+		return self.line()
+
+	def seek(self, target):
+		"""Move to the step with the provided absolute index and return its line number
+
+		Uses the closest earlier checkpoint when replaying from it touches fewer values than undoing
+			step by step.
+		"""
+		target = max(self.first, min(self.head, target))
+		if target < self.position:
+			undo_cost = self._cost(target, self.position)
+			checkpoint = max((c for c in self.checkpoints if c <= target), default=None)
+			if checkpoint is not None:
+				replay_cost = len(self.graph.nodes) + len(self.graph.edges) + self._cost(checkpoint, target)
+				if replay_cost < undo_cost:
+					self._restore(self.checkpoints[checkpoint])
+					self.position = checkpoint
+		while self.position > target:
+			self.back()
+		while self.position < target:
+			self.forward()
+		return self.line()
+
+	def back_to(self, breakpoints):
+		"""Step backwards until reaching a step on one of the breakpoints, or the oldest retained step"""
+		line = self.back()
+		while line is not None and line not in breakpoints and self.position > self.first:
+			line = self.back()
+		return self.line() if self.lines else None
+
+	def forward_to(self, breakpoints):
+		"""Step forwards until reaching a step on one of the breakpoints, or the head"""
+		line = self.forward()
+		while line is not None and line not in breakpoints and self.position < self.head:
+			line = self.forward()
+		return self.line() if self.lines else None
+
+	def _cost(self, start, end):
+		return sum(len(d) for d in itertools.islice(self.deltas, start - self.first, end - self.first) if d)
+
+	def _apply(self, deltas, undo):
+		if not deltas:
+			return
+		self.recording = False
+		try:
+			if undo:
+				for element, attr, old, new in reversed(deltas):
+					setattr(element, attr, old)
+			else:
+				for element, attr, old, new in deltas:
+					setattr(element, attr, new)
+		finally:
+			self.recording = True
+
+	def _snapshot(self):
+		return ([(n, n.color, n.label) for n in self.graph.nodes],
+				[(e, e.color, e.weight, e.flow) for e in self.graph.edges])
+
+	def _restore(self, snapshot):
+		nodes, edges = snapshot
+		self.recording = False
+		try:
+			for n, color, label in nodes:
+				if n.color is not color:
+					n.color = color
+				if n.label != label:
+					n.label = label
+			for e, color, weight, flow in edges:
+				if e.color is not color:
+					e.color = color
+				if e.weight != weight:
+					e.weight = weight
+				if e.flow != flow:
+					e.flow = flow
+		finally:
+			self.recording = True
+
+	def _enforce_budget(self):
+		while self.size > self.budget and len(self.lines) > 1 and self.position > self.first:
+			deltas = self.deltas.popleft()
+			self.lines.popleft()
+			self.size -= Timeline.step_size + (len(deltas) * Timeline.delta_size if deltas else 0)
+			if self.checkpoints.pop(self.first, None) is not None:
+				self.size -= Timeline.element_size * (len(self.graph.nodes) + len(self.graph.edges))
+			self.first += 1
@@ -0,0 +1,444 @@
+"""Line tracer for the user's script which stays out of the way of all other code
+
+On Python 3.12 and later the tracer uses sys.monitoring and only enables LINE events for the code objects
+	of the script which contain a breakpoint, or for all of them while stepping. On older versions it falls
+	back to sys.settrace, but still only installs a line tracer on frames which need one. In both cases
+	the decision of whether a code object belongs to the script is made once and cached.
+
+Breakpoints may be a plain set of line numbers or a Breakpoints mapping, whose conditions, hit counts and
+	log messages are evaluated in the tracer itself, only on lines which hold a breakpoint.
+
+LineProfiler uses the same filter to record the hits and time of every line of the script.
+"""
+
+import os
+import sys
+import time
+
+
+class ScriptFilter:
+	"""Decides whether code objects belong to a script file, caching the answer per code object"""
+
+	def __init__(self, file):
+		self.path = os.path.normcase(os.path.realpath(file))
+		self.user_code = {}
+
+	def is_user_code(self, code):
+		"""Return True if the code object belongs to the traced script, caching the answer per code object"""
+		try:
+			return self.user_code[code]
+		except KeyError:
+			result = self.user_code[code] = os.path.normcase(os.path.realpath(code.co_filename)) == self.path
+			return result
+
+
+class Breakpoint:
+	"""A breakpoint on one line of the script
+
+	A plain breakpoint stops every time its line is reached. With a condition, it only stops when the
+		expression is true in the frame of the line. With a hit count, it only stops once its line was
+		reached, with the condition true, at least hit_count times in the current run. With a log message
+		it never stops, and instead passes the message, formatted like an f-string in the frame of the
+		line, to the on_log callback of its Breakpoints. The condition and message are compiled once.
+	"""
+
+	__slots__ = ('line', 'condition', 'hit_count', 'log', 'hits', 'compiled_condition', 'compiled_log')
+
+	def __init__(self, line, condition=None, hit_count=0, log=None):
+		"""Create a breakpoint. Raises SyntaxError if the condition or log message does not compile
+
+		args:
+			line(int): line number of the breakpoint
+			condition(str): expression which must be true to stop. Default = None
+			hit_count(int): number of hits before stopping. Default = 0, which stops on every hit
+			log(str): message to log instead of stopping, with {expressions} in braces. Default = None
+		"""
+		self.line = line
+		self.condition = condition or None
+		self.hit_count = hit_count
+		self.log = log or None
+		self.hits = 0
+		self.compiled_condition = compile(condition, '<breakpoint condition>', 'eval') if condition else None
+		self.compiled_log = compile('f' + repr(log), '<breakpoint log>', 'eval') if log else None
+
+	@property
+	def plain(self):
+		return self.condition is None and self.hit_count <= 1 and self.log is None
+
+	def spec(self):
+		"""Return the (line, condition, hit_count, log) arguments which recreate this breakpoint"""
+		return (self.line, self.condition, self.hit_count, self.log)
+
+
+class Breakpoints(dict):
+	"""Breakpoints of a script keyed by line number
+
+	Testing whether a line holds a breakpoint is a dict lookup, as cheap as with a set of line numbers,
+		so lines without one cost nothing more. Supports add, remove and discard like a set of lines.
+	"""
+
+	def __init__(self, specs=()):
+		"""Create breakpoints from (line, condition, hit_count, log) tuples, see Breakpoint"""
+		super().__init__()
+		#callable of the form f(line, message), called with the messages of log breakpoints
+		self.on_log = _print_log
+		for spec in specs:
+			self.add(*spec)
+
+	def add(self, line, condition=None, hit_count=0, log=None):
+		"""Set the breakpoint of a line, replacing any existing one, and return it"""
+		bp = self[line] = Breakpoint(line, condition, hit_count, log)
+		return bp
+
+	def remove(self, line):
+		"""Remove the breakpoint of a line. Raises KeyError if there is none"""
+		del self[line]
+
+	def discard(self, line):
+		self.pop(line, None)
+
+	def specs(self):
+		"""Return a picklable list of the (line, condition, hit_count, log) of every breakpoint"""
+		return [bp.spec() for bp in self.values()]
+
+	def sync(self, specs):
+		"""Make these breakpoints match specs, keeping the hit counts of breakpoints which did not change"""
+		specs = {spec[0]:tuple(spec) for spec in specs}
+		for line in [line for line, bp in self.items() if specs.get(line) != bp.spec()]:
+			del self[line]
+		for line, spec in specs.items():
+			if line not in self:
+				self.add(*spec)
+
+	def reset_hits(self):
+		for bp in self.values():
+			bp.hits = 0
+
+	def check(self, line, frame):
+		"""Count a hit of the breakpoint on line and return True if execution should stop there
+
+		A condition which raises an exception stops execution, so that it can be inspected.
+		"""
+		bp = self.get(line)
+		if bp is None:
+			return False
+		if bp.compiled_condition is not None:
+			try:
+				if not eval(bp.compiled_condition, frame.f_globals, frame.f_locals):
+					return False
+			except Exception:
+				return True
+		bp.hits += 1
+		if bp.hits < bp.hit_count:
+			return False
+		if bp.compiled_log is not None:
+			try:
+				message = eval(bp.compiled_log, frame.f_globals, frame.f_locals)
+			except Exception as e:
+				message = '{}: {}'.format(type(e).__name__, e)
+			self.on_log(line, message)
+			return False
+		return True
+
+
+def _print_log(line, message):
+	print('line {}: {}'.format(line, message))
+
+
+class Tracer(ScriptFilter):
+	"""Pauses the execution of a script on breakpoints and while stepping
+
+	The on_stop callback is called with the paused frame and blocks for as long as execution should stay
+		paused. It returns the mode to continue in, which is one of Tracer.STEP (pause on the next line),
+		Tracer.OVER (pause on the next line of the same or a calling frame) or Tracer.RESUME (run until
+		the next breakpoint). It may also raise an exception to abort the script.
+
+	The optional on_line callback is called with the line number of every traced line, which are only the
+		lines of code objects containing a breakpoint while resuming.
+	"""
+
+	STEP = 'step'
+	OVER = 'over'
+	RESUME = 'resume'
+
+	use_monitoring = hasattr(sys, 'monitoring')
+
+	def __init__(self, file, breakpoints, on_stop, on_line=None):
+		"""Create a tracer for the provided script file
+
+		args:
+			file(str): path of the script to trace
+			breakpoints(set[int],Breakpoints): line numbers to pause on. Read on every call, so it may change
+				while running
+			on_stop(callable): f(frame) -> mode, called when execution pauses
+			on_line(callable): f(lineno), called for every traced line. Default = None
+		"""
+		super().__init__(file)
+		self.breakpoints = breakpoints
+		self.check = getattr(breakpoints, 'check', None)
+		self.on_stop = on_stop
+		self.on_line = on_line
+		self.mode = Tracer.RESUME
+		#True while on_stop runs for a breakpoint or stop_at, rather than only for the mode
+		self.at_breakpoint = False
+		self.over_depth = 0
+		self.code_lines = {}
+		self.local_events = {}
+		self.running = False
+
+	def lines_of(self, code):
+		lines = self.code_lines.get(code)
+		if lines is None:
+			lines = self.code_lines[code] = _line_numbers(code)
+		return lines
+
+	def has_breakpoint(self, code):
+		#a single C level call, so that breakpoints added or removed from another thread meanwhile can not
+		#change the collection while it is iterated
+		return not self.lines_of(code).isdisjoint(self.breakpoints)
+
+	def needs_lines(self, code):
+		return self.mode != Tracer.RESUME or self.has_breakpoint(code)
+
+	def start(self):
+		"""Start tracing. Must be called from the thread which runs the script"""
+		self.running = True
+		if Tracer.use_monitoring:
+			mon = sys.monitoring
+			mon.use_tool_id(mon.DEBUGGER_ID, 'graphdebugger')
+			mon.register_callback(mon.DEBUGGER_ID, mon.events.PY_START, self._monitor_start)
+			mon.register_callback(mon.DEBUGGER_ID, mon.events.LINE, self._monitor_line)
+			mon.set_events(mon.DEBUGGER_ID, mon.events.PY_START)
+			mon.restart_events()
+		else:
+			sys.settrace(self._trace_call)
+
+	def stop(self):
+		"""Stop tracing and release the tracing hooks"""
+		self.running = False
+		if Tracer.use_monitoring:
+			mon = sys.monitoring
+			for code in self.local_events:
+				mon.set_local_events(mon.DEBUGGER_ID, code, 0)
+			mon.set_events(mon.DEBUGGER_ID, 0)
+			mon.register_callback(mon.DEBUGGER_ID, mon.events.PY_START, None)
+			mon.register_callback(mon.DEBUGGER_ID, mon.events.LINE, None)
+			mon.free_tool_id(mon.DEBUGGER_ID)
+			self.local_events.clear()
+		else:
+			sys.settrace(None)
+
+	def stop_at(self, frame):
+		"""Pause on the current line of frame, a frame of the script, as if it held a breakpoint
+
+		Used to pause on events other than lines, such as watchpoints, even while no line is traced. The
+			line starts a new step of on_line, and execution continues in the mode returned by on_stop.
+		"""
+		if self.on_line is not None:
+			self.on_line(frame.f_lineno)
+		self.at_breakpoint = True
+		self._stop(frame)
+
+	def _should_stop(self, frame, lineno):
+		if lineno in self.breakpoints and (self.check is None or self.check(lineno, frame)):
+			self.at_breakpoint = True
+			return True
+		self.at_breakpoint = False
+		if self.mode == Tracer.STEP:
+			return True
+		return self.mode == Tracer.OVER and _depth(frame) <= self.over_depth
+
+	def _stop(self, frame):
+		mode = self.on_stop(frame)
+		self.mode = mode
+		if mode == Tracer.OVER:
+			self.over_depth = _depth(frame)
+		self._update_frames(frame)
+
+	def _update_frames(self, frame):
+		"""Enable or disable line events on the script's code after the mode changed"""
+		if Tracer.use_monitoring:
+			for code in list(self.local_events):
+				self._set_local_events(code)
+		elif self.mode != Tracer.RESUME:
+			#frames further up the stack may have had line tracing turned off while resuming
+			while frame is not None:
+				if self.is_user_code(frame.f_code):
+					frame.f_trace = self._trace_line
+				frame = frame.f_back
+
+	#sys.settrace backend
+
+	def _trace_call(self, frame, event, arg):
+		if event != 'call' or not self.is_user_code(frame.f_code):
+			return None
+		if self.needs_lines(frame.f_code):
+			return self._trace_line
+		return None
+
+	def _trace_line(self, frame, event, arg):
+		if event != 'line':
+			return self._trace_line
+		lineno = frame.f_lineno
+		if self.on_line is not None:
+			self.on_line(lineno)
+		if self._should_stop(frame, lineno):
+			self._stop(frame)
+		if not self.needs_lines(frame.f_code):
+			return None
+		return self._trace_line
+
+	#sys.monitoring backend
+
+	def _set_local_events(self, code):
+		mon = sys.monitoring
+		events = mon.events.LINE if self.needs_lines(code) else 0
+		if self.local_events.get(code) != events:
+			mon.set_local_events(mon.DEBUGGER_ID, code, events)
+			self.local_events[code] = events
+
+	def _monitor_start(self, code, offset):
+		if not self.is_user_code(code):
+			return sys.monitoring.DISABLE
+		self._set_local_events(code)
+
+	def _monitor_line(self, code, lineno):
+		if self.on_line is not None:
+			self.on_line(lineno)
+		frame = sys._getframe(1)
+		if self._should_stop(frame, lineno):
+			self._stop(frame)
+		elif self.mode == Tracer.RESUME and not self.has_breakpoint(code):
+			self._set_local_events(code)
+
+
+class LineProfiler(ScriptFilter):
+	"""Records the number of hits and the time spent on every line of a script
+
+	The time of a line runs from the moment it starts until the next line of the same frame starts or the
+		frame is left, so it includes the time of every function called from it. Only the code objects
+		of the script are traced, and execution is never paused.
+
+	After the run, hits and times map line numbers to the number of times each line ran and the total
+		seconds spent on it, and elapsed holds the wall time of the whole run.
+	"""
+
+	use_monitoring = Tracer.use_monitoring
+
+	def __init__(self, file, on_line=None):
+		"""Create a profiler for the provided script file
+
+		args:
+			file(str): path of the script to profile
+			on_line(callable): f(lineno), called for every line. It may raise an exception to abort the
+				script, and its own time is not charged to the line. Default = None
+		"""
+		super().__init__(file)
+		self.on_line = on_line
+		self.hits = {}
+		self.times = {}
+		self.frames = {}
+		self.elapsed = 0.0
+		self.running = False
+
+	def results(self):
+		"""Return a list of (lineno, hits, seconds) for every line which ran, slowest first"""
+		return sorted(((line, hits, self.times.get(line, 0.0)) for line, hits in self.hits.items()),
+					  key=lambda r: (-r[2], r[0]))
+
+	def start(self):
+		"""Start profiling. Must be called from the thread which runs the script"""
+		self.running = True
+		self.started = time.perf_counter()
+		if LineProfiler.use_monitoring:
+			mon = sys.monitoring
+			events = mon.events
+			mon.use_tool_id(mon.PROFILER_ID, 'graphdebugger')
+			mon.register_callback(mon.PROFILER_ID, events.PY_START, self._monitor_start)
+			mon.register_callback(mon.PROFILER_ID, events.LINE, self._monitor_line)
+			mon.register_callback(mon.PROFILER_ID, events.PY_RETURN, self._monitor_leave)
+			mon.register_callback(mon.PROFILER_ID, events.PY_YIELD, self._monitor_leave)
+			mon.register_callback(mon.PROFILER_ID, events.PY_UNWIND, self._monitor_leave)
+			#PY_UNWIND can only be enabled globally, the callback ignores frames which are not profiled
+			mon.set_events(mon.PROFILER_ID, events.PY_START | events.PY_UNWIND)
+			mon.restart_events()
+		else:
+			sys.settrace(self._trace_call)
+
+	def stop(self):
+		"""Stop profiling and release the tracing hooks"""
+		self.running = False
+		self.elapsed = time.perf_counter() - self.started
+		if LineProfiler.use_monitoring:
+			mon = sys.monitoring
+			for code, profiled in self.user_code.items():
+				if profiled:
+					mon.set_local_events(mon.PROFILER_ID, code, 0)
+			mon.set_events(mon.PROFILER_ID, 0)
+			for event in ('PY_START', 'LINE', 'PY_RETURN', 'PY_YIELD', 'PY_UNWIND'):
+				mon.register_callback(mon.PROFILER_ID, getattr(mon.events, event), None)
+			mon.free_tool_id(mon.PROFILER_ID)
+		else:
+			sys.settrace(None)
+		for frame in list(self.frames):
+			self._leave(frame)
+
+	def _line(self, frame, lineno):
+		now = time.perf_counter()
+		last = self.frames.get(frame)
+		if last is not None:
+			self.times[last[0]] = self.times.get(last[0], 0.0) + now - last[1]
+		self.hits[lineno] = self.hits.get(lineno, 0) + 1
+		if self.on_line is not None:
+			self.on_line(lineno)
+		self.frames[frame] = (lineno, time.perf_counter())
+
+	def _leave(self, frame):
+		last = self.frames.pop(frame, None)
+		if last is not None:
+			self.times[last[0]] = self.times.get(last[0], 0.0) + time.perf_counter() - last[1]
+
+	#sys.settrace backend
+
+	def _trace_call(self, frame, event, arg):
+		if event != 'call' or not self.is_user_code(frame.f_code):
+			return None
+		return self._trace_line
+
+	def _trace_line(self, frame, event, arg):
+		if event == 'line':
+			self._line(frame, frame.f_lineno)
+		elif event == 'return':
+			self._leave(frame)
+		return self._trace_line
+
+	#sys.monitoring backend
+
+	def _monitor_start(self, code, offset):
+		mon = sys.monitoring
+		if not self.is_user_code(code):
+			return mon.DISABLE
+		mon.set_local_events(mon.PROFILER_ID, code, mon.events.LINE | mon.events.PY_RETURN | mon.events.PY_YIELD)
+		return mon.DISABLE
+
+	def _monitor_line(self, code, lineno):
+		self._line(sys._getframe(1), lineno)
+
+	def _monitor_leave(self, code, offset, arg):
+		self._leave(sys._getframe(1))
+
+
+def _line_numbers(code):
+	"""Return the set of line numbers of the code object, excluding those of nested functions"""
+	if hasattr(code, 'co_lines'):
+		return {line for start, end, line in code.co_lines() if line is not None}
+	import dis
+	return {line for offset, line in dis.findlinestarts(code)}
+
+
+def _depth(frame):
+	depth = 0
+	while frame is not None:
+		depth += 1
+		frame = frame.f_back
+	return depth
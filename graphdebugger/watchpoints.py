@@ -0,0 +1,195 @@
+"""Watchpoints which pause a running script when the color, label, weight or flow of the graph changes
+
+Watchpoints are checked by a Graph observer, called from the property setters of Node and Edge, so they
+	need no line tracing at all: while resuming, the Tracer only traces code objects holding a
+	breakpoint, and the script runs at close to its normal speed between two hits. A hit pauses on the
+	line of the script which made the change, through Tracer.stop_at, after which Step, Skip and Resume
+	behave as on a breakpoint.
+
+Setting next_change makes the next change of any element pause, whether or not a watchpoint matches it,
+	which runs the script to the next change of the picture. Changes which set an attribute to the value
+	it already has never pause.
+"""
+
+from graphdebugger.Graph import Color, Edge, Graph, Node
+
+from contextlib import contextmanager
+import sys
+import threading
+
+
+ATTRIBUTES = ('color', 'label', 'weight', 'flow')
+
+
+class Watchpoint:
+	"""Pauses on changes to one element, or to every node, edge or element, optionally filtered by a condition
+
+	The condition is an expression, compiled once, which may use the names element, attr, old, new and
+		Color, such as new >= element.weight to stop when the flow of an edge reaches its capacity.
+	"""
+
+	__slots__ = ('element', 'attrs', 'condition', 'compiled')
+
+	def __init__(self, element=None, attrs=None, condition=None):
+		"""Create a watchpoint. Raises SyntaxError if the condition does not compile
+
+		args:
+			element(Node,Edge,type): element to watch, or Node or Edge to watch every node or edge.
+				Default = None, which watches every element
+			attrs(iterable[str]): attributes to watch, out of ATTRIBUTES. Default = None, which watches all
+			condition(str): expression which must be true to pause. Default = None
+		"""
+		self.element = element
+		self.attrs = frozenset(attrs) if attrs else None
+		self.condition = condition or None
+		self.compiled = compile(condition, '<watchpoint condition>', 'eval') if condition else None
+
+	def matches(self, element, attr, old, new):
+		"""Return True if the change should pause. A condition which raises an exception pauses"""
+		target = self.element
+		if target is not None and target is not element and not (isinstance(target, type) and isinstance(element, target)):
+			return False
+		if self.attrs is not None and attr not in self.attrs:
+			return False
+		if self.compiled is None:
+			return True
+		try:
+			return bool(eval(self.compiled, {'Color':Color},
+							 {'element':element, 'attr':attr, 'old':old, 'new':new}))
+		except Exception:
+			return True
+
+	def spec(self, node_index, edge_index):
+		"""Return a picklable (kind, index, attrs, condition) tuple, using the provided dicts of id to index"""
+		target = self.element
+		if target is None:
+			kind, index = None, None
+		elif isinstance(target, type):
+			kind, index = 'node' if target is Node else 'edge', None
+		elif isinstance(target, Node):
+			kind, index = 'node', node_index[id(target)]
+		else:
+			kind, index = 'edge', edge_index[id(target)]
+		return (kind, index, tuple(sorted(self.attrs)) if self.attrs else None, self.condition)
+
+	def __str__(self):
+		target = self.element
+		if target is None:
+			text = 'any element'
+		elif isinstance(target, type):
+			text = 'any ' + target.__name__.lower()
+		else:
+			text = describe(target)
+		text += ' ' + ('/'.join(sorted(self.attrs)) if self.attrs else 'changes')
+		if self.condition is not None:
+			text += ' if ' + self.condition
+		return text
+
+
+class Watchpoints(list):
+	"""List of Watchpoints checked on every change to the graph while started
+
+	Only changes made from the thread which started the watchpoints are checked, and none are while
+		suspended, so that replaying the timeline while paused does not trigger them.
+	"""
+
+	def __init__(self, watchpoints=()):
+		super().__init__(watchpoints)
+		self.next_change = False
+		self.tracer = None
+		self.thread = None
+		#callable of the form f(message), called with a description of every change which pauses
+		self.on_hit = None
+
+	@staticmethod
+	def from_specs(graph, specs):
+		"""Create watchpoints on graph from the tuples returned by specs"""
+		return Watchpoints(_from_specs(graph, specs))
+
+	def specs(self, graph):
+		"""Return a picklable list of the watchpoints, identifying elements by their index in graph"""
+		node_index = {id(n):i for i,n in enumerate(graph.nodes)}
+		edge_index = {id(e):i for i,e in enumerate(graph.edges)}
+		return [w.spec(node_index, edge_index) for w in self]
+
+	def sync(self, graph, specs):
+		"""Replace the watchpoints with those of specs"""
+		self[:] = _from_specs(graph, specs)
+
+	def discard_elements(self):
+		"""Remove the watchpoints on single elements, which do not survive replacing the graph"""
+		self[:] = [w for w in self if w.element is None or isinstance(w.element, type)]
+
+	def start(self, tracer):
+		"""Start checking changes made from the calling thread, pausing through tracer
+
+		args:
+			tracer(Tracer): tracer of the running script, which decides which frames belong to the script
+		"""
+		self.tracer = tracer
+		self.thread = threading.get_ident()
+		Graph.observers.append(self.record)
+
+	def stop(self):
+		if self.record in Graph.observers:
+			Graph.observers.remove(self.record)
+		self.tracer = None
+		self.thread = None
+		self.next_change = False
+
+	@contextmanager
+	def suspended(self):
+		"""Context manager which stops checking changes while it is active"""
+		thread = self.thread
+		self.thread = None
+		try:
+			yield self
+		finally:
+			self.thread = thread
+
+	def record(self, element, attr, old, new):
+		"""Graph observer which pauses the script if the change matches a watchpoint"""
+		if self.thread != threading.get_ident() or old is new or old == new:
+			return
+		if not self.next_change and not any(w.matches(element, attr, old, new) for w in self):
+			return
+		frame = sys._getframe(1)
+		while frame is not None and not self.tracer.is_user_code(frame.f_code):
+			frame = frame.f_back
+		if frame is None:
+			return
+		self.next_change = False
+		if self.on_hit is not None:
+			self.on_hit('{} {}: {} -> {}'.format(describe(element), attr, _value(old), _value(new)))
+		with self.suspended():
+			self.tracer.stop_at(frame)
+
+
+def describe(element):
+	"""Return a short description of a node or edge, naming nodes by their label"""
+	if isinstance(element, Edge):
+		return 'edge {} -> {}'.format(_name(element.src), _name(element.targ))
+	return 'node ' + _name(element)
+
+
+def _name(node):
+	return repr(node.label) if node.label else 'at ({:.0f}, {:.0f})'.format(node.x, node.y)
+
+
+def _value(value):
+	return value.name if isinstance(value, Color) else repr(value)
+
+
+def _from_specs(graph, specs):
+	nodes = list(graph.nodes)
+	edges = list(graph.edges)
+	watchpoints = []
+	for kind, index, attrs, condition in specs:
+		if kind is None:
+			element = None
+		elif index is None:
+			element = Node if kind == 'node' else Edge
+		else:
+			element = nodes[index] if kind == 'node' else edges[index]
+		watchpoints.append(Watchpoint(element, attrs, condition))
+	return watchpoints
@@ -0,0 +1,359 @@
+"""Runs a user script in a separate process, sharing the state of the graph through shared memory
+
+The GUI process creates a SharedGraphState holding the nodes and edges of the graph and their attributes,
+	then starts run_script in a worker process, which builds its own copy of the graph from it. The worker
+	writes every change made by the script into the shared arrays and sends the indices of changed
+	elements, along with any new node labels, over a pipe at most max_fps times a second. Paused lines are
+	sent over the same pipe, and ops are received from it.
+
+Messages sent by the worker:
+	('changes', node_indices, edge_indices, {node_index:label})
+	('line', lineno)
+	('log', lineno, message), for breakpoints which log a message instead of stopping
+	('playing', playing), when playing stops at a breakpoint or an op
+	('watch', message), describing the change which hit a watchpoint, before the ('line', lineno) it paused on
+	('done', error), where error is a formatted traceback or None
+
+Messages received by the worker:
+	('op', mode), where mode is one of the Tracer modes, 'change' to resume until the next change, 'play',
+		'pause' or 'stop'
+	('rate', lines_per_second), the rate of playing, see player.Player
+	('breakpoints', [(lineno, condition, hit_count, log), ...]), see tracer.Breakpoints
+	('watchpoints', [(kind, index, attrs, condition), ...]), see watchpoints.Watchpoints
+"""
+
+from graphdebugger.Graph import Color, Graph, Node
+from graphdebugger.headless import HeadlessApp
+from graphdebugger.player import Player
+from graphdebugger.tracer import Breakpoints, Tracer
+from graphdebugger.watchpoints import Watchpoints
+
+from array import array
+from multiprocessing import shared_memory
+from queue import Queue
+import importlib
+import math
+import os
+import struct
+import sys
+import threading
+import traceback
+
+
+class SharedGraphState:
+	"""Topology and attributes of a graph stored in a single shared memory block
+
+	The block holds the coordinates of every node, the source and target index of every edge, the colors
+		of nodes and edges as the value of their Color, and edge weights and flows as doubles, with None
+		stored as NaN. One byte per node and per edge records which of these numbers were ints, so that
+		they are read back as ints.
+	"""
+
+	#bits of node_kinds and edge_kinds
+	INT_X = INT_WEIGHT = 1
+	INT_Y = INT_FLOW = 2
+
+	def __init__(self, num_nodes, num_edges, name=None):
+		"""Create a new shared memory block for a graph of the provided size, or attach to an existing one
+
+		args:
+			num_nodes(int): number of nodes in the graph
+			num_edges(int): number of edges in the graph
+			name(str): name of the block to attach to. Default = None, which creates a new block
+		"""
+		self.num_nodes = num_nodes
+		self.num_edges = num_edges
+		n, m = num_nodes, num_edges
+		#largest items first, so that every column is aligned
+		columns = (('edge_weights', 'd', m), ('edge_flows', 'd', m), ('node_x', 'd', n), ('node_y', 'd', n),
+				   ('edge_src', 'I', m), ('edge_targ', 'I', m), ('node_colors', 'b', n), ('edge_colors', 'b', m),
+				   ('node_kinds', 'B', n), ('edge_kinds', 'B', m))
+		size = sum(struct.calcsize(fmt) * count for _, fmt, count in columns)
+		if name is None:
+			self.shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+		elif sys.version_info >= (3, 13):
+			self.shm = shared_memory.SharedMemory(name=name, track=False)
+		else:
+			self.shm = shared_memory.SharedMemory(name=name)
+		self.owner = name is None
+
+		self._views = []
+		offset = 0
+		for column, fmt, count in columns:
+			end = offset + struct.calcsize(fmt) * count
+			view = self.shm.buf[offset:end].cast(fmt)
+			self._views.append(view)
+			setattr(self, column, view)
+			offset = end
+
+	@property
+	def name(self):
+		return self.shm.name
+
+	def write_graph(self, graph):
+		"""Copy the nodes and edges of the graph and their attributes into the shared arrays"""
+		nodes = list(graph.nodes)
+		edges = list(graph.edges)
+		index = {id(n):i for i,n in enumerate(nodes)}
+		self.node_x[:] = array('d', [float(n.x) for n in nodes])
+		self.node_y[:] = array('d', [float(n.y) for n in nodes])
+		self.node_colors[:] = array('b', [n.color.value for n in nodes])
+		self.node_kinds[:] = array('B', [_kind(n.x, n.y) for n in nodes])
+		self.edge_src[:] = array('I', [index[id(e.src)] for e in edges])
+		self.edge_targ[:] = array('I', [index[id(e.targ)] for e in edges])
+		self.edge_weights[:] = array('d', [_to_double(e.weight) for e in edges])
+		self.edge_flows[:] = array('d', [_to_double(e.flow) for e in edges])
+		self.edge_colors[:] = array('b', [e.color.value for e in edges])
+		self.edge_kinds[:] = array('B', [_kind(e.weight, e.flow) for e in edges])
+
+	def read_graph(self, node_labels, labels):
+		"""Build and return the graph stored in the shared arrays
+
+		args:
+			node_labels(dict[int,str]): label of every labeled node, by index
+			labels(dict[str,int]): Graph.labels, mapping labels to node indices
+		"""
+		node_kinds = self.node_kinds.tolist()
+		edge_kinds = self.edge_kinds.tolist()
+		all_labels = [''] * self.num_nodes
+		for i, label in node_labels.items():
+			all_labels[i] = label
+		return Graph.from_columns(
+			[_from_shared(x, k & SharedGraphState.INT_X) for x, k in zip(self.node_x.tolist(), node_kinds)],
+			[_from_shared(y, k & SharedGraphState.INT_Y) for y, k in zip(self.node_y.tolist(), node_kinds)],
+			self.edge_src.tolist(), self.edge_targ.tolist(),
+			weights=[_from_shared(w, k & SharedGraphState.INT_WEIGHT) for w, k in zip(self.edge_weights.tolist(), edge_kinds)],
+			flows=[_from_shared(f, k & SharedGraphState.INT_FLOW) for f, k in zip(self.edge_flows.tolist(), edge_kinds)],
+			node_colors=self.node_colors.tolist(), edge_colors=self.edge_colors.tolist(),
+			node_labels=all_labels, labels=labels)
+
+	def read_nodes(self, nodes, indices, labels):
+		"""Apply the shared attributes of the nodes with the provided indices onto the list of Node objects"""
+		for i in indices:
+			n = nodes[i]
+			color = Color(self.node_colors[i])
+			if n.color is not color:
+				n.color = color
+			if i in labels:
+				n.label = labels[i]
+
+	def read_edges(self, edges, indices):
+		"""Apply the shared attributes of the edges with the provided indices onto the list of Edge objects"""
+		for i in indices:
+			e = edges[i]
+			color = Color(self.edge_colors[i])
+			if e.color is not color:
+				e.color = color
+			kind = self.edge_kinds[i]
+			weight = _from_double(self.edge_weights[i], e.weight, kind & SharedGraphState.INT_WEIGHT)
+			if weight is not e.weight:
+				e.weight = weight
+			flow = _from_double(self.edge_flows[i], e.flow, kind & SharedGraphState.INT_FLOW)
+			if flow is not e.flow:
+				e.flow = flow
+
+	def close(self):
+		"""Release this process' view of the block, and free it if this process created it"""
+		for view in self._views:
+			view.release()
+		self._views = []
+		self.shm.close()
+		if self.owner:
+			self.shm.unlink()
+
+
+def _to_double(value):
+	return math.nan if value is None else float(value)
+
+
+def _kind(first, second):
+	"""Return the kind bits recording which of the two numbers are ints"""
+	return (type(first) is int) | (type(second) is int) << 1
+
+
+def _from_shared(value, integer):
+	if value != value:
+		return None
+	return int(value) if integer else value
+
+
+def _from_double(value, current, integer=False):
+	"""Return the value read from a shared array, or current if both represent the same number"""
+	if math.isnan(value):
+		return current if current is None or current != current else None
+	if current == value and (type(current) is int) == bool(integer):
+		return current
+	return int(value) if integer else value
+
+
+class _Worker:
+
+	max_fps = 60
+
+	def __init__(self, conn, state, graph):
+		self.conn = conn
+		self.graph = graph
+		self.state = state
+		self.send_lock = threading.Lock()
+		self.dirty_lock = threading.Lock()
+		self.dirty_nodes = set()
+		self.dirty_edges = set()
+		self.labels = {}
+		self.node_index = {id(n):i for i,n in enumerate(graph.nodes)}
+		self.edge_index = {id(e):i for i,e in enumerate(graph.edges)}
+		self.ops = Queue()
+		self.breakpoints = Breakpoints()
+		self.breakpoints.on_log = self.log
+		self.watchpoints = Watchpoints()
+		self.watchpoints.on_hit = lambda message : self.send(('watch', message))
+		self.player = Player()
+		self.tracer = None
+		self.finished = threading.Event()
+
+	def send(self, message):
+		with self.send_lock:
+			self.conn.send(message)
+
+	def record(self, element, attr, old, new):
+		"""Graph observer which writes the change into shared memory and marks the element as dirty"""
+		state = self.state
+		if isinstance(element, Node):
+			i = self.node_index.get(id(element))
+			if i is None:
+				return
+			with self.dirty_lock:
+				if attr == 'color':
+					state.node_colors[i] = new.value
+				else:
+					self.labels[i] = new
+				self.dirty_nodes.add(i)
+		else:
+			i = self.edge_index.get(id(element))
+			if i is None:
+				return
+			with self.dirty_lock:
+				if attr == 'color':
+					state.edge_colors[i] = new.value
+				elif attr == 'weight':
+					state.edge_weights[i] = _to_double(new)
+					state.edge_kinds[i] = state.edge_kinds[i] & ~SharedGraphState.INT_WEIGHT | (type(new) is int)
+				else:
+					state.edge_flows[i] = _to_double(new)
+					state.edge_kinds[i] = state.edge_kinds[i] & ~SharedGraphState.INT_FLOW | (type(new) is int) << 1
+				self.dirty_edges.add(i)
+
+	def flush(self):
+		with self.dirty_lock:
+			if not self.dirty_nodes and not self.dirty_edges:
+				return
+			message = ('changes', list(self.dirty_nodes), list(self.dirty_edges), self.labels)
+			self.dirty_nodes = set()
+			self.dirty_edges = set()
+			self.labels = {}
+		self.send(message)
+
+	def flush_loop(self):
+		while not self.finished.wait(1 / _Worker.max_fps):
+			self.flush()
+
+	def receive_loop(self):
+		while True:
+			try:
+				kind, value = self.conn.recv()
+			except (EOFError, OSError):
+				self.ops.put('stop')
+				return
+			if kind == 'breakpoints':
+				self.breakpoints.sync(value)
+			elif kind == 'watchpoints':
+				self.watchpoints.sync(self.graph, value)
+			elif kind == 'rate':
+				self.player.set_rate(value)
+			else:
+				self.ops.put(value)
+
+	def log(self, lineno, message):
+		self.send(('log', lineno, message))
+
+	def pause(self, frame):
+		if self.player.playing:
+			if self.ops.empty() and not self.tracer.at_breakpoint:
+				if self.player.step():
+					self.flush()
+					self.send(('line', frame.f_lineno))
+				return Tracer.STEP
+			self.player.stop()
+			self.send(('playing', False))
+		self.flush()
+		self.send(('line', frame.f_lineno))
+		mode = self.ops.get()
+		while mode == 'pause':
+			mode = self.ops.get()
+		if mode == 'stop':
+			raise _Halted
+		if mode == 'play':
+			self.player.start()
+			return Tracer.STEP
+		self.watchpoints.next_change = mode == 'change'
+		return Tracer.RESUME if mode == 'change' else mode
+
+
+class _Halted(Exception):
+	pass
+
+
+def run_script(conn, state_name, num_nodes, num_edges, node_labels, labels, script, breakpoints, watchpoints=(),
+			   next_change=False, play_rate=None):
+	"""Entry point of the worker process
+
+	The graph is built from the SharedGraphState, so only its labels are passed along with the arguments.
+
+	args:
+		conn(Connection): worker end of the pipe to the GUI process
+		state_name(str): name of the SharedGraphState block created by the GUI process
+		num_nodes(int): number of nodes in the graph
+		num_edges(int): number of edges in the graph
+		node_labels(dict[int,str]): label of every labeled node, by index
+		labels(dict[str,int]): Graph.labels, mapping labels to node indices
+		script(str): path of the script to run
+		breakpoints(list[tuple]): initial breakpoints, as returned by Breakpoints.specs
+		watchpoints(list[tuple]): initial watchpoints, as returned by Watchpoints.specs. Default = ()
+		next_change(bool): pause on the first change to the graph. Default = False
+		play_rate(float): lines per second to play the script at from its start. Default = None, which does not play
+	"""
+	state = SharedGraphState(num_nodes, num_edges, state_name)
+	graph = state.read_graph(node_labels, labels)
+	worker = _Worker(conn, state, graph)
+	worker.breakpoints.sync(breakpoints)
+	worker.watchpoints.sync(graph, watchpoints)
+	Graph.app = HeadlessApp(graph)
+	Graph.observers.append(worker.record)
+
+	threading.Thread(target=worker.receive_loop, daemon=True).start()
+	threading.Thread(target=worker.flush_loop, daemon=True).start()
+
+	sys.path.append(os.path.dirname(os.path.abspath(script)))
+	tracer = Tracer(script, worker.breakpoints, worker.pause)
+	error = None
+	tracer.start()
+	worker.watchpoints.start(tracer)
+	worker.watchpoints.next_change = next_change
+	worker.tracer = tracer
+	if play_rate is not None:
+		worker.player.set_rate(play_rate)
+		worker.player.start()
+		tracer.mode = Tracer.STEP
+	try:
+		importlib.import_module(os.path.splitext(os.path.basename(script))[0])
+	except _Halted:
+		pass
+	except BaseException:
+		error = traceback.format_exc()
+	finally:
+		worker.watchpoints.stop()
+		tracer.stop()
+		worker.finished.set()
+
+	worker.flush()
+	worker.send(('done', error))
+	state.close()
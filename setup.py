@@ -18,6 +18,9 @@ setup(name='VisualGraphDebugger-zacharyh211',
 		]	
 	},
 	install_requires=['PyQt5'],
+	extras_require={
+		'fast': ['numpy'],
+	},
 	entry_points={
 		'gui_scripts': ['vgd = graphdebugger.run:main']
 	},
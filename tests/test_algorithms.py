@@ -0,0 +1,167 @@
+import itertools
+import math
+import random
+
+import pytest
+
+from graphdebugger import algorithms
+from graphdebugger.Graph import Color, Graph
+
+
+def random_graph(seed, n, m, low=0, high=10, integer=True):
+	rng = random.Random(seed)
+	sources, targets = [], []
+	while len(sources) < m:
+		u, v = rng.randrange(n), rng.randrange(n)
+		if u != v:
+			sources.append(u)
+			targets.append(v)
+	weights = [rng.randint(low, high) if integer else rng.uniform(low, high) for _ in sources]
+	xs = [rng.randrange(1000) for _ in range(n)]
+	ys = [rng.randrange(1000) for _ in range(n)]
+	return Graph.from_columns(xs, ys, sources, targets, weights=weights)
+
+
+def relaxed_distances(graph, source):
+	"""Shortest distances by relaxing every edge until nothing changes"""
+	dist = {n:math.inf for n in graph.nodes}
+	dist[source] = 0
+	for _ in range(len(dist)):
+		changed = False
+		for e in graph.edges:
+			if dist[e.src] + e.weight < dist[e.targ]:
+				dist[e.targ] = dist[e.src] + e.weight
+				changed = True
+		if not changed:
+			break
+	return dist
+
+
+def check_paths(graph, source, dist, pred):
+	"""Check that pred leads back to source along edges whose weights add up to dist"""
+	for n in graph.nodes:
+		path = algorithms.path_to(pred, n)
+		if n is source or dist[n] == math.inf:
+			assert path == []
+			continue
+		assert path[0].src is source and path[-1].targ is n
+		assert all(a.targ is b.src for a, b in zip(path, path[1:]))
+		assert sum(e.weight for e in path) == pytest.approx(dist[n])
+
+
+def spanning_weight(graph):
+	"""Weight of a minimum spanning forest, by trying every subset of edges"""
+	nodes = list(graph.nodes)
+	edges = list(graph.edges)
+	forest = algorithms.UnionFind(len(nodes))
+	index = {id(n):i for i,n in enumerate(nodes)}
+	for e in edges:
+		forest.union(index[id(e.src)], index[id(e.targ)])
+	size = len(nodes) - len({forest.find(i) for i in range(len(nodes))})
+
+	best = math.inf
+	for subset in itertools.combinations(edges, size):
+		sets = algorithms.UnionFind(len(nodes))
+		if all(sets.union(index[id(e.src)], index[id(e.targ)]) for e in subset):
+			best = min(best, sum(e.weight for e in subset))
+	return best
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_dijkstra(seed):
+	graph = random_graph(seed, 40, 120)
+	source = graph.nodes[0]
+	dist, pred = algorithms.dijkstra(graph, source)
+	assert dist == relaxed_distances(graph, source)
+	check_paths(graph, source, dist, pred)
+
+
+def test_dijkstra_target_and_coloring():
+	graph = random_graph(1, 40, 120)
+	source, target = graph.nodes[0], graph.nodes[1]
+	dist, pred = algorithms.dijkstra(graph, source, target, **algorithms.coloring())
+	assert dist[target] == relaxed_distances(graph, source)[target]
+	assert source.color == Color.BLACK and target.color == Color.BLACK
+	assert all(e.color == Color.BLACK for e in algorithms.path_to(pred, target))
+
+
+def test_dijkstra_rejects_negative_weights():
+	graph = random_graph(2, 10, 20)
+	graph.edges[3].weight = -1
+	with pytest.raises(ValueError):
+		algorithms.dijkstra(graph, graph.nodes[0])
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_bellman_ford(seed):
+	#shifting non-negative weights by a potential of each node gives negative weights but no negative cycle
+	graph = random_graph(seed, 40, 120)
+	rng = random.Random(seed)
+	potential = {id(n):rng.randint(0, 20) for n in graph.nodes}
+	for e in graph.edges:
+		e.weight += potential[id(e.src)] - potential[id(e.targ)]
+	assert any(e.weight < 0 for e in graph.edges)
+	source = graph.nodes[0]
+	dist, pred = algorithms.bellman_ford(graph, source)
+	assert dist == relaxed_distances(graph, source)
+	check_paths(graph, source, dist, pred)
+
+
+def test_bellman_ford_negative_cycle():
+	graph = Graph.from_columns([0, 0, 0], [0, 0, 0], [0, 1, 2], [1, 2, 1], weights=[1, -2, 1])
+	with pytest.raises(ValueError):
+		algorithms.bellman_ford(graph, graph.nodes[0])
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_astar(seed):
+	#weights of at least the length of every edge keep the euclidean heuristic admissible
+	graph = random_graph(seed, 40, 120)
+	for e in graph.edges:
+		e.weight = math.ceil(algorithms.euclidean(e.src, e.targ)) + e.weight
+	source = graph.nodes[0]
+	expected = relaxed_distances(graph, source)
+	for target in graph.nodes[1:10]:
+		dist, pred = algorithms.astar(graph, source, target, algorithms.euclidean)
+		assert dist[target] == expected[target]
+		path = algorithms.path_to(pred, target)
+		if expected[target] < math.inf:
+			assert path[0].src is source and path[-1].targ is target
+			assert all(a.targ is b.src for a, b in zip(path, path[1:]))
+			assert sum(e.weight for e in path) == dist[target]
+		else:
+			assert path == []
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_spanning_trees(seed):
+	graph = random_graph(seed, 7, 11, low=-3, integer=False)
+	expected = spanning_weight(graph)
+	kruskal = algorithms.kruskal(graph)
+	prim = algorithms.prim(graph)
+	assert len(kruskal) == len(prim)
+	assert sum(e.weight for e in kruskal) == pytest.approx(expected)
+	assert sum(e.weight for e in prim) == pytest.approx(expected)
+
+
+def test_prim_from_root_spans_its_component():
+	#nodes 0 to 2 and 3 to 4 form two components
+	graph = Graph.from_columns([0] * 5, [0] * 5, [0, 1, 0, 3], [1, 2, 2, 4], weights=[1, 2, 5, 7])
+	nodes = list(graph.nodes)
+	tree = algorithms.prim(graph, nodes[0])
+	assert sorted(e.weight for e in tree) == [1, 2]
+	assert sorted(e.weight for e in algorithms.kruskal(graph)) == [1, 2, 7]
+
+
+def test_snapshot_gives_the_same_results():
+	pytest.importorskip('numpy')
+	from graphdebugger.csr import CSRGraph
+
+	graph = random_graph(3, 60, 200)
+	source = graph.nodes[0]
+	csr = CSRGraph(graph)
+	assert algorithms.dijkstra(csr, source)[0] == algorithms.dijkstra(graph, source)[0]
+	assert algorithms.bellman_ford(csr, source)[0] == algorithms.bellman_ford(graph, source)[0]
+	weight = sum(e.weight for e in algorithms.kruskal(graph))
+	assert sum(e.weight for e in algorithms.prim(csr)) == weight
+	assert sum(e.weight for e in algorithms.kruskal(CSRGraph(graph, undirected=True))) == weight
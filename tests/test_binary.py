@@ -0,0 +1,105 @@
+import struct
+
+import pytest
+
+from graphdebugger import binary
+from graphdebugger.Graph import Color, Graph
+
+
+def sample_graph():
+	graph = Graph.from_columns([10, 20, 35, 40], [5, 15, 25, 35], [0, 1, 2, 3, 0], [1, 2, 3, 0, 2],
+							   weights=[3, -1, None, 7, 2**40], flows=[0, 1, 2, None, 0],
+							   node_colors=[c.value for c in (Color.RED, Color.CYAN, Color.GRAY, Color.BLACK)],
+							   edge_colors=[c.value for c in (Color.BLUE, Color.RED, Color.WHITE, Color.GRAY, Color.CYAN)],
+							   node_labels=['source', '', 'ünïcode', 'target'],
+							   labels={'source':0, 'target':3, 'alias':1})
+	return graph
+
+
+def describe(graph, types=True):
+	"""Everything the binary format stores about a graph, with nodes and edges as indices"""
+	nodes = list(graph.nodes)
+	index = {id(n):i for i,n in enumerate(nodes)}
+	kind = type if types else lambda value: None
+	return ([(n.x, kind(n.x), n.y, kind(n.y), n.color, n.label) for n in nodes],
+			[(index[id(e.src)], index[id(e.targ)], e.weight, kind(e.weight), e.flow, kind(e.flow), e.color)
+			 for e in graph.edges],
+			{label:index[id(n)] for label, n in graph.labels.items()})
+
+
+def test_round_trip(tmp_path):
+	graph = sample_graph()
+	file = str(tmp_path / 'graph.vgb')
+	binary.write_graph(graph, file)
+	assert binary.is_binary_graph(file)
+	assert describe(binary.read_graph(file)) == describe(graph)
+
+
+def test_round_trip_floats(tmp_path):
+	graph = Graph.from_columns([0.5, 1], [2, 3.25], [0, 1], [1, 0], weights=[1.5, 2], flows=[0.25, None])
+	file = str(tmp_path / 'graph.vgb')
+	binary.write_graph(graph, file)
+	with binary.GraphFile(file) as f:
+		assert not f.flags & (binary.INT_WEIGHTS | binary.INT_FLOWS | binary.INT_COORDS)
+		#every value of a column is read back as a float unless all of them are ints
+		copy = f.to_graph()
+		assert describe(copy, types=False) == describe(graph, types=False)
+		assert all(type(n.x) is float and type(n.y) is float for n in copy.nodes)
+		assert all(type(e.weight) is float for e in copy.edges)
+
+
+def test_columns(tmp_path):
+	graph = sample_graph()
+	file = str(tmp_path / 'graph.vgb')
+	binary.write_graph(graph, file)
+	with binary.GraphFile(file) as f:
+		assert (f.num_nodes, f.num_edges, f.num_labels) == (4, 5, 3)
+		assert f.flags == binary.INT_WEIGHTS | binary.INT_FLOWS | binary.INT_COORDS
+		assert f.edge_src.tolist() == [0, 1, 2, 3, 0]
+		assert f.edge_targ.tolist() == [1, 2, 3, 0, 2]
+		assert f.node_x.tolist() == [10, 20, 35, 40]
+		assert [f.node_label(i) for i in range(4)] == ['source', '', 'ünïcode', 'target']
+		assert f.labels() == {'source':0, 'target':3, 'alias':1}
+
+
+def test_empty_graph(tmp_path):
+	file = str(tmp_path / 'graph.vgb')
+	binary.write_graph(Graph(), file)
+	graph = binary.read_graph(file)
+	assert len(graph.nodes) == 0 and len(graph.edges) == 0
+
+
+def test_truncated(tmp_path):
+	file = tmp_path / 'graph.vgb'
+	binary.write_graph(sample_graph(), str(file))
+	data = file.read_bytes()
+	for size in (0, 3, binary._header.size - 1, binary._header.size + 8, len(data) - 1):
+		file.write_bytes(data[:size])
+		with pytest.raises(ValueError):
+			binary.read_graph(str(file))
+
+
+def test_invalid_label_offsets(tmp_path):
+	file = tmp_path / 'graph.vgb'
+	binary.write_graph(sample_graph(), str(file))
+	data = bytearray(file.read_bytes())
+	offset, count, _ = binary._layout(4, 5, 3)['label_offs']
+	#swap the end offsets of the second and third node labels, so that they decrease
+	first = offset + 16
+	second = offset + 24
+	data[first:first + 8], data[second:second + 8] = data[second:second + 8], data[first:first + 8]
+	file.write_bytes(bytes(data))
+	with pytest.raises(ValueError, match='invalid label offsets'):
+		binary.read_graph(str(file))
+
+
+def test_not_a_graph_file(tmp_path):
+	file = tmp_path / 'graph.vgb'
+	file.write_bytes(b'{"nodes": []}' + bytes(64))
+	assert not binary.is_binary_graph(str(file))
+	with pytest.raises(ValueError, match='not a binary graph file'):
+		binary.read_graph(str(file))
+
+	file.write_bytes(struct.pack('<4sHHQQQ', binary.MAGIC, binary.VERSION + 1, 0, 0, 0, 0))
+	with pytest.raises(ValueError, match='version'):
+		binary.read_graph(str(file))
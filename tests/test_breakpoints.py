@@ -0,0 +1,117 @@
+import sys
+import textwrap
+import types
+
+import pytest
+
+from graphdebugger.tracer import Breakpoint, Breakpoints, Tracer
+
+
+SCRIPT = textwrap.dedent('''\
+	total = 0
+	for i in range(10):
+		total += i
+	done = True
+''')
+
+LOOP_LINE = 3
+
+
+def frame(**local):
+	return types.SimpleNamespace(f_globals={}, f_locals=local)
+
+
+def run(tmp_path, breakpoints):
+	"""Run SCRIPT under a tracer and return the values of i at every stop on the loop line"""
+	file = tmp_path / 'script.py'
+	file.write_text(SCRIPT)
+	stops = []
+
+	def on_stop(frame):
+		stops.append((frame.f_lineno, frame.f_locals.get('i')))
+		return Tracer.RESUME
+
+	tracer = Tracer(str(file), breakpoints, on_stop)
+	tracer.start()
+	try:
+		exec(compile(SCRIPT, str(file), 'exec'), {'__name__':'__main__'})
+	finally:
+		tracer.stop()
+	assert all(line == LOOP_LINE for line, _ in stops)
+	return [i for _, i in stops]
+
+
+backends = [False] + ([True] if hasattr(sys, 'monitoring') else [])
+
+
+def test_plain():
+	bps = Breakpoints([(3,)])
+	assert bps[3].plain
+	assert all(bps.check(3, frame(i=i)) for i in range(3))
+	assert not bps.check(4, frame())
+	assert bps[3].hits == 3
+
+
+def test_condition():
+	bps = Breakpoints()
+	bps.add(3, 'i % 3 == 0')
+	assert [i for i in range(10) if bps.check(3, frame(i=i))] == [0, 3, 6, 9]
+	#hits only count the times the condition was true
+	assert bps[3].hits == 4
+	#a condition which raises stops, so that it can be inspected
+	assert bps.check(3, frame())
+
+
+def test_hit_count():
+	bps = Breakpoints([(3, None, 4)])
+	assert [i for i in range(8) if bps.check(3, frame(i=i))] == [3, 4, 5, 6, 7]
+	bps.reset_hits()
+	assert not bps.check(3, frame(i=0))
+
+	bps.add(3, 'i > 2', 2)
+	assert [i for i in range(8) if bps.check(3, frame(i=i))] == [4, 5, 6, 7]
+
+
+def test_log():
+	bps = Breakpoints([(3, 'i % 2', 0, 'i={i} square={i * i!r}')])
+	logged = []
+	bps.on_log = lambda line, message: logged.append((line, message))
+	assert not any(bps.check(3, frame(i=i)) for i in range(5))
+	assert logged == [(3, 'i=1 square=1'), (3, 'i=3 square=9')]
+
+	bps.add(4, log='{missing}')
+	assert not bps.check(4, frame())
+	assert logged[-1] == (4, "NameError: name 'missing' is not defined")
+
+
+def test_invalid_expressions():
+	with pytest.raises(SyntaxError):
+		Breakpoint(3, 'i ==')
+	with pytest.raises(SyntaxError):
+		Breakpoint(3, log='{i')
+
+
+def test_specs_and_sync():
+	bps = Breakpoints([(3, 'i > 1', 0, None), (5,)])
+	bps.check(5, frame())
+	bps.check(3, frame(i=2))
+	assert Breakpoints(bps.specs()).specs() == bps.specs()
+
+	#unchanged breakpoints keep their hits, changed ones start over
+	bps.sync([(3, 'i > 2', 0, None), (5, None, 0, None), (7, None, 0, None)])
+	assert sorted(bps) == [3, 5, 7]
+	assert (bps[3].condition, bps[3].hits, bps[5].hits, bps[7].hits) == ('i > 2', 0, 1, 0)
+
+
+@pytest.mark.parametrize('monitoring', backends)
+def test_tracer(tmp_path, monkeypatch, monitoring):
+	monkeypatch.setattr(Tracer, 'use_monitoring', monitoring)
+	assert run(tmp_path, {LOOP_LINE}) == list(range(10))
+	assert run(tmp_path, Breakpoints([(LOOP_LINE, 'i % 4 == 1')])) == [1, 5, 9]
+	assert run(tmp_path, Breakpoints([(LOOP_LINE, None, 8)])) == [7, 8, 9]
+
+	bps = Breakpoints([(LOOP_LINE, 'i >= 7', 0, '{total}')])
+	logged = []
+	bps.on_log = lambda line, message: logged.append(message)
+	assert run(tmp_path, bps) == []
+	assert logged == ['21', '28', '36']
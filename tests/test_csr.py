@@ -0,0 +1,21 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from graphdebugger.Graph import Graph
+from graphdebugger.csr import CSRGraph
+
+
+def test_shortest_paths_zero_weight_cycle():
+	#nodes 0 and 1 form a zero weight cycle reached from node 2
+	graph = Graph.from_columns([0, 0, 0], [0, 0, 0], [2, 0, 1], [0, 1, 0], weights=[1, 0, 0])
+	csr = CSRGraph(graph)
+	dist, pred = csr.shortest_paths(2)
+	assert dist.tolist() == [1, 1, 0]
+	assert pred[2] == -1
+	for v in (0, 1):
+		u, steps = v, 0
+		while u != 2:
+			assert pred[u] >= 0 and steps < csr.num_nodes
+			u = int(csr.sources[pred[u]])
+			steps += 1
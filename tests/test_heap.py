@@ -0,0 +1,84 @@
+import random
+
+import pytest
+
+from graphdebugger.Graph import Color, IndexedHeap, Node
+
+
+def drain(heap):
+	result = []
+	while heap:
+		result.append(heap.pop_min())
+	return result
+
+
+def test_pops_in_key_order():
+	rng = random.Random(1)
+	nodes = [Node() for _ in range(200)]
+	keys = [rng.randrange(50) for _ in nodes]
+	heap = IndexedHeap(zip(nodes[:100], keys[:100]))
+	for n, key in zip(nodes[100:], keys[100:]):
+		heap.push(n, key)
+	assert len(heap) == 200
+	assert heap.peek_min()[1] == min(keys)
+
+	#ties are popped in the order the nodes were added
+	expected = sorted(zip(keys, range(200)))
+	assert [(key, nodes.index(n)) for n, key in drain(heap)] == expected
+	assert not heap
+
+
+def test_decrease_key_matches_sorted_order():
+	rng = random.Random(2)
+	nodes = [Node() for _ in range(300)]
+	keys = {id(n):rng.uniform(0, 1000) for n in nodes}
+	heap = IndexedHeap((n, keys[id(n)]) for n in nodes)
+	for _ in range(1000):
+		n = rng.choice(nodes)
+		keys[id(n)] -= rng.uniform(0, 100)
+		heap.decrease_key(n, keys[id(n)])
+		assert heap.key_of(n) == keys[id(n)]
+
+	popped = drain(heap)
+	assert [key for _, key in popped] == sorted(keys.values())
+	assert all(keys[id(n)] == key for n, key in popped)
+
+
+def test_membership():
+	a, b, c = Node(), Node(), Node()
+	heap = IndexedHeap([(a, 3), (b, 1)])
+	assert a in heap and b in heap and c not in heap
+	assert heap.pop_min() == (b, 1)
+	assert b not in heap
+	heap.push(b, 5)
+	assert b in heap
+	assert [n for n, _ in drain(heap)] == [a, b]
+	assert a not in heap
+
+
+def test_errors():
+	a, b = Node(), Node()
+	with pytest.raises(ValueError):
+		IndexedHeap([(a, 1), (a, 2)])
+	heap = IndexedHeap([(a, 1)])
+	with pytest.raises(ValueError):
+		heap.push(a, 0)
+	with pytest.raises(ValueError):
+		heap.decrease_key(a, 2)
+	with pytest.raises(KeyError):
+		heap.key_of(b)
+	heap.pop_min()
+	with pytest.raises(IndexError):
+		heap.pop_min()
+	with pytest.raises(IndexError):
+		heap.peek_min()
+
+
+def test_colors():
+	a, b = Node(), Node()
+	heap = IndexedHeap([(a, 1)], enter_color=Color.GRAY, leave_color=Color.BLACK)
+	assert a.color == Color.GRAY and b.color == Color.CYAN
+	heap.push(b, 2)
+	assert b.color == Color.GRAY
+	heap.pop_min()
+	assert a.color == Color.BLACK and b.color == Color.GRAY
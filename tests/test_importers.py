@@ -0,0 +1,103 @@
+import pytest
+
+from graphdebugger import importers
+
+
+def edges_of(graph):
+	"""(source label or index, target label or index, weight) of every edge"""
+	nodes = list(graph.nodes)
+	index = {id(n):i for i,n in enumerate(nodes)}
+	name = lambda n: n.label or index[id(n)]
+	return [(name(e.src), name(e.targ), e.weight) for e in graph.edges]
+
+
+def test_edge_list(tmp_path):
+	file = tmp_path / 'graph.txt'
+	file.write_text('# comment\n% other comment\n1 2 5\n2 3\n3 1 2.5\n\n1 3 -4\n')
+	graph = importers.import_graph(str(file))
+	assert len(graph.nodes) == 3
+	#numeric ids are numbered in order of first appearance and are not labels
+	assert edges_of(graph) == [(0, 1, 5), (1, 2, -1), (2, 0, 2.5), (0, 2, -4)]
+	assert graph.labels == {}
+
+
+def test_edge_list_header_and_labels(tmp_path):
+	file = tmp_path / 'graph.csv'
+	file.write_text('from,to,weight\nsource,a,3\na,7,1\n7,target,2\n')
+	graph = importers.import_graph(str(file))
+	assert edges_of(graph) == [('source', 'a', 3), ('a', 2, 1), (2, 'target', 2)]
+	assert set(graph.labels) == {'source', 'a', 'target'}
+	assert graph.get_node('target').label == 'target'
+
+
+def test_edge_list_in_chunks(tmp_path, monkeypatch):
+	#small chunks split the file across many ranges, which must give the same graph as a single one
+	lines = ['u v w'] + ['{} {} {}'.format(i % 97, (i * 31) % 101, i) for i in range(2000)]
+	file = tmp_path / 'graph.el'
+	file.write_text('\n'.join(lines) + '\n')
+	whole = edges_of(importers.read_edge_list(str(file)))
+	monkeypatch.setattr(importers, 'chunk_size', 256)
+	assert len(importers._ranges(str(file))) > 10
+	assert edges_of(importers.read_edge_list(str(file))) == whole
+	assert edges_of(importers.read_edge_list(str(file), workers=2)) == whole
+	assert len(whole) == 2000
+
+
+def test_dimacs_max_flow(tmp_path):
+	file = tmp_path / 'graph.max'
+	file.write_text('c max flow problem\np max 4 5\nn 1 s\nn 4 t\na 1 2 3\na 1 3 2\na 2 3 1\na 2 4 2\na 3 4 3\n')
+	graph = importers.import_graph(str(file))
+	assert len(graph.nodes) == 4
+	assert edges_of(graph) == [('source', 1, 3), ('source', 2, 2), (1, 2, 1), (1, 'target', 2), (2, 'target', 3)]
+	assert list(graph.nodes).index(graph.get_node('target')) == 3
+
+
+def test_dimacs_isolated_nodes(tmp_path):
+	file = tmp_path / 'graph.col'
+	file.write_text('p edge 5 2\ne 1 2\ne 2 3\n')
+	graph = importers.import_graph(str(file))
+	assert len(graph.nodes) == 5
+	assert edges_of(graph) == [(0, 1, -1), (1, 2, -1)]
+
+
+GRAPHML = '''<?xml version="1.0" encoding="UTF-8"?>
+<graphml xmlns="http://graphml.graphdrawing.org/xmlns">
+  <key id="d0" for="node" attr.name="x" attr.type="double"/>
+  <key id="d1" for="node" attr.name="y" attr.type="double"/>
+  <key id="d2" for="edge" attr.name="capacity" attr.type="int"/>
+  <key id="d3" for="edge" attr.name="flow" attr.type="int"/>
+  <key id="d4" for="node" attr.name="label" attr.type="string"/>
+  <graph edgedefault="directed">
+    <node id="n0"><data key="d0">10</data><data key="d1">20.5</data><data key="d4">source</data></node>
+    <node id="n1"><data key="d0">30</data><data key="d1">40</data></node>
+    <node id="n2"><data key="d0">50</data><data key="d1">60</data></node>
+    <edge source="n0" target="n1"><data key="d2">4</data><data key="d3">1</data></edge>
+    <edge source="n1" target="n2"><data key="d2">2.5</data></edge>
+    <edge source="n2" target="n0"/>
+  </graph>
+</graphml>
+'''
+
+
+def test_graphml(tmp_path):
+	file = tmp_path / 'graph.graphml'
+	file.write_text(GRAPHML)
+	graph = importers.import_graph(str(file))
+	assert [(n.x, n.y) for n in graph.nodes] == [(10, 20.5), (30, 40), (50, 60)]
+	assert edges_of(graph) == [('source', 'n1', 4), ('n1', 'n2', 2.5), ('n2', 'source', -1)]
+	assert [e.flow for e in graph.edges] == [1, 0, 0]
+	assert set(graph.labels) == {'source', 'n1', 'n2'}
+
+
+def test_graphml_without_coordinates(tmp_path):
+	file = tmp_path / 'graph.graphml'
+	file.write_text('<graphml><graph><node id="a"/><edge source="a" target="b"/></graph></graphml>')
+	graph = importers.import_graph(str(file))
+	assert edges_of(graph) == [('a', 'b', -1)]
+	assert [(n.x, n.y) for n in graph.nodes] == list(zip(*importers.auto_positions(2)))
+
+
+def test_unsupported_format(tmp_path):
+	assert importers.format_of('graph.json') is None
+	with pytest.raises(ValueError):
+		importers.import_graph(str(tmp_path / 'graph.json'))
@@ -0,0 +1,124 @@
+from collections import deque
+import random
+
+import pytest
+
+from graphdebugger import maxflow
+from graphdebugger.Graph import Color, Graph
+
+
+def random_network(seed, n, m, high=20):
+	rng = random.Random(seed)
+	sources, targets = [], []
+	while len(sources) < m:
+		u, v = rng.randrange(n), rng.randrange(n)
+		if u != v:
+			sources.append(u)
+			targets.append(v)
+	weights = [rng.randint(0, high) for _ in sources]
+	return Graph.from_columns([0] * n, [0] * n, sources, targets, weights=weights)
+
+
+def edmonds_karp(graph, source, sink):
+	"""Value of a maximum flow, augmenting along shortest paths of a capacity matrix"""
+	nodes = list(graph.nodes)
+	index = {id(x):i for i,x in enumerate(nodes)}
+	n = len(nodes)
+	cap = [[0] * n for _ in range(n)]
+	for e in graph.edges:
+		cap[index[id(e.src)]][index[id(e.targ)]] += e.weight
+	s, t = index[id(source)], index[id(sink)]
+	value = 0
+	while True:
+		parent = [-1] * n
+		parent[s] = s
+		queue = deque([s])
+		while queue and parent[t] < 0:
+			u = queue.popleft()
+			for v in range(n):
+				if parent[v] < 0 and cap[u][v] > 0:
+					parent[v] = u
+					queue.append(v)
+		if parent[t] < 0:
+			return value
+		path = []
+		v = t
+		while v != s:
+			path.append((parent[v], v))
+			v = parent[v]
+		amount = min(cap[u][v] for u, v in path)
+		for u, v in path:
+			cap[u][v] -= amount
+			cap[v][u] += amount
+		value += amount
+
+
+def check_flow(graph, source, sink, value):
+	"""Check that the flows written onto the edges are a valid flow of the provided value"""
+	excess = {id(x):0 for x in graph.nodes}
+	for e in graph.edges:
+		assert 0 <= e.flow <= e.weight
+		excess[id(e.src)] -= e.flow
+		excess[id(e.targ)] += e.flow
+	assert excess[id(sink)] == value
+	assert excess[id(source)] == -value
+	assert all(x == 0 for k, x in excess.items() if k not in (id(source), id(sink)))
+
+
+@pytest.mark.parametrize('method', ['dinic', 'push_relabel'])
+@pytest.mark.parametrize('seed', range(8))
+def test_max_flow(method, seed):
+	graph = random_network(seed, 25, 90)
+	source, sink = graph.nodes[0], graph.nodes[1]
+	network = maxflow.max_flow(graph, source, sink, method)
+	assert network.value == edmonds_karp(graph, source, sink)
+	check_flow(graph, source, sink, network.value)
+
+
+@pytest.mark.parametrize('method', ['dinic', 'push_relabel'])
+def test_min_cut(method):
+	for seed in range(8):
+		graph = random_network(seed, 25, 90)
+		source, sink = graph.nodes[0], graph.nodes[1]
+		network = maxflow.max_flow(graph, source, sink, method)
+		side, cut = network.min_cut()
+		inside = {id(x) for x in side}
+		assert id(source) in inside and id(sink) not in inside
+		assert {id(e) for e in cut} == {id(e) for e in graph.edges
+										if id(e.src) in inside and id(e.targ) not in inside}
+		assert sum(e.weight for e in cut) == network.value
+
+
+def test_mark_min_cut():
+	#the edge of capacity 1 from the middle node to the sink is the only one in the cut
+	graph = Graph.from_columns([0] * 3, [0] * 3, [0, 1], [1, 2], weights=[5, 1])
+	source, middle, sink = graph.nodes
+	network = maxflow.max_flow(graph, source, sink)
+	network.mark_min_cut()
+	assert network.value == 1
+	assert source.color == Color.BLUE and middle.color == Color.BLUE and sink.color == Color.WHITE
+	assert graph.get_edge(middle, sink).color == Color.RED
+
+
+def test_phases_and_write():
+	graph = random_network(3, 25, 90)
+	source, sink = graph.nodes[0], graph.nodes[1]
+	phases = []
+	network = maxflow.max_flow(graph, source, sink, on_phase=lambda network, phase: phases.append(phase),
+							   write=False)
+	assert phases
+	assert all(e.flow == 0 for e in graph.edges)
+	network.write_flows()
+	check_flow(graph, source, sink, network.value)
+
+
+def test_errors():
+	graph = random_network(4, 5, 8)
+	source = graph.nodes[0]
+	with pytest.raises(ValueError):
+		maxflow.max_flow(graph, source, source)
+	with pytest.raises(ValueError):
+		maxflow.max_flow(graph, source, graph.nodes[1], method='simplex')
+	graph.edges[0].weight = -1
+	with pytest.raises(ValueError):
+		maxflow.max_flow(graph, source, graph.nodes[1])
@@ -0,0 +1,95 @@
+import pytest
+
+from graphdebugger.Graph import Color, Edge, Graph, Node
+
+
+@pytest.fixture
+def observed():
+	"""Record every change passed to the graph observers during a test"""
+	changes = []
+	observer = lambda element, attr, old, new: changes.append((element, attr, old, new))
+	Graph.observers.append(observer)
+	yield changes
+	Graph.observers.remove(observer)
+
+
+def sample_graph():
+	return Graph.from_columns([0, 10, 20], [0, 10, 20], [0, 1, 2], [1, 2, 0], weights=[1000, 2.5, None],
+							  flows=[0, 1, 2], node_labels=['source', '', 'target'], labels={'source':0, 'target':2})
+
+
+def state(graph):
+	"""Attributes, adjacency and labels of a graph, with nodes and edges as indices"""
+	nodes = list(graph.nodes)
+	node_index = {id(n):i for i,n in enumerate(nodes)}
+	edge_index = {id(e):i for i,e in enumerate(graph.edges)}
+	return ([(n.color, n.label, sorted(edge_index[id(e)] for e in n.out), sorted(edge_index[id(e)] for e in n.inc))
+			 for n in nodes],
+			[(node_index[id(e.src)], node_index[id(e.targ)], e.color, e.weight, e.flow) for e in graph.edges],
+			{label:node_index[id(n)] for label, n in graph.labels.items()})
+
+
+def test_restores_attributes(observed):
+	graph = sample_graph()
+	before = state(graph)
+	snapshot = graph.snapshot()
+	a, b, c = graph.nodes
+	ab, bc, ca = graph.edges
+	a.color = Color.RED
+	b.label = 'middle'
+	b.key = 7
+	ab.weight = 3
+	bc.flow = None
+	ca.color = Color.BLUE
+	ca.pi = a
+	graph.create_label(b, 'middle')
+
+	observed.clear()
+	added, removed = graph.restore(snapshot)
+	assert (added, removed) == ([], [])
+	assert state(graph) == before
+	assert not hasattr(b, 'key') and not hasattr(ca, 'pi')
+	assert graph.get_node('middle') is a
+	assert sorted((attr, old, new) for _, attr, old, new in observed if attr != 'color') == \
+		[('flow', None, 1), ('label', 'middle', ''), ('weight', 3, 1000)]
+	assert {(id(x), attr) for x, attr, _, _ in observed} == \
+		{(id(a), 'color'), (id(b), 'label'), (id(ab), 'weight'), (id(bc), 'flow'), (id(ca), 'color')}
+
+
+def test_equal_values_are_not_set(observed):
+	graph = sample_graph()
+	snapshot = graph.snapshot()
+	ab, bc, _ = graph.edges
+	#equal values which are different objects must not count as changes
+	ab.weight = int('1000')
+	bc.weight = 2.5 * 1.0
+	bc.flow = 1.0
+	observed.clear()
+	graph.restore(snapshot)
+	assert observed == []
+
+
+def test_restores_structure():
+	graph = sample_graph()
+	before = state(graph)
+	snapshot = graph.snapshot()
+	a, b, c = graph.nodes
+	ab, bc, ca = graph.edges
+
+	d = Node((30, 30))
+	graph.add_node(d)
+	e = Edge(c, d, 1)
+	c.out.append(e)
+	d.inc.append(e)
+	graph.add_edge(e)
+	bc.src.remove(bc)
+	bc.targ.remove(bc)
+	graph.remove_edge(bc)
+	graph.remove_node(a)
+
+	added, removed = graph.restore(snapshot)
+	assert {id(x) for x in added} == {id(a), id(bc)}
+	assert {id(x) for x in removed} == {id(d), id(e)}
+	assert state(graph) == before
+	assert graph.get_edge(b, c) is bc and graph.get_edge(c, d) is None
+	assert graph.get_node('source') is a
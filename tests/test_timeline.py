@@ -0,0 +1,103 @@
+import random
+
+import pytest
+
+from graphdebugger.Graph import Color, Graph
+from graphdebugger.timeline import Timeline
+
+
+def state(graph):
+	return ([(n.color, n.label) for n in graph.nodes], [(e.color, e.weight, e.flow) for e in graph.edges])
+
+
+def record_run(steps, checkpoint_interval=10, budget=64*2**20, seed=1):
+	"""Make random changes to a graph over the provided number of steps
+
+	Like a paused script, no change is made after the last step is marked. Returns the graph, its timeline
+		and the state of the graph at the start of every step.
+	"""
+	rng = random.Random(seed)
+	graph = Graph.from_columns([0] * 6, [0] * 6, [0, 1, 2, 3, 4, 5], [1, 2, 3, 4, 5, 0], weights=[1] * 6)
+	nodes, edges = list(graph.nodes), list(graph.edges)
+	timeline = Timeline(graph, budget, checkpoint_interval)
+	timeline.attach()
+	states = []
+	try:
+		for step in range(steps):
+			timeline.mark(100 + step)
+			states.append(state(graph))
+			if step == steps - 1:
+				break
+			for _ in range(rng.randrange(4)):
+				kind = rng.randrange(4)
+				if kind == 0:
+					rng.choice(nodes).color = rng.choice(list(Color))
+				elif kind == 1:
+					rng.choice(nodes).label = str(step)
+				elif kind == 2:
+					rng.choice(edges).weight = rng.randrange(10)
+				else:
+					rng.choice(edges).flow = rng.choice([None, rng.random()])
+	finally:
+		timeline.detach()
+	return graph, timeline, states
+
+
+def test_back_and_forward():
+	graph, timeline, states = record_run(50)
+	assert timeline.at_head() and timeline.line() == 149
+	#undoing the last step returns to the state at its start
+	for step in reversed(range(49)):
+		assert timeline.back() == 100 + step
+		assert state(graph) == states[step]
+	assert timeline.back() is None
+	for step in range(1, 50):
+		assert timeline.forward() == 100 + step
+		assert state(graph) == states[step]
+	assert timeline.forward() is None
+	assert timeline.at_head()
+
+
+@pytest.mark.parametrize('checkpoint_interval', [1, 7, 1000])
+def test_seek(checkpoint_interval):
+	graph, timeline, states = record_run(200, checkpoint_interval)
+	rng = random.Random(2)
+	for target in [0, 199, 5, 5, 150] + [rng.randrange(200) for _ in range(40)]:
+		assert timeline.seek(target) == 100 + target
+		assert timeline.position == target
+		assert state(graph) == states[target]
+	assert timeline.seek(-10) == 100 and timeline.seek(10**6) == 299
+
+
+def test_seek_does_not_record():
+	graph, timeline, states = record_run(30)
+	timeline.attach()
+	try:
+		size, deltas = timeline.size, list(timeline.deltas)
+		timeline.seek(0)
+		timeline.seek(29)
+		assert timeline.size == size and list(timeline.deltas) == deltas
+	finally:
+		timeline.detach()
+
+
+def test_back_to_and_forward_to():
+	graph, timeline, states = record_run(60)
+	assert timeline.back_to({120, 130}) == 130
+	assert state(graph) == states[30]
+	assert timeline.back_to({120, 130}) == 120
+	assert timeline.back_to(set()) == 100
+	assert timeline.forward_to({140}) == 140
+	assert state(graph) == states[40]
+	assert timeline.forward_to(set()) == 159
+	assert timeline.at_head()
+
+
+def test_budget_discards_oldest_steps():
+	graph, timeline, states = record_run(500, checkpoint_interval=50, budget=20000)
+	assert timeline.size <= 20000
+	assert timeline.first > 0 and timeline.head == 499
+	assert all(c >= timeline.first for c in timeline.checkpoints)
+	assert timeline.seek(0) == 100 + timeline.first
+	assert state(graph) == states[timeline.first]
+	assert timeline.back() is None
@@ -0,0 +1,124 @@
+import textwrap
+
+import pytest
+
+from graphdebugger.Graph import Color, Edge, Graph, Node
+from graphdebugger.tracer import Tracer
+from graphdebugger.watchpoints import Watchpoint, Watchpoints
+
+
+SCRIPT = textwrap.dedent('''\
+	for e in graph.edges:
+		e.flow = e.weight
+	for n in graph.nodes:
+		n.color = Color.RED
+	n.label = 'last'
+''')
+
+
+def sample_graph():
+	#the flow of the last edge already equals its weight
+	return Graph.from_columns([0, 10, 20], [0, 10, 20], [0, 1, 2], [1, 2, 0], weights=[2, 5, 3],
+							  flows=[0, 0, 3], node_labels=['a', 'b', 'c'])
+
+
+def run(tmp_path, graph, watchpoints):
+	"""Run SCRIPT on graph while watching it and return the (line, message) of every pause"""
+	file = tmp_path / 'script.py'
+	file.write_text(SCRIPT)
+	stops = []
+	messages = []
+
+	def on_stop(frame):
+		stops.append((frame.f_lineno, messages[-1]))
+		return Tracer.RESUME
+
+	tracer = Tracer(str(file), set(), on_stop)
+	watchpoints.on_hit = messages.append
+	tracer.start()
+	watchpoints.start(tracer)
+	try:
+		exec(compile(SCRIPT, str(file), 'exec'), {'graph':graph, 'Color':Color})
+	finally:
+		watchpoints.stop()
+		tracer.stop()
+	assert len(messages) == len(stops)
+	return stops
+
+
+def test_single_element(tmp_path):
+	graph = sample_graph()
+	edge = graph.edges[1]
+	stops = run(tmp_path, graph, Watchpoints([Watchpoint(edge, ['flow'])]))
+	assert stops == [(2, "edge 'b' -> 'c' flow: 0 -> 5")]
+
+
+def test_every_edge_with_condition(tmp_path):
+	graph = sample_graph()
+	stops = run(tmp_path, graph, Watchpoints([Watchpoint(Edge, ['flow'], 'new >= 2 and new < element.weight + 1')]))
+	#the last edge is not paused on, since its flow does not change
+	assert [message for _, message in stops] == ["edge 'a' -> 'b' flow: 0 -> 2", "edge 'b' -> 'c' flow: 0 -> 5"]
+
+
+def test_every_node(tmp_path):
+	graph = sample_graph()
+	stops = run(tmp_path, graph, Watchpoints([Watchpoint(Node)]))
+	assert stops == [(4, "node 'a' color: CYAN -> RED"), (4, "node 'b' color: CYAN -> RED"),
+					 (4, "node 'c' color: CYAN -> RED"), (5, "node 'last' label: 'c' -> 'last'")]
+
+
+def test_condition_on_colors(tmp_path):
+	graph = sample_graph()
+	graph.nodes[1].color = Color.RED
+	stops = run(tmp_path, graph, Watchpoints([Watchpoint(None, ['color'], 'old == Color.CYAN')]))
+	assert [message for _, message in stops] == ["node 'a' color: CYAN -> RED", "node 'c' color: CYAN -> RED"]
+
+
+def test_failing_condition_pauses(tmp_path):
+	graph = sample_graph()
+	stops = run(tmp_path, graph, Watchpoints([Watchpoint(graph.nodes[0], None, 'element.missing')]))
+	assert stops == [(4, "node 'a' color: CYAN -> RED")]
+
+
+def test_next_change(tmp_path):
+	graph = sample_graph()
+	watchpoints = Watchpoints()
+	watchpoints.next_change = True
+	stops = run(tmp_path, graph, watchpoints)
+	assert stops == [(2, "edge 'a' -> 'b' flow: 0 -> 2")]
+	assert not watchpoints.next_change
+
+
+def test_changes_outside_the_script(tmp_path):
+	graph = sample_graph()
+	file = tmp_path / 'script.py'
+	file.write_text(SCRIPT)
+	stops = []
+	tracer = Tracer(str(file), set(), stops.append)
+	watchpoints = Watchpoints([Watchpoint()])
+	watchpoints.start(tracer)
+	try:
+		#changes made by code which is not part of the script, or while suspended, never pause
+		graph.nodes[0].color = Color.RED
+		with watchpoints.suspended():
+			graph.nodes[1].color = Color.RED
+	finally:
+		watchpoints.stop()
+	assert stops == []
+	assert watchpoints.record not in Graph.observers
+
+
+def test_specs():
+	graph = sample_graph()
+	watchpoints = Watchpoints([Watchpoint(), Watchpoint(Node, ['color', 'label']),
+							   Watchpoint(graph.edges[2], ['flow'], 'new > 1'), Watchpoint(graph.nodes[1])])
+	copy = Watchpoints.from_specs(graph, watchpoints.specs(graph))
+	assert [(w.element, w.attrs, w.condition) for w in copy] == \
+		[(w.element, w.attrs, w.condition) for w in watchpoints]
+	assert [str(w) for w in copy] == ['any element changes', 'any node color/label',
+									  "edge 'c' -> 'a' flow if new > 1", "node 'b' changes"]
+
+	copy.discard_elements()
+	assert [w.element for w in copy] == [None, Node]
+	with pytest.raises(SyntaxError):
+		Watchpoint(condition='new >')